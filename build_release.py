@@ -27,6 +27,8 @@ def build():
             # Hidden imports often needed for these libraries
             "--hidden-import=rich",
             "--hidden-import=zxingcpp",
+            # mss picks its platform backend at runtime
+            "--hidden-import=mss.darwin",
             "--hidden-import=pkg_resources.extern",
             "--collect-all=rich",
         ]
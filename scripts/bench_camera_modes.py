@@ -0,0 +1,105 @@
+"""
+Compares camera capture modes for QR scanning on a real camera:
+
+  native    whatever the driver starts with
+  qr        1280x720 MJPG, 1-frame driver buffer
+  low-res   640x480, 1-frame driver buffer
+  high-res  1920x1080 MJPG, 1-frame driver buffer
+
+For each mode it prints the format the driver actually applied, the frame
+interval, the decode time per frame (fast-camera profile), and how many
+stale frames were queued after a 200 ms decode stall. Queued frames are
+handed out before the current one, so each adds a frame interval to the time
+between a code appearing and its detection. The latency estimate is queued
+frames x interval + decode time.
+
+    uv run python scripts/bench_camera_modes.py --camera 0 --frames 60
+"""
+
+import argparse
+import statistics
+import time
+
+# Reads faster than this after a stall came from the driver's queue
+QUEUED_READ_SECONDS = 0.004
+
+
+def measure(scanner, frames: int) -> dict:
+    profile = scanner.profile
+    cap = scanner.cap
+    # Back-to-back reads: the steady-state frame interval
+    captured, stamps = [], []
+    for _ in range(frames):
+        ok, frame = cap.read()
+        if ok:
+            captured.append(frame)
+            stamps.append(time.perf_counter())
+    intervals = [b - a for a, b in zip(stamps, stamps[1:])]
+
+    decodes = []
+    for frame in captured:
+        start = time.perf_counter()
+        profile.read_barcodes(frame)
+        decodes.append(time.perf_counter() - start)
+
+    queued = []
+    for _ in range(5):
+        time.sleep(0.2)
+        count = 0
+        while True:
+            start = time.perf_counter()
+            cap.read()
+            if time.perf_counter() - start > QUEUED_READ_SECONDS or count > 10:
+                break
+            count += 1
+        queued.append(count)
+
+    interval = statistics.median(intervals)
+    decode = statistics.median(decodes)
+    stale = statistics.median(queued)
+    return {
+        "interval": interval,
+        "decode": decode,
+        "queued": stale,
+        "latency": stale * interval + decode,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument(
+        "--modes", nargs="+", default=["native", "qr", "low-res", "high-res"]
+    )
+    args = parser.parse_args()
+
+    from qr_network.capture.scanner import QRCodeScanner
+
+    print(
+        f"{'mode':<9} {'applied':<28} {'interval':>9} {'decode':>9} "
+        f"{'queued':>7} {'latency':>9}"
+    )
+    for mode in args.modes:
+        scanner = QRCodeScanner(
+            camera_id=args.camera, profile="fast-camera", capture_mode=mode
+        )
+        try:
+            scanner.start_camera()
+            applied = scanner.capture_format
+            result = measure(scanner, args.frames)
+        finally:
+            scanner.close()
+        described = (
+            f"{applied['width']}x{applied['height']} {applied['fourcc'] or '?'} "
+            f"buf={applied['buffer_size'] or '?'}"
+        )
+        print(
+            f"{mode:<9} {described:<28} {result['interval'] * 1000:>7.1f}ms "
+            f"{result['decode'] * 1000:>7.1f}ms {result['queued']:>7.1f} "
+            f"{result['latency'] * 1000:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compares the ways a screen capture can be handed to the decoder, on a large
+synthetic screenshot with one WiFi QR code on it:
+
+  legacy  PIL RGB image -> np.array -> cv2.cvtColor(RGB2BGR) -> zxing
+  gray    mss BGRA buffer -> cv2.cvtColor(BGRA2GRAY) -> zxing
+  direct  mss BGRA buffer -> zxingcpp.ImageView (read in place) -> zxing
+
+Copies are the bytes allocated on the Python side per frame (numpy, OpenCV
+and PIL buffers), in units of one BGRA screenshot; zxing's own internal
+buffers are not counted. Capture itself is excluded, so the numbers only
+reflect the hand-off. At 4K the legacy path allocates about 1.5 screenshots
+of copies and gray 0.25; gray still decodes about 10% faster than direct,
+which is why it is the scanner's default.
+
+    uv run python scripts/bench_screen_capture.py --width 5120 --height 2880
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+
+def synthetic_screen(width: int, height: int, text: str):
+    """A noisy light desktop (BGRA bytes) with a QR code drawn on it."""
+    import zxingcpp
+
+    rng = np.random.default_rng(0)
+    gray = rng.integers(200, 256, (height, width), dtype=np.uint8)
+    code = zxingcpp.create_barcode(text, zxingcpp.BarcodeFormat.QRCode)
+    image = np.asarray(code.to_image(scale=8))
+    y, x = height // 3, width // 2
+    gray[y : y + image.shape[0], x : x + image.shape[1]] = image
+    return bytearray(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGRA).tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from PIL import Image
+
+    from qr_network.capture.profiles import get_profile
+
+    text = "WIFI:S:Bench;T:WPA;P:secret;;"
+    width, height = args.width, args.height
+    raw = synthetic_screen(width, height, text)
+    # What ImageGrab used to return, built up front like a capture would be
+    pil_rgb = Image.frombuffer("RGBA", (width, height), bytes(raw)).convert("RGB")
+    profile = get_profile("thorough-file")
+    frame_bytes = len(raw)
+
+    def bgra():
+        # Same as np.asarray(mss ScreenShot): a view of the raw bytearray
+        return np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+
+    paths = {
+        "legacy": lambda: cv2.cvtColor(np.array(pil_rgb), cv2.COLOR_RGB2BGR),
+        "gray": lambda: cv2.cvtColor(bgra(), cv2.COLOR_BGRA2GRAY),
+        "direct": bgra,
+    }
+
+    print(f"{width}x{height} screen, {frame_bytes / 1e6:.1f} MB per BGRA capture")
+    print(f"{'path':<8} {'copies':>7} {'hand-off':>10} {'total':>10}  decoded")
+    for name, prepare in paths.items():
+        handoff, total = [], []
+        found = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            image = prepare()
+            prepared = time.perf_counter()
+            found = [code.text for code in profile.read_barcodes(image)]
+            handoff.append(prepared - start)
+            total.append(time.perf_counter() - start)
+            del image
+
+        tracemalloc.start()
+        image = prepare()
+        _, allocated = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del image
+
+        print(
+            f"{name:<8} {allocated / frame_bytes:>7.2f} "
+            f"{statistics.median(handoff) * 1000:>8.1f}ms "
+            f"{statistics.median(total) * 1000:>8.1f}ms  {found == [text]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Optional
+
+from .results import DetectionResult
+from .scanner import QRCodeScanner
+
+
+class AsyncQRCodeScanner:
+    """
+    asyncio front end for QRCodeScanner.
+
+    Blocking work runs on two managed executors so the event loop never
+    waits on it: one dedicated thread owns the camera (OpenCV capture
+    objects must not be used from several threads at once) and a small pool
+    runs decoding, PDF rendering and screen captures. File, buffer and
+    screen scans each use a scanner private to their pool thread, so any
+    number of them can be awaited together; camera sessions are serialized.
+
+    Cancelling a camera scan releases the camera before the cancellation
+    propagates. A file or screen scan that is already running on the pool
+    finishes in the background; its result is discarded.
+    """
+
+    def __init__(
+        self,
+        scanner: Optional[QRCodeScanner] = None,
+        workers: Optional[int] = None,
+        **scanner_options,
+    ):
+        """
+        :param scanner: QRCodeScanner used for the camera and whose settings
+            the pool scanners copy (built from scanner_options if None)
+        :param workers: Pool threads for file, buffer and screen scans
+            (defaults to the CPU count, at most 4)
+        :param scanner_options: QRCodeScanner keyword arguments, when no
+            scanner is given
+        """
+        self.scanner = scanner or QRCodeScanner(**scanner_options)
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.last_result = DetectionResult()
+        self.last_stats = {}
+        self._camera_executor = None
+        self._executor = None
+        self._camera_lock = None
+        self._local = threading.local()
+        self._pool_scanners = []
+
+    # Executors
+
+    def _run_camera(self, fn, *args):
+        """Runs fn on the camera thread."""
+        if self._camera_executor is None:
+            self._camera_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="qr-async-camera"
+            )
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._camera_executor, fn, *args)
+
+    def _run(self, fn, *args):
+        """Runs fn on the decode pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="qr-async"
+            )
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, fn, *args)
+
+    def _pool_scanner(self) -> QRCodeScanner:
+        """One scanner per pool thread, with the main scanner's settings."""
+        scanner = getattr(self._local, "scanner", None)
+        if scanner is None:
+            scanner = QRCodeScanner(
+                result_cache=self.scanner.result_cache,
+                screen_zero_copy=self.scanner.screen_zero_copy,
+                **self.scanner._worker_options(),
+            )
+            self._local.scanner = scanner
+            self._pool_scanners.append(scanner)
+        return scanner
+
+    def _call(self, method: str, *args):
+        """Pool job: calls a scanner method and returns (value, result, stats)."""
+        scanner = self._pool_scanner()
+        scanner.last_result = DetectionResult()
+        scanner.last_stats = {}
+        value = getattr(scanner, method)(*args)
+        return value, scanner.last_result, scanner.last_stats
+
+    async def _scan(self, method: str, *args):
+        value, self.last_result, self.last_stats = await self._run(
+            self._call, method, *args
+        )
+        return value
+
+    # Files, buffers and screens
+
+    async def scan_file(self, file_path: str) -> Optional[str]:
+        """Awaitable QRCodeScanner.scan_file."""
+        return await self._scan("scan_file", file_path)
+
+    async def scan_file_codes(self, file_path: str, max_pages: int = 3) -> list:
+        """Awaitable QRCodeScanner.scan_file_codes."""
+        return await self._scan("scan_file_codes", file_path, max_pages)
+
+    async def scan_bytes(self, data, mime: Optional[str] = None) -> Optional[str]:
+        """Awaitable QRCodeScanner.scan_bytes."""
+        return await self._scan("scan_bytes", data, mime)
+
+    async def scan_array(self, image) -> Optional[str]:
+        """Awaitable QRCodeScanner.scan_array."""
+        return await self._scan("scan_array", image)
+
+    async def scan_screen(self, screen_index: Optional[int] = None) -> Optional[str]:
+        """Awaitable QRCodeScanner.scan_screen."""
+        return await self._scan("scan_screen", screen_index)
+
+    # Camera
+
+    async def _camera_frames(self, timeout: Optional[float]):
+        """
+        Yields (frame, capture_timestamp) from the camera until the timeout.
+        The next frame is read while the caller decodes the current one. The
+        camera is released when the generator closes, including on
+        cancellation.
+        """
+        if self._camera_lock is None:
+            self._camera_lock = asyncio.Lock()
+        async with self._camera_lock:
+            scanner = self.scanner
+            start = time.monotonic()
+            read = None
+            try:
+                if not scanner.cap:
+                    await self._run_camera(scanner.start_camera)
+                read = self._run_camera(scanner._read_frame)
+                while timeout is None or time.monotonic() - start < timeout:
+                    ret, frame, captured_at = await read
+                    read = self._run_camera(scanner._read_frame)
+                    if ret:
+                        yield frame, captured_at
+            finally:
+                if read is not None:
+                    read.cancel()
+                # Queued behind any read still running on the camera thread
+                release = self._run_camera(scanner.stop_camera)
+                await asyncio.shield(release)
+
+    async def scan_one(self, timeout: float = 30.0) -> Optional[str]:
+        """
+        Scans the camera for a single QR code without blocking the event
+        loop. Uses the scanner's ROI tracking and change gating.
+        """
+        frames_seen = 0
+        self.last_stats = {}
+        self.last_result = DetectionResult()
+        frames = self._camera_frames(timeout)
+        try:
+            async for frame, captured_at in frames:
+                text, points = await self._run(self.scanner.detect_tracked, frame)
+                frames_seen += 1
+                if text:
+                    self.last_result = self.scanner.last_result
+                    self.last_stats = self.scanner._camera_stats(frames_seen)
+                    self.last_stats["detection_latency"] = (
+                        time.monotonic() - captured_at
+                    )
+                    return text
+            return None
+        finally:
+            await frames.aclose()
+            if not self.last_stats:
+                self.last_stats = self.scanner._camera_stats(frames_seen)
+
+    async def detections(
+        self, timeout: Optional[float] = None
+    ) -> AsyncIterator[DetectionResult]:
+        """
+        Yields a DetectionResult for every camera frame with at least one
+        code, until the timeout (None runs until the consumer stops). Close
+        the iterator to release the camera promptly, e.g. with
+        `contextlib.aclosing(scanner.detections())`.
+        """
+        frames = self._camera_frames(timeout)
+        try:
+            async for frame, _ in frames:
+                result = await self._run(self.scanner._detect, frame)
+                if result:
+                    self.last_result = result
+                    yield result
+        finally:
+            await frames.aclose()
+
+    # Shutdown
+
+    async def aclose(self):
+        """Releases the camera and shuts the executors down."""
+        if self.scanner.cap or self.scanner.capture_thread:
+            await self._run_camera(self.scanner.stop_camera)
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def close(self):
+        """Blocking variant of aclose for use outside the event loop."""
+        for executor in (self._camera_executor, self._executor):
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        self._camera_executor = self._executor = None
+        for scanner in self._pool_scanners:
+            scanner.close()
+        self._pool_scanners = []
+        self.scanner.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
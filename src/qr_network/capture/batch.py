@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+# Result statuses
+STATUS_OK = "ok"
+STATUS_NO_QR = "no_qr"
+STATUS_MISSING = "missing"
+STATUS_ERROR = "error"
+
+
+@dataclass
+class FileScanResult:
+    """Outcome of scanning one file in a batch."""
+
+    path: str
+    status: str
+    # Every QRCode found, each tagged with its page
+    codes: list = field(default_factory=list)
+    seconds: float = 0.0
+    # Image files only: time spent loading and decoding, over all levels
+    load_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    error: Optional[str] = None
+    # Position of the file in the input sequence
+    index: int = 0
+
+    @property
+    def texts(self) -> list:
+        return [code.text for code in self.codes]
+
+
+_local = threading.local()
+
+
+def _init_worker(config: dict):
+    """
+    Pool initializer: stores the QRCodeScanner kwargs for this worker. Kept
+    per thread, so concurrent thread-mode batches don't share a config.
+    """
+    _local.config = config
+
+
+def _worker_scanner():
+    """One scanner per worker thread/process, built on first use."""
+    scanner = getattr(_local, "scanner", None)
+    if scanner is None:
+        from .scanner import QRCodeScanner
+
+        scanner = QRCodeScanner(**_local.config)
+        _local.scanner = scanner
+    return scanner
+
+
+def _scan_one_file(index: int, path: str, max_pages: int) -> FileScanResult:
+    start = time.perf_counter()
+    scanner = _worker_scanner()
+    scanner.last_stats = {}
+    try:
+        codes = scanner.scan_file_codes(path, max_pages=max_pages)
+        status = STATUS_OK if codes else STATUS_NO_QR
+        error = None
+    except FileNotFoundError:
+        codes, status, error = [], STATUS_MISSING, "File not found"
+    except Exception as e:
+        codes, status, error = [], STATUS_ERROR, str(e)
+    levels = scanner.last_stats.get("image_levels", [])
+    return FileScanResult(
+        path=path,
+        status=status,
+        codes=codes,
+        seconds=time.perf_counter() - start,
+        load_seconds=sum(level["load_seconds"] for level in levels),
+        decode_seconds=sum(level["decode_seconds"] for level in levels),
+        error=error,
+        index=index,
+    )
+
+
+def _worker_pdf(path: str):
+    """The PDF currently open in this worker, reopened when the path changes."""
+    cached = getattr(_local, "pdf", None)
+    if cached is not None and cached[0] == path:
+        return cached[1]
+    import fitz  # PyMuPDF
+
+    from .pdf import render_lock
+
+    with render_lock:
+        if cached is not None:
+            cached[1].close()
+        doc = fitz.open(path)
+    _local.pdf = (path, doc)
+    return doc
+
+
+def _scan_pdf_page(path: str, page_no: int):
+    """Decodes one PDF page with DPI escalation. Returns (page_no, result)."""
+    from .pdf import render_lock
+    from .results import DetectionResult
+
+    try:
+        scanner = _worker_scanner()
+        doc = _worker_pdf(path)
+        with render_lock:
+            page = doc.load_page(page_no - 1)
+        result, _ = scanner._decode_pdf_page(page)
+        return page_no, result.transformed(page=page_no)
+    except Exception as e:
+        print(f"PDF page {page_no} scan error: {e}")
+        return page_no, DetectionResult()
+
+
+def _make_executor(workers: int, mode: str, config: dict, prefix: str):
+    if mode == "process":
+        return ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(config,)
+        )
+    if mode == "thread":
+        return ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix=prefix,
+            initializer=_init_worker,
+            initargs=(config,),
+        )
+    raise ValueError(f"Unknown batch worker mode '{mode}' (use thread or process)")
+
+
+def scan_files(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    ordered: bool = False,
+    max_in_flight: Optional[int] = None,
+    mode: str = "process",
+    max_pages: int = 3,
+    **scanner_options,
+) -> Iterator[FileScanResult]:
+    """
+    Scans many image/PDF files on a worker pool and yields a FileScanResult
+    as each file finishes.
+
+    :param paths: Any iterable of paths; it is consumed lazily
+    :param workers: Pool size (defaults to the CPU count)
+    :param ordered: Yield results in input order instead of completion order
+    :param max_in_flight: Files submitted but not yet yielded (defaults to
+        2x workers), which keeps memory flat for arbitrarily long inputs
+    :param mode: "process" or "thread" workers
+    :param max_pages: PDF pages scanned per file
+    :param scanner_options: QRCodeScanner keyword arguments for the workers
+        (profile, multiscale, pdf_dpi_ladder, ...)
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+    executor = _make_executor(workers, mode, scanner_options, "qr-batch")
+
+    path_iter = enumerate(paths)
+    pending = set()
+    finished = {}  # index -> result, only used in ordered mode
+    next_index = 0
+    exhausted = False
+
+    try:
+        while True:
+            # Top up the pool without ever holding more than max_in_flight
+            while not exhausted and len(pending) + len(finished) < max_in_flight:
+                try:
+                    index, path = next(path_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(
+                    executor.submit(_scan_one_file, index, os.fspath(path), max_pages)
+                )
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if not ordered:
+                    yield result
+                    continue
+                finished[result.index] = result
+
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def scan_pdf_pages(
+    path: str,
+    pages: Iterable[int],
+    workers: Optional[int] = None,
+    mode: str = "process",
+    **scanner_options,
+) -> Iterator[tuple]:
+    """
+    Renders and decodes PDF pages on a worker pool and yields
+    (page_no, DetectionResult) as each page finishes. Each worker opens the
+    document once. Closing the generator early cancels pages not yet started.
+
+    :param path: PDF file
+    :param pages: 1-based page numbers to scan
+    :param workers: Pool size (defaults to the CPU count)
+    :param mode: "process" or "thread" workers
+    :param scanner_options: QRCodeScanner keyword arguments for the workers
+    """
+    pages = list(pages)
+    workers = min(workers or os.cpu_count() or 1, max(len(pages), 1))
+    executor = _make_executor(workers, mode, scanner_options, "qr-pdf")
+    page_of = {
+        executor.submit(_scan_pdf_page, path, page_no): page_no for page_no in pages
+    }
+    pending = set(page_of)
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Pages that finished together come out in page order
+            for future in sorted(done, key=page_of.get):
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        # Don't block on pages already being decoded once the caller has what
+        # it needs; idle workers exit on their own
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Optional
+
+from .results import DetectionResult, QRCode
+
+# Bump when stored results or decoding change in a way that makes old
+# entries wrong
+CACHE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+_HASH_CHUNK = 1 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT, used REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    digest TEXT, settings TEXT, codes TEXT, used REAL,
+    PRIMARY KEY (digest, settings)
+);
+CREATE INDEX IF NOT EXISTS files_used ON files (used);
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+"""
+
+
+def cache_dir() -> str:
+    """Per-user cache directory: ~/Library/Caches on macOS, XDG elsewhere."""
+    if sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "qr-network")
+
+
+def default_cache_path() -> str:
+    return os.path.join(cache_dir(), "scan-cache.sqlite3")
+
+
+def file_digest(path: str) -> str:
+    """BLAKE2b content hash of a file, read in 1 MB chunks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _dump_codes(result: DetectionResult) -> str:
+    return json.dumps(
+        [
+            {
+                "text": code.text,
+                "points": None if code.points is None else code.points.tolist(),
+                "format": code.format,
+                "orientation": code.orientation,
+                "ec_level": code.ec_level,
+                "page": code.page,
+            }
+            for code in result.codes
+        ]
+    )
+
+
+def _load_codes(data: str) -> DetectionResult:
+    import numpy as np
+
+    codes = []
+    for item in json.loads(data):
+        points = item.pop("points")
+        if points is not None:
+            points = np.asarray(points, dtype=np.float32)
+        codes.append(QRCode(points=points, **item))
+    return DetectionResult(codes)
+
+
+class ResultCache:
+    """
+    On-disk cache of file scan results, keyed by a content hash of the file
+    and the decoder settings that produced them.
+
+    A file whose size and mtime match the last time it was seen reuses its
+    recorded hash, so unchanged files are never re-read. Entries are evicted
+    least recently used first once there are more than max_entries. Safe to
+    share between threads and processes (SQLite locking).
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        :param path: SQLite file (defaults to default_cache_path())
+        :param max_entries: Results kept before the least recently used go
+        """
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def digest(self, path: str) -> str:
+        """Content hash of a file, skipping the read when stat() is unchanged."""
+        stat = os.stat(path)
+        path = os.path.abspath(path)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT digest FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+            if row:
+                self._conn.execute(
+                    "UPDATE files SET used = ? WHERE path = ?", (time.time(), path)
+                )
+                return row[0]
+
+        digest = file_digest(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, digest, time.time()),
+            )
+            self._evict("files")
+        return digest
+
+    def lookup(self, path: str, settings: str):
+        """
+        Returns (key, DetectionResult or None). Pass the key to store() so
+        the result is filed under the content that was actually looked up.
+        """
+        key = (self.digest(path), settings)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT codes FROM results WHERE digest = ? AND settings = ?", key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return key, None
+            self._conn.execute(
+                "UPDATE results SET used = ? WHERE digest = ? AND settings = ?",
+                (time.time(), *key),
+            )
+        self.hits += 1
+        return key, _load_codes(row[0])
+
+    def store(self, key, result: DetectionResult):
+        """Records the result (possibly empty) for a key from lookup()."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (*key, _dump_codes(result), time.time()),
+            )
+            self._evict("results")
+
+    def _evict(self, table: str):
+        # Everything past the newest max_entries rows goes
+        self._conn.execute(
+            f"DELETE FROM {table} WHERE rowid IN "
+            f"(SELECT rowid FROM {table} ORDER BY used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,278 @@
+import json
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+import cv2
+
+from .cache import cache_dir
+from .luma import fourcc_to_str
+
+
+def camera_backends() -> list:
+    """(name, OpenCV API preference) pairs tried when opening a camera."""
+    if sys.platform == "darwin":
+        return [("avfoundation", cv2.CAP_AVFOUNDATION), ("any", cv2.CAP_ANY)]
+    return [("any", cv2.CAP_ANY)]
+
+
+def default_probe_path() -> str:
+    return os.path.join(cache_dir(), "camera-backends.json")
+
+
+class CameraProbeCache:
+    """
+    Remembers which OpenCV backend opened each camera index, so the next
+    start tries it first instead of paying for failed opens (each can take
+    seconds on some hardware). Stored as a small JSON file; read and write
+    errors are ignored, the cache only ever saves time.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """:param path: JSON file (defaults to default_probe_path())"""
+        self.path = path or default_probe_path()
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                self._backends = dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            self._backends = {}
+
+    def get(self, camera_id: int) -> Optional[str]:
+        with self._lock:
+            return self._backends.get(str(camera_id))
+
+    def remember(self, camera_id: int, backend: str):
+        with self._lock:
+            if self._backends.get(str(camera_id)) == backend:
+                return
+            self._backends[str(camera_id)] = backend
+            self._save()
+
+    def forget(self, camera_id: int):
+        with self._lock:
+            if self._backends.pop(str(camera_id), None) is not None:
+                self._save()
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self._backends, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def open_camera(camera_id: int, probe_cache: Optional[CameraProbeCache] = None):
+    """
+    Opens a camera with the first backend that works, trying the one the
+    probe cache remembers for this index first. Returns (cap, timing) where
+    timing holds the backend name, the number of backends tried and the open
+    time in seconds, or (None, timing) if no backend could open it.
+    """
+    start = time.perf_counter()
+    remembered = probe_cache.get(camera_id) if probe_cache else None
+    backends = sorted(camera_backends(), key=lambda backend: backend[0] != remembered)
+
+    timing = {"backend": None, "attempts": 0, "remembered": False}
+    for name, api in backends:
+        timing["attempts"] += 1
+        cap = cv2.VideoCapture(camera_id, api)
+        if cap.isOpened():
+            timing["backend"] = name
+            timing["remembered"] = name == remembered
+            timing["open_seconds"] = time.perf_counter() - start
+            if probe_cache:
+                probe_cache.remember(camera_id, name)
+            return cap, timing
+        cap.release()
+
+    if probe_cache and remembered:
+        probe_cache.forget(camera_id)
+    timing["open_seconds"] = time.perf_counter() - start
+    return None, timing
+
+
+class CaptureMode:
+    """
+    Camera stream format requested from the driver. Unset fields keep the
+    driver's default.
+
+    QR decoding needs enough pixels across the code, not the sensor's full
+    resolution, and it needs the newest frame: a compressed (MJPG) 720p
+    stream with a one-frame driver buffer decodes faster, uses a fraction of
+    the USB bandwidth and never hands out frames that queued up while the
+    previous one was being decoded.
+    """
+
+    def __init__(
+        self,
+        name: str = "custom",
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fps: Optional[float] = None,
+        fourcc: Optional[str] = None,
+        buffer_size: Optional[int] = None,
+    ):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+
+    def __repr__(self):
+        return f"CaptureMode({self.name!r})"
+
+    def _settings(self) -> tuple:
+        return (self.width, self.height, self.fps, self.fourcc, self.buffer_size)
+
+    def __eq__(self, other):
+        # Same request to the driver, whatever the preset is called
+        if not isinstance(other, CaptureMode):
+            return NotImplemented
+        return self._settings() == other._settings()
+
+    def __hash__(self):
+        return hash(self._settings())
+
+    def apply(self, cap) -> dict:
+        """
+        Requests this mode from an opened capture and returns the format
+        the driver actually applied (see read_capture_format).
+        """
+        # The pixel format goes first: V4L2 picks the frame size from the
+        # sizes offered for the current format
+        if self.fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        if self.width:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            cap.set(cv2.CAP_PROP_FPS, self.fps)
+        if self.buffer_size:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        return read_capture_format(cap)
+
+
+CAPTURE_PRESETS = {
+    # Whatever the driver starts with
+    "native": {},
+    # Default for scanning: compressed 720p, newest frame only
+    "qr": {"width": 1280, "height": 720, "fps": 30, "fourcc": "MJPG", "buffer_size": 1},
+    # Cheap search stream
+    "low-res": {"width": 640, "height": 480, "fps": 30, "buffer_size": 1},
+    # Small or distant codes
+    "high-res": {
+        "width": 1920,
+        "height": 1080,
+        "fps": 30,
+        "fourcc": "MJPG",
+        "buffer_size": 1,
+    },
+}
+
+
+def get_capture_mode(mode=None) -> CaptureMode:
+    """
+    Returns a CaptureMode for a preset name. CaptureMode instances are
+    passed through unchanged; None means "native".
+    """
+    if isinstance(mode, CaptureMode):
+        return mode
+    name = mode or "native"
+    if name not in CAPTURE_PRESETS:
+        raise ValueError(
+            f"Unknown capture mode '{name}'. Choose from: {', '.join(CAPTURE_PRESETS)}"
+        )
+    return CaptureMode(name=name, **CAPTURE_PRESETS[name])
+
+
+def read_capture_format(cap) -> dict:
+    """
+    The stream format a capture is delivering: width, height, fps, fourcc
+    and the driver buffer size (None where the backend doesn't report it).
+    """
+
+    def prop(name):
+        try:
+            value = float(cap.get(name))
+        except (TypeError, ValueError):
+            return None
+        return value if value > 0 else None
+
+    width, height, fourcc, buffer_size = (
+        prop(name)
+        for name in (
+            cv2.CAP_PROP_FRAME_WIDTH,
+            cv2.CAP_PROP_FRAME_HEIGHT,
+            cv2.CAP_PROP_FOURCC,
+            cv2.CAP_PROP_BUFFERSIZE,
+        )
+    )
+    return {
+        "width": int(width) if width else None,
+        "height": int(height) if height else None,
+        "fps": prop(cv2.CAP_PROP_FPS),
+        "fourcc": fourcc_to_str(fourcc).strip("\x00 ") or None if fourcc else None,
+        "buffer_size": int(buffer_size) if buffer_size else None,
+    }
+
+
+class AdaptiveResolution:
+    """
+    Searches at low resolution and switches the camera to a high-resolution
+    mode only while a probable code is in view: a code zxing located but
+    couldn't decode, usually because it is too small at the search
+    resolution. Goes back to the search mode after a decode, or after
+    `lock_frames` frames at high resolution without a candidate.
+    """
+
+    def __init__(self, search="low-res", lock="high-res", lock_frames: int = 15):
+        """
+        :param search: CaptureMode or preset used while looking for codes
+        :param lock: CaptureMode or preset used once a candidate is seen
+        :param lock_frames: Frames without a candidate before dropping back
+        """
+        self.search_mode = get_capture_mode(search)
+        self.lock_mode = get_capture_mode(lock)
+        self.lock_frames = lock_frames
+        self.locked = False
+        self.remaining = 0
+        self.switches = 0
+
+    def reset(self):
+        self.locked = False
+        self.remaining = 0
+
+    @property
+    def mode(self) -> CaptureMode:
+        return self.lock_mode if self.locked else self.search_mode
+
+    def update(self, found: bool, candidate: bool) -> Optional[CaptureMode]:
+        """
+        Records one decoded frame. Returns the mode to switch the camera to,
+        or None to keep the current one.
+        """
+        if not self.locked:
+            if candidate and not found:
+                self.locked = True
+                self.remaining = self.lock_frames
+                self.switches += 1
+                return self.lock_mode
+            return None
+
+        if candidate and not found:
+            self.remaining = self.lock_frames
+            return None
+        self.remaining -= 1
+        if found or self.remaining <= 0:
+            self.locked = False
+            self.switches += 1
+            return self.search_mode
+        return None
@@ -0,0 +1,214 @@
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Iterable, Optional
+
+# Frames with more pixels than this are decoded as overlapping tiles
+# (~12 MP: whole-desktop screenshots on 5K or multi-monitor setups, and
+# phone photos)
+TILE_THRESHOLD = 12_000_000
+
+# Expected code size in pixels: tiles overlap by this much, so any code up
+# to this size lies whole inside at least one tile
+TILE_CODE_SIZE = 512
+
+
+def decode_text(image) -> Optional[str]:
+    """Decodes an image with zxing-cpp and returns the first non-empty text."""
+    import zxingcpp
+
+    for result in zxingcpp.read_barcodes(image):
+        if result.text:
+            return result.text
+    return None
+
+
+def _decode_shared(decode_fn, name: str, shape: tuple, dtype: str):
+    """Process worker entry point: decodes a frame living in shared memory."""
+    from multiprocessing import shared_memory
+    import numpy as np
+
+    shm = shared_memory.SharedMemory(name=name)
+    frame = None
+    try:
+        frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        return decode_fn(frame)
+    finally:
+        # Drop the view before closing, otherwise the buffer is still exported
+        frame = None
+        shm.close()
+
+
+def split_tiles(frame, rows: int = 2, cols: int = 2, overlap: float = 0.25):
+    """
+    Splits a frame into a grid of overlapping tiles (views, not copies).
+    Returns (tile, (x_offset, y_offset)) pairs.
+    """
+    h, w = frame.shape[:2]
+    tile_h = h // rows
+    tile_w = w // cols
+    pad_h = int(tile_h * overlap)
+    pad_w = int(tile_w * overlap)
+    tiles = []
+    for r in range(rows):
+        for c in range(cols):
+            y0 = max(0, r * tile_h - pad_h)
+            y1 = min(h, (r + 1) * tile_h + pad_h)
+            x0 = max(0, c * tile_w - pad_w)
+            x1 = min(w, (c + 1) * tile_w + pad_w)
+            tiles.append((frame[y0:y1, x0:x1], (x0, y0)))
+    return tiles
+
+
+def sliding_tiles(frame, code_size: int = TILE_CODE_SIZE):
+    """
+    Covers a frame with square windows of 4x the expected code size that
+    overlap by one code size (views, not copies). The last row and column
+    are flush with the frame edge. Returns (tile, (x_offset, y_offset)) pairs.
+    """
+    h, w = frame.shape[:2]
+    side = 4 * code_size
+    step = side - code_size
+
+    def starts(length):
+        if length <= side:
+            return [0]
+        return list(range(0, length - side, step)) + [length - side]
+
+    return [
+        (frame[y : y + side, x : x + side], (x, y))
+        for y in starts(h)
+        for x in starts(w)
+    ]
+
+
+def clear_of_cuts(points, offset, tile_shape, frame_shape, border: int = 2):
+    """
+    True if code corners (in tile coordinates) keep clear of the tile edges
+    that cut through the frame. A code sliced by such an edge can misdecode;
+    the overlapping neighbour holds a whole copy.
+    """
+    if points is None:
+        return True
+    x0, y0 = offset
+    h, w = tile_shape[:2]
+    xs, ys = points[..., 0], points[..., 1]
+    return not (
+        (x0 > 0 and xs.min() < border)
+        or (y0 > 0 and ys.min() < border)
+        or (x0 + w < frame_shape[1] and xs.max() >= w - border)
+        or (y0 + h < frame_shape[0] and ys.max() >= h - border)
+    )
+
+
+class DecodePool:
+    """
+    Spreads zxing decodes over several thread or process workers.
+
+    Process workers receive frames through shared memory instead of pickling
+    the pixel data.
+    """
+
+    MODES = ("thread", "process")
+
+    def __init__(
+        self, workers: Optional[int] = None, mode: str = "thread", decode_fn=None
+    ):
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Unknown decode worker mode '{mode}' (use thread or process)"
+            )
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.decode_fn = decode_fn or decode_text
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="qr-decode"
+                )
+        return self._executor
+
+    def submit(self, frame):
+        """Queues a frame for decoding and returns its Future."""
+        if self.mode == "thread":
+            return self.executor.submit(self.decode_fn, frame)
+
+        from multiprocessing import shared_memory
+        import numpy as np
+
+        frame = np.ascontiguousarray(frame)
+        shm = shared_memory.SharedMemory(create=True, size=max(frame.nbytes, 1))
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)[...] = frame
+        try:
+            future = self.executor.submit(
+                _decode_shared, self.decode_fn, shm.name, frame.shape, frame.dtype.str
+            )
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+
+        def _release(_):
+            shm.close()
+            shm.unlink()
+
+        future.add_done_callback(_release)
+        return future
+
+    def decode_first(self, frames: Iterable):
+        """
+        Decodes frames/tiles concurrently and returns the first successful
+        result. Work still queued when a result arrives is cancelled.
+        """
+        pending = {self.submit(frame) for frame in frames}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Decode worker error: {e}")
+                        continue
+                    if result:
+                        return result
+            return None
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def decode_all(self, frames: Iterable) -> list:
+        """
+        Decodes frames/tiles concurrently and returns every result in input
+        order. A frame whose worker failed yields None.
+        """
+        futures = [self.submit(frame) for frame in frames]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"Decode worker error: {e}")
+                results.append(None)
+        return results
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
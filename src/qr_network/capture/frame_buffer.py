@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+from typing import Optional, Tuple
+
+
+class LatestFrameBuffer:
+    """
+    Small bounded ring buffer that always hands out the newest frame.
+
+    Frames pushed while the buffer is full push the oldest one out, and
+    frames skipped over by `get_latest` are counted as dropped.
+    """
+
+    def __init__(self, size: int = 2):
+        if size < 1:
+            raise ValueError("Buffer size must be at least 1")
+        self._frames = deque(maxlen=size)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self.frames_captured = 0
+        self.frames_dropped = 0
+
+    def put(self, frame, timestamp: Optional[float] = None):
+        """Stores a frame, evicting the oldest one if the buffer is full."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self._cond:
+            if len(self._frames) == self._frames.maxlen:
+                self.frames_dropped += 1
+            self._seq += 1
+            self._frames.append((frame, timestamp, self._seq))
+            self.frames_captured += 1
+            self._cond.notify_all()
+
+    def get_latest(self, timeout: Optional[float] = None) -> Optional[Tuple]:
+        """
+        Returns (frame, timestamp, seq) for the newest frame, or None on timeout.
+        Older frames still waiting in the buffer are discarded.
+        """
+        with self._cond:
+            if not self._frames:
+                self._cond.wait_for(lambda: bool(self._frames), timeout=timeout)
+            if not self._frames:
+                return None
+            item = self._frames.pop()
+            self.frames_dropped += len(self._frames)
+            self._frames.clear()
+            return item
+
+    def clear(self):
+        with self._cond:
+            self._frames.clear()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "frames_captured": self.frames_captured,
+                "frames_dropped": self.frames_dropped,
+            }
+
+
+class CaptureThread:
+    """
+    Reads frames from a cv2.VideoCapture on a dedicated thread so slow decodes
+    never stall the driver queue.
+    """
+
+    def __init__(self, cap, buffer_size: int = 2, transform=None):
+        """
+        :param cap: Opened cv2.VideoCapture
+        :param buffer_size: Number of frames kept by the ring buffer
+        :param transform: Optional per-frame conversion run on the reader thread
+        """
+        self.cap = cap
+        self.transform = transform
+        self.buffer = LatestFrameBuffer(buffer_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._reconfigure = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="qr-capture", daemon=True
+        )
+        self._thread.start()
+
+    def reconfigure(self, fn):
+        """
+        Runs fn on the reader thread before its next read, e.g. to change
+        the stream format, so the caller doesn't wait for the driver. Frames
+        captured before the change are discarded.
+        """
+        self._reconfigure = fn
+
+    def _run(self):
+        while not self._stop.is_set():
+            fn, self._reconfigure = self._reconfigure, None
+            if fn is not None:
+                fn()
+                self.buffer.clear()
+            ret, frame = self.cap.read()
+            if not ret or frame is None:
+                # Avoid spinning when the camera hiccups
+                time.sleep(0.005)
+                continue
+            if self.transform:
+                frame = self.transform(frame)
+                if frame is None:
+                    continue
+            self.buffer.put(frame)
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def read(self, timeout: float = 0.5):
+        """Returns (ret, frame, timestamp) for the newest captured frame."""
+        item = self.buffer.get_latest(timeout=timeout)
+        if item is None:
+            return False, None, None
+        frame, timestamp, _ = item
+        return True, frame, timestamp
@@ -0,0 +1,244 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+
+from .batch import STATUS_ERROR, STATUS_NO_QR, STATUS_OK, FileScanResult
+from .cache import cache_dir, file_digest
+
+# Files picked up from a watched folder
+SCAN_EXTENSIONS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".bmp",
+    ".tif",
+    ".tiff",
+    ".webp",
+    ".pdf",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed (
+    path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT,
+    texts TEXT, scanned REAL
+);
+"""
+
+
+def default_index_path() -> str:
+    return os.path.join(cache_dir(), "folder-index.sqlite3")
+
+
+class FolderIndex:
+    """
+    Persistent record of the files a FolderWatcher has already processed,
+    by absolute path, size, mtime and content hash.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """:param path: SQLite file (defaults to default_index_path())"""
+        self.path = path or default_index_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=10)
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def load(self, directory: str) -> dict:
+        """{path: (size, mtime_ns, digest)} for every file under a directory."""
+        prefix = os.path.join(os.path.abspath(directory), "")
+        rows = self._conn.execute(
+            "SELECT path, size, mtime_ns, digest FROM processed "
+            "WHERE substr(path, 1, ?) = ?",
+            (len(prefix), prefix),
+        )
+        return {path: (size, mtime, digest) for path, size, mtime, digest in rows}
+
+    def record(self, path: str, size: int, mtime_ns: int, digest: str, texts: list):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO processed VALUES (?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, digest, json.dumps(texts), time.time()),
+            )
+
+    def touch(self, path: str, size: int, mtime_ns: int):
+        """Updates the stat of a file whose content didn't change."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE processed SET size = ?, mtime_ns = ? WHERE path = ?",
+                (size, mtime_ns, path),
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+class FolderWatcher:
+    """
+    Scans images and PDFs dropped into a directory as they arrive.
+
+    Each pass lists the directory with os.scandir and only looks further at
+    files whose size or mtime differ from the index. A new file is scanned
+    once it has stayed the same size for one pass, so half-copied files are
+    left alone. A file that was only touched (same content hash) is not
+    rescanned. With the optional `watchdog` package the watcher wakes on
+    filesystem events (inotify, FSEvents, ...) instead of waiting for the
+    next poll.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        scanner,
+        index: Optional[FolderIndex] = None,
+        interval: float = 2.0,
+        recursive: bool = False,
+    ):
+        """
+        :param directory: Folder to watch
+        :param scanner: QRCodeScanner whose scan_file decodes each file
+        :param index: FolderIndex of processed files (in memory only if None)
+        :param interval: Seconds between directory passes
+        :param recursive: Also watch subdirectories
+        """
+        if not os.path.isdir(directory):
+            raise ValueError(f"Not a directory: {directory}")
+        self.directory = os.path.abspath(directory)
+        self.scanner = scanner
+        self.index = index
+        self.interval = interval
+        self.recursive = recursive
+        # path -> (size, mtime_ns, digest) of processed files
+        self.known = index.load(self.directory) if index else {}
+        # path -> (size, mtime_ns) seen on the previous pass, not yet stable
+        self._settling = {}
+        self._wake = threading.Event()
+
+    def _list_files(self) -> dict:
+        """{path: (size, mtime_ns)} of the scannable files in the folder."""
+        found = {}
+        pending = [self.directory]
+        while pending:
+            try:
+                entries = list(os.scandir(pending.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive and not entry.name.startswith("."):
+                            pending.append(entry.path)
+                        continue
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    if entry.name.startswith(".") or ext not in SCAN_EXTENSIONS:
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return found
+
+    def poll(self) -> list:
+        """One pass over the folder; returns a FileScanResult per scanned file."""
+        results = []
+        files = self._list_files()
+        for path, stat in sorted(files.items()):
+            known = self.known.get(path)
+            if known and known[:2] == stat:
+                continue
+            if self._settling.get(path) != stat:
+                # New or still being written: look again next pass
+                self._settling[path] = stat
+                continue
+            del self._settling[path]
+            result = self._process(path, stat, known)
+            if result is not None:
+                results.append(result)
+        # Forget files that vanished before they settled
+        for path in set(self._settling) - set(files):
+            del self._settling[path]
+        return results
+
+    def _process(self, path: str, stat, known) -> Optional[FileScanResult]:
+        start = time.perf_counter()
+        try:
+            digest = file_digest(path)
+        except OSError:
+            return None
+        if known and known[2] == digest:
+            # Touched or copied over with identical content
+            self._remember(path, stat, digest, None)
+            return None
+
+        # Not scan_file: it prints errors and reports them as "no code"
+        try:
+            result = self.scanner._scan_file_result(path)
+            if result is None:
+                codes, status, error = (
+                    [],
+                    STATUS_ERROR,
+                    "Unsupported or unreadable file",
+                )
+            else:
+                codes = result.codes
+                status, error = (STATUS_OK if codes else STATUS_NO_QR), None
+        except Exception as e:
+            codes, status, error = [], STATUS_ERROR, str(e)
+        self._remember(path, stat, digest, [code.text for code in codes])
+        return FileScanResult(
+            path=path,
+            status=status,
+            codes=codes,
+            seconds=time.perf_counter() - start,
+            error=error,
+        )
+
+    def _remember(self, path: str, stat, digest: str, texts: Optional[list]):
+        """Marks a file processed; texts None means only its stat changed."""
+        self.known[path] = (*stat, digest)
+        if self.index is None:
+            return
+        if texts is None:
+            self.index.touch(path, *stat)
+        else:
+            self.index.record(path, *stat, digest, texts)
+
+    def _start_observer(self):
+        """Wakes the watch loop on filesystem events if watchdog is installed."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        wake = self._wake
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+
+        observer = Observer()
+        observer.schedule(_Handler(), self.directory, recursive=self.recursive)
+        observer.start()
+        return observer
+
+    def watch(self, stop: Optional[threading.Event] = None) -> Iterator:
+        """
+        Yields a FileScanResult for every new or changed file until `stop`
+        is set. Files already in the index are skipped without being read.
+        """
+        observer = self._start_observer()
+        try:
+            while stop is None or not stop.is_set():
+                self._wake.clear()
+                yield from self.poll()
+                # Files still being written are rechecked after a short pause
+                self._wake.wait(
+                    min(self.interval, 0.5) if self._settling else self.interval
+                )
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
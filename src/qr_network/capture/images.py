@@ -0,0 +1,98 @@
+import io
+import time
+
+import cv2
+import numpy as np
+
+from .pyramid import MIN_LEVEL_SIDE
+
+# Load scales tried in order. libjpeg can decode a JPEG straight to 1/2, 1/4
+# or 1/8 size, skipping most of the IDCT work, so the coarse passes cost a
+# fraction of a full decode.
+DEFAULT_LOAD_SCALES = (4, 2, 1)
+
+_REDUCED_GRAYSCALE = {
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+
+# In-memory images: bytes searched for the JPEG header (dimensions)
+_HEADER_BYTES = 256 * 1024
+
+
+def as_buffer(data):
+    """
+    Wraps bytes, bytearray, memoryview or any buffer as a flat uint8 array
+    without copying it.
+    """
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def is_jpeg(source) -> bool:
+    """
+    True if a file path or in-memory buffer starts with a JPEG signature,
+    whatever the file's extension.
+    """
+    if not isinstance(source, str):
+        return bytes(source[:3]) == _JPEG_MAGIC
+    try:
+        with open(source, "rb") as f:
+            return f.read(3) == _JPEG_MAGIC
+    except OSError:
+        return False
+
+
+def image_size(source):
+    """(width, height) read from the image header only, or None."""
+    from PIL import Image
+
+    if not isinstance(source, str):
+        # Only the head of the buffer is copied for PIL
+        source = io.BytesIO(bytes(source[:_HEADER_BYTES]))
+    try:
+        with Image.open(source) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def load_gray(source, scale: int = 1):
+    """
+    Loads an image file path, or decodes an in-memory uint8 buffer (see
+    as_buffer), as an 8-bit luminance array at 1/scale size (scale 2, 4 or
+    8; other formats than JPEG are resized after a full decode). Returns None
+    if the image can't be read.
+    """
+    flags = cv2.IMREAD_GRAYSCALE if scale == 1 else _REDUCED_GRAYSCALE[scale]
+    if isinstance(source, str):
+        return cv2.imread(source, flags)
+    return cv2.imdecode(source, flags)
+
+
+def load_levels(source, scales=DEFAULT_LOAD_SCALES, min_side: int = MIN_LEVEL_SIDE):
+    """
+    Yields (scale, gray_image, load_seconds) from coarsest to full
+    resolution, for a file path or an in-memory uint8 buffer. Reduced levels
+    are only produced for JPEGs, where they are cheaper than a full decode,
+    and only while the shorter side stays at or above min_side. Levels that
+    fail to load are skipped.
+    """
+    levels = [1]
+    if is_jpeg(source):
+        size = image_size(source)
+        levels = [
+            scale
+            for scale in sorted(set(scales), reverse=True)
+            if scale in _REDUCED_GRAYSCALE
+            and size is not None
+            and min(size) // scale >= min_side
+        ] + levels
+
+    for scale in levels:
+        start = time.perf_counter()
+        image = load_gray(source, scale)
+        if image is not None:
+            yield scale, image, time.perf_counter() - start
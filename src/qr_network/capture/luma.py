@@ -0,0 +1,76 @@
+"""
+Helpers that reduce capture buffers to a single 8-bit luminance plane.
+
+zxing only ever looks at luminance, so converting once at the source avoids
+carrying three colour channels (and their copies) through the pipeline.
+"""
+
+import cv2
+import numpy as np
+
+# FOURCCs whose raw buffers interleave luminance as every other byte
+_YUYV_FOURCCS = {"YUYV", "YUY2", "YUNV", "V422"}
+_UYVY_FOURCCS = {"UYVY", "Y422", "UYNV", "HDYC"}
+
+
+def to_gray(frame):
+    """Returns a single-channel version of a BGR/BGRA/gray frame."""
+    if frame.ndim == 2:
+        return frame
+    if frame.shape[2] == 1:
+        return frame[:, :, 0]
+    if frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def fourcc_to_str(value) -> str:
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def is_packed_yuv(fourcc: str) -> bool:
+    return fourcc in _YUYV_FOURCCS or fourcc in _UYVY_FOURCCS
+
+
+def packed_yuv_luma(raw, width: int, height: int, fourcc: str):
+    """
+    Extracts the Y plane from a raw packed 4:2:2 buffer (YUYV or UYVY).
+    Returns None if the buffer doesn't match the expected layout.
+    """
+    if fourcc in _YUYV_FOURCCS:
+        offset = 0
+    elif fourcc in _UYVY_FOURCCS:
+        offset = 1
+    else:
+        return None
+    if raw.size != width * height * 2:
+        return None
+    # Strided view: no copy until zxing reads it
+    return raw.reshape(height, width, 2)[:, :, offset]
+
+
+def pil_to_gray(image):
+    """Converts a PIL image to an 8-bit luminance array in one step."""
+    if image.mode != "L":
+        image = image.convert("L")
+    return np.asarray(image)
+
+
+def pixmap_to_gray(pix):
+    """
+    Wraps a PyMuPDF pixmap as a luminance array. Grayscale pixmaps are used
+    as-is; colour ones are reduced once.
+    """
+    # pix.samples (not samples_mv): the memoryview doesn't keep the pixmap
+    # alive, and frames may outlive the page loop when decoded in a pool
+    samples = np.frombuffer(pix.samples, dtype=np.uint8)
+    if pix.n == 1:
+        return samples.reshape(pix.h, pix.w)
+    img = samples.reshape(pix.h, pix.w, pix.n)
+    if pix.n == 4:
+        return cv2.cvtColor(img, cv2.COLOR_RGBA2GRAY)
+    if pix.n == 3:
+        return cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+    # Gray + alpha
+    return img[:, :, 0]
@@ -0,0 +1,146 @@
+import time
+
+import cv2
+import numpy as np
+
+from .luma import to_gray
+
+
+class ChangeDetector:
+    """
+    Cheap scene-change gate for camera frames.
+
+    Each frame is reduced to a tiny grayscale thumbnail. Decoding is skipped
+    while the scene still matches the frame of the last failed decode, and
+    throttled while the camera is moving (blurred frames rarely decode). Once
+    motion settles on a new scene every frame is decoded again.
+    """
+
+    def __init__(
+        self,
+        thumb_width: int = 64,
+        change_threshold: float = 4.0,
+        motion_threshold: float = 12.0,
+        moving_stride: int = 3,
+        refresh_interval: float = 2.0,
+    ):
+        """
+        :param thumb_width: Width of the comparison thumbnail in pixels
+        :param change_threshold: Mean absolute difference (0-255) above which
+            the scene counts as changed since the last failed decode
+        :param motion_threshold: Frame-to-frame difference treated as motion
+        :param moving_stride: Decode every Nth frame while moving
+        :param refresh_interval: Force a decode after this many seconds of
+            skipping, to recover from slow drift (exposure, focus)
+        """
+        self.thumb_width = thumb_width
+        self.change_threshold = change_threshold
+        self.motion_threshold = motion_threshold
+        self.moving_stride = moving_stride
+        self.refresh_interval = refresh_interval
+        self.reset()
+
+    def reset(self):
+        self.frames_skipped = 0
+        self._reference = None
+        self._previous = None
+        self._moving_count = 0
+        self._last_decode = 0.0
+
+    def thumbnail(self, frame):
+        """Tiny float32 grayscale thumbnail used for comparisons."""
+        gray = to_gray(frame[::4, ::4])
+        h, w = gray.shape[:2]
+        height = max(1, int(h * self.thumb_width / max(w, 1)))
+        small = cv2.resize(
+            gray, (self.thumb_width, height), interpolation=cv2.INTER_AREA
+        )
+        return small.astype(np.float32)
+
+    @staticmethod
+    def _difference(a, b) -> float:
+        if a is None or b is None or a.shape != b.shape:
+            return float("inf")
+        return float(np.mean(np.abs(a - b)))
+
+    def should_decode(self, frame) -> bool:
+        """Returns True if this frame is worth a full decode."""
+        thumb = self.thumbnail(frame)
+        motion = self._difference(thumb, self._previous)
+        self._previous = thumb
+
+        decode = True
+        if time.monotonic() - self._last_decode < self.refresh_interval:
+            if self._difference(thumb, self._reference) < self.change_threshold:
+                # Same scene we already failed to decode
+                decode = False
+            elif motion != float("inf") and motion > self.motion_threshold:
+                # Still moving: sample a few frames, decode fully once settled
+                self._moving_count += 1
+                decode = self._moving_count % self.moving_stride == 0
+            else:
+                self._moving_count = 0
+
+        if decode:
+            self._last_decode = time.monotonic()
+        else:
+            self.frames_skipped += 1
+        return decode
+
+    def record_miss(self):
+        """Remembers the last gated frame as a scene with no decodable code."""
+        self._reference = self._previous
+
+
+class DirtyRegionDetector:
+    """
+    Finds the parts of a screen capture that changed since the previous one.
+
+    Captures are reduced to one mean value per block; blocks whose mean moved
+    by more than the threshold are grown by a margin (so a code that is only
+    partly redrawn is still decoded whole) and merged into rectangles.
+    """
+
+    def __init__(self, block: int = 16, threshold: float = 6.0, margin: int = 2):
+        """
+        :param block: Block size in pixels
+        :param threshold: Change of a block's mean (0-255) that marks it dirty
+        :param margin: Blocks added around every dirty area
+        """
+        self.block = block
+        self.threshold = threshold
+        self.margin = margin
+        self.reset()
+
+    def reset(self):
+        self._previous = None
+
+    def update(self, frame) -> list:
+        """
+        Returns the changed (x, y, w, h) rectangles of a frame in pixels. The
+        first frame, or one with a new size, is dirty as a whole.
+        """
+        gray = to_gray(frame)
+        h, w = gray.shape[:2]
+        cols, rows = max(1, w // self.block), max(1, h // self.block)
+        blocks = cv2.resize(gray, (cols, rows), interpolation=cv2.INTER_AREA)
+        previous, self._previous = self._previous, blocks.astype(np.int16)
+        if previous is None or previous.shape != self._previous.shape:
+            return [(0, 0, w, h)]
+
+        dirty = (np.abs(self._previous - previous) > self.threshold).astype(np.uint8)
+        if not dirty.any():
+            return []
+        if self.margin:
+            size = 2 * self.margin + 1
+            dirty = cv2.dilate(dirty, np.ones((size, size), np.uint8))
+
+        count, _, stats, _ = cv2.connectedComponentsWithStats(dirty, connectivity=8)
+        x_step, y_step = w / cols, h / rows
+        regions = []
+        for x, y, bw, bh, _ in stats[1:count]:
+            x0, y0 = int(x * x_step), int(y * y_step)
+            x1 = min(w, int(np.ceil((x + bw) * x_step)))
+            y1 = min(h, int(np.ceil((y + bh) * y_step)))
+            regions.append((x0, y0, x1 - x0, y1 - y0))
+        return regions
@@ -0,0 +1,241 @@
+import threading
+
+from .luma import pixmap_to_gray
+from .results import DetectionResult
+
+# Render resolutions tried in order. Most onboarding codes are big enough to
+# read at 72 DPI; 300 DPI is only needed for small print.
+DEFAULT_DPI_LADDER = (72, 150, 300)
+
+# PDF user space is 72 points per inch
+POINTS_PER_INCH = 72
+
+# Embedded bitmaps smaller than this can't hold a QR code (21 modules)
+MIN_EMBEDDED_SIDE = 21
+
+# Largest clip side rendered by two-stage (clip) rendering, in pixels
+TILE_PIXELS = 1024
+
+# MuPDF is not thread-safe: thread workers render one page at a time and
+# only overlap on decoding. Process workers each have their own lock.
+render_lock = threading.RLock()
+
+
+def render_page(page, dpi: int, clip=None):
+    """
+    Renders a PyMuPDF page (or a clip rectangle of it) straight to an 8-bit
+    luminance array, without alpha.
+    """
+    import fitz  # PyMuPDF
+
+    with render_lock:
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False, clip=clip)
+        return pixmap_to_gray(pix)
+
+
+def points_scale(dpi: int) -> float:
+    """Factor mapping pixels rendered at `dpi` back to PDF points."""
+    return POINTS_PER_INCH / dpi
+
+
+def embedded_images(page, min_side: int = MIN_EMBEDDED_SIDE):
+    """
+    Yields (gray_image, scale, offset) for each placement of a bitmap embedded
+    in a page, at the image's native resolution. scale and offset map image
+    pixels to PDF points (axis-aligned placements; rotated ones only get their
+    bounding box). Images that can't be extracted are skipped.
+    """
+    import fitz  # PyMuPDF
+
+    seen = set()
+    for info in page.get_images(full=True):
+        xref = info[0]
+        if xref in seen:
+            continue
+        seen.add(xref)
+        try:
+            with render_lock:
+                pix = fitz.Pixmap(page.parent, xref)
+                if min(pix.w, pix.h) < min_side:
+                    continue
+                if pix.colorspace is None or pix.colorspace.n != 1 or pix.alpha:
+                    pix = fitz.Pixmap(fitz.csGRAY, pix)
+                    if pix.alpha:
+                        pix = fitz.Pixmap(pix, 0)
+                image = pixmap_to_gray(pix)
+                rects = page.get_image_rects(xref)
+        except Exception:
+            continue
+        for rect in rects:
+            if rect.is_empty:
+                continue
+            scale = (rect.width / pix.w, rect.height / pix.h)
+            yield image, scale, (rect.x0, rect.y0)
+
+
+def candidate_clips(candidates, scale: float, page_rect, margin: float = 0.5):
+    """
+    Clip rectangles (PDF points) around codes located in a low-DPI render,
+    grown by `margin` times the code size on every side.
+
+    :param candidates: 4x1x2 corner points in rendered pixels
+    :param scale: Factor mapping rendered pixels to PDF points
+    """
+    import fitz  # PyMuPDF
+
+    clips = []
+    for points in candidates:
+        corners = points.reshape(-1, 2) * scale
+        x0, y0 = corners.min(axis=0) + (page_rect.x0, page_rect.y0)
+        x1, y1 = corners.max(axis=0) + (page_rect.x0, page_rect.y0)
+        pad = max(x1 - x0, y1 - y0) * margin
+        clip = fitz.Rect(x0 - pad, y0 - pad, x1 + pad, y1 + pad) & page_rect
+        if not clip.is_empty:
+            clips.append(clip)
+    return clips
+
+
+def page_tiles(page_rect, dpi: int, tile_pixels: int = TILE_PIXELS, overlap=0.25):
+    """
+    Overlapping clip rectangles covering a page so that each one renders to
+    at most tile_pixels x tile_pixels at `dpi`.
+    """
+    import fitz  # PyMuPDF
+
+    side = tile_pixels * points_scale(dpi)
+    step = side * (1 - overlap)
+
+    def starts(lo, hi):
+        positions = [lo]
+        while positions[-1] + side < hi:
+            positions.append(positions[-1] + step)
+        return positions
+
+    return [
+        fitz.Rect(x, y, min(x + side, page_rect.x1), min(y + side, page_rect.y1))
+        for y in starts(page_rect.y0, page_rect.y1)
+        for x in starts(page_rect.x0, page_rect.x1)
+    ]
+
+
+def _inside(points, shape, border: int = 2) -> bool:
+    """True if code corners stay clear of the image border."""
+    if points is None:
+        return True
+    h, w = shape[:2]
+    xs, ys = points[..., 0], points[..., 1]
+    return (
+        xs.min() >= border
+        and ys.min() >= border
+        and xs.max() < w - border
+        and ys.max() < h - border
+    )
+
+
+def _decode_clips(page, decode, dpi: int, clips) -> DetectionResult:
+    found = DetectionResult()
+    for clip in clips:
+        image = render_page(page, dpi, clip=clip)
+        result = decode(image)
+        # A code cut by the clip edge can misdecode; overlapping tiles hold
+        # a whole copy
+        result = DetectionResult(
+            [code for code in result.codes if _inside(code.points, image.shape)]
+        )
+        found.extend(result.transformed(points_scale(dpi), (clip.x0, clip.y0)))
+    return found
+
+
+def decode_page(
+    page,
+    decode,
+    dpi_ladder=DEFAULT_DPI_LADDER,
+    embedded: bool = True,
+    clip: bool = False,
+):
+    """
+    Decodes the page's embedded images first, then renders the page at each
+    DPI of the ladder until `decode` finds a code. Only one rendering is alive
+    at a time.
+
+    With clip, only the lowest DPI renders the full page. Higher DPIs render
+    clip rectangles around the codes zxing located but could not read, or
+    else the page in bounded tiles, so peak memory stays at a few small
+    tiles. `decode` should then return candidates.
+
+    :param page: PyMuPDF page
+    :param decode: Callable taking a gray frame and returning a DetectionResult
+    :param dpi_ladder: Resolutions to try, lowest first
+    :param embedded: Try embedded bitmaps before rasterizing the page
+    :param clip: Two-stage rendering: low-DPI search, high-DPI clips
+    :return: (DetectionResult with points in PDF points, dpi that found it).
+        The dpi is "embedded" when an embedded image matched and None when
+        nothing was found.
+    """
+    if embedded:
+        found = DetectionResult()
+        for image, scale, offset in embedded_images(page):
+            found.extend(decode(image).transformed(scale, offset))
+        if found:
+            return found, "embedded"
+
+    if clip and dpi_ladder:
+        low = dpi_ladder[0]
+        result = decode(render_page(page, low))
+        if result:
+            return result.transformed(points_scale(low)), low
+        # Codes located but unreadable at low DPI first, then the whole page
+        regions = candidate_clips(result.candidates, points_scale(low), page.rect)
+        for dpi in dpi_ladder[1:] if regions else ():
+            found = _decode_clips(page, decode, dpi, regions)
+            if found:
+                return found, dpi
+        for dpi in dpi_ladder[1:]:
+            found = _decode_clips(page, decode, dpi, page_tiles(page.rect, dpi))
+            if found:
+                return found, dpi
+        return DetectionResult(), None
+
+    for dpi in dpi_ladder:
+        result = decode(render_page(page, dpi))
+        if result:
+            return result.transformed(points_scale(dpi)), dpi
+    return DetectionResult(), None
+
+
+def parse_pages(pages, page_count: int) -> list:
+    """
+    Resolves a page selection to a sorted list of 1-based page numbers.
+
+    :param pages: None or "all" for every page, a spec such as "1-3,7" or
+        "5-" (to the end), or an iterable of page numbers
+    :param page_count: Number of pages in the document
+    """
+    if pages is None or pages == "all":
+        return list(range(1, page_count + 1))
+
+    if isinstance(pages, str):
+        selected = set()
+        for part in pages.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                if "-" in part:
+                    start, end = part.split("-", 1)
+                    first = int(start) if start.strip() else 1
+                    last = int(end) if end.strip() else page_count
+                    selected.update(range(first, last + 1))
+                else:
+                    selected.add(int(part))
+            except ValueError:
+                raise ValueError(f"Invalid page range '{pages}'") from None
+    else:
+        selected = {int(page) for page in pages}
+
+    out_of_range = [p for p in selected if not 1 <= p <= page_count]
+    if out_of_range or not selected:
+        raise ValueError(
+            f"Page selection '{pages}' is outside the document (1-{page_count})"
+        )
+    return sorted(selected)
@@ -0,0 +1,139 @@
+from typing import Optional
+
+
+class DecoderProfile:
+    """
+    zxing-cpp reader settings, resolved once and reused for every decode.
+
+    Restricting formats to QR codes stops zxing from searching for 1D and
+    other 2D symbologies we never use.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        formats: tuple = ("QRCode",),
+        binarizer: str = "LocalAverage",
+        try_rotate: bool = True,
+        try_downscale: bool = True,
+        try_invert: bool = True,
+    ):
+        self.name = name
+        self.formats = tuple(formats)
+        self.binarizer = binarizer
+        self.try_rotate = try_rotate
+        self.try_downscale = try_downscale
+        self.try_invert = try_invert
+        self._zxing = None
+        self._options = None
+
+    def __repr__(self):
+        return f"DecoderProfile({self.name!r})"
+
+    def __getstate__(self):
+        # zxing enums/modules don't pickle; process workers rebuild them
+        state = self.__dict__.copy()
+        state["_zxing"] = None
+        state["_options"] = None
+        return state
+
+    @property
+    def options(self) -> dict:
+        """Keyword arguments for zxingcpp.read_barcodes, built on first use."""
+        if self._options is None:
+            import zxingcpp
+
+            # zxing-cpp 3 takes a tuple of formats (`|` is deprecated)
+            formats = tuple(
+                getattr(zxingcpp.BarcodeFormat, fmt) for fmt in self.formats
+            )
+            if len(formats) == 1:
+                formats = formats[0]
+
+            self._zxing = zxingcpp
+            self._options = {
+                "formats": formats,
+                "binarizer": getattr(zxingcpp.Binarizer, self.binarizer),
+                "try_rotate": self.try_rotate,
+                "try_downscale": self.try_downscale,
+                "try_invert": self.try_invert,
+            }
+        return self._options
+
+    def _zxing_image(self, image):
+        """
+        Adapts a frame for zxing. BGRA frames (screen captures) are wrapped as
+        an ImageView so zxing reads the capture buffer in place instead of a
+        converted copy. Strided BGRA views, and any BGRA frame on a zxing-cpp
+        without ImageView, are reduced to luminance; everything else is passed
+        through. Needs `options` to have been built.
+        """
+        if getattr(image, "ndim", 0) != 3 or image.shape[2] != 4:
+            return image
+        if not image.flags.c_contiguous or not hasattr(self._zxing, "ImageView"):
+            from .luma import to_gray
+
+            return to_gray(image)
+        height, width = image.shape[:2]
+        return self._zxing.ImageView(image, width, height, self._zxing.ImageFormat.BGRA)
+
+    def read_barcodes(self, image, return_errors: bool = False):
+        """Runs zxing on an image with this profile's options."""
+        options = self.options
+        image = self._zxing_image(image)
+        if return_errors:
+            return self._zxing.read_barcodes(image, return_errors=True, **options)
+        return self._zxing.read_barcodes(image, **options)
+
+    def decode(self, image):
+        """Returns a DetectionResult with every code found in an image."""
+        from .results import DetectionResult
+
+        return DetectionResult.from_zxing(self.read_barcodes(image))
+
+    def decode_text(self, image) -> Optional[str]:
+        """Returns the first non-empty text found in an image."""
+        for result in self.read_barcodes(image):
+            if result.text:
+                return result.text
+        return None
+
+
+PRESETS = {
+    "default": {},
+    # Live video: codes are upright-ish and large, favour frame rate
+    "fast-camera": {
+        "try_rotate": False,
+        "try_downscale": False,
+        "try_invert": False,
+    },
+    # Files and screenshots: one-off decodes, spend the time
+    "thorough-file": {
+        "formats": ("QRCode", "MicroQRCode"),
+        "try_rotate": True,
+        "try_downscale": True,
+        "try_invert": True,
+    },
+    # Washed-out prints and dim screens
+    "low-contrast": {
+        "binarizer": "GlobalHistogram",
+        "try_rotate": True,
+        "try_downscale": True,
+        "try_invert": True,
+    },
+}
+
+
+def get_profile(profile=None) -> DecoderProfile:
+    """
+    Returns a fresh DecoderProfile for a preset name. DecoderProfile
+    instances are passed through unchanged; None means "default".
+    """
+    if isinstance(profile, DecoderProfile):
+        return profile
+    name = profile or "default"
+    if name not in PRESETS:
+        raise ValueError(
+            f"Unknown decoder profile '{name}'. Choose from: {', '.join(PRESETS)}"
+        )
+    return DecoderProfile(name=name, **PRESETS[name])
@@ -0,0 +1,29 @@
+import cv2
+
+from .luma import to_gray
+
+# Coarse to fine: 4x smaller, 2x smaller, then full resolution
+DEFAULT_SCALES = (4, 2, 1)
+
+# Levels whose shorter side would fall below this are skipped
+MIN_LEVEL_SIDE = 256
+
+
+def pyramid_levels(frame, scales=DEFAULT_SCALES, min_side: int = MIN_LEVEL_SIDE):
+    """
+    Yields (scale, image) pairs from coarsest to finest. The frame is reduced
+    to grayscale once and each level is downscaled from it with area
+    averaging. Scale 1 is always yielded.
+    """
+    gray = to_gray(frame)
+    h, w = gray.shape[:2]
+    for scale in sorted(set(scales), reverse=True):
+        if scale <= 1:
+            continue
+        if min(h, w) // scale < min_side:
+            continue
+        yield (
+            scale,
+            cv2.resize(gray, (w // scale, h // scale), interpolation=cv2.INTER_AREA),
+        )
+    yield 1, gray
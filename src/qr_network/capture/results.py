@@ -0,0 +1,124 @@
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+import numpy as np
+
+
+def position_to_points(position):
+    """Converts a zxing Position into OpenCV style 4x1x2 corner points."""
+    try:
+        corners = (
+            position.top_left,
+            position.top_right,
+            position.bottom_right,
+            position.bottom_left,
+        )
+        return np.array([[[float(p.x), float(p.y)]] for p in corners], dtype=np.float32)
+    except Exception:
+        return None
+
+
+@dataclass
+class QRCode:
+    """One decoded code and where it was found."""
+
+    text: str
+    # Corner points (top-left, top-right, bottom-right, bottom-left), 4x1x2
+    # in source-frame pixels, or PDF points for PDF pages
+    points: Optional[np.ndarray] = None
+    format: str = ""
+    orientation: int = 0
+    ec_level: str = ""
+    # 1-based page for PDF files; None for camera/screen frames
+    page: Optional[int] = None
+
+    @classmethod
+    def from_zxing(cls, result) -> "QRCode":
+        return cls(
+            text=result.text,
+            points=position_to_points(result.position),
+            format=str(result.format),
+            orientation=int(result.orientation),
+            ec_level=str(result.ec_level),
+        )
+
+    @property
+    def is_wifi(self) -> bool:
+        return self.text.upper().startswith("WIFI:")
+
+
+@dataclass
+class DetectionResult:
+    """All codes found by one decode pass over a frame."""
+
+    codes: list = field(default_factory=list)
+    # Points of codes that were located but could not be decoded
+    candidates: list = field(default_factory=list)
+
+    @classmethod
+    def from_zxing(cls, results) -> "DetectionResult":
+        detection = cls()
+        for result in results:
+            if result.text:
+                detection.add(QRCode.from_zxing(result))
+            else:
+                points = position_to_points(result.position)
+                if points is not None:
+                    detection.candidates.append(points)
+        return detection
+
+    def __bool__(self):
+        return bool(self.codes)
+
+    @property
+    def text(self) -> Optional[str]:
+        """Text of the first code, or None."""
+        return self.codes[0].text if self.codes else None
+
+    @property
+    def texts(self) -> list:
+        return [code.text for code in self.codes]
+
+    def wifi_codes(self) -> list:
+        return [code for code in self.codes if code.is_wifi]
+
+    def first(self):
+        """(text, points) of the first code, or (None, candidate points)."""
+        if self.codes:
+            return self.codes[0].text, self.codes[0].points
+        return None, (self.candidates[0] if self.candidates else None)
+
+    def add(self, code: QRCode):
+        """Adds a code unless the same payload was already found."""
+        if code.text not in self.texts:
+            self.codes.append(code)
+
+    def extend(self, other: "DetectionResult"):
+        for code in other.codes:
+            self.add(code)
+        self.candidates.extend(other.candidates)
+
+    def transformed(self, scale: float = 1, offset=(0, 0), page=None):
+        """
+        Maps points from a downscaled/cropped image back to the source frame:
+        source = points * scale + offset. scale may be a number or an (x, y)
+        pair.
+        """
+
+        def _map(points):
+            if points is None:
+                return None
+            return points * np.asarray(scale, dtype=np.float32) + np.asarray(
+                offset, dtype=np.float32
+            )
+
+        codes = []
+        for code in self.codes:
+            codes.append(
+                replace(
+                    code,
+                    points=_map(code.points),
+                    page=page if page is not None else code.page,
+                )
+            )
+        return DetectionResult(codes, [_map(p) for p in self.candidates])
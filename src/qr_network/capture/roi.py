@@ -0,0 +1,66 @@
+from typing import Optional, Tuple
+
+
+class ROITracker:
+    """
+    Remembers where the last QR candidate was seen so later camera frames can
+    be decoded inside that region (plus a margin) instead of the whole frame.
+    After `max_misses` consecutive misses it falls back to the full frame.
+    """
+
+    def __init__(self, margin: float = 0.5, max_misses: int = 5, min_size: int = 64):
+        """
+        :param margin: Extra border around the code, as a fraction of its size
+        :param max_misses: Misses inside the region before going back to full frames
+        :param min_size: Smallest region side length in pixels
+        """
+        self.margin = margin
+        self.max_misses = max_misses
+        self.min_size = min_size
+        self.roi: Optional[Tuple[int, int, int, int]] = None
+        self.misses = 0
+
+    def reset(self):
+        self.roi = None
+        self.misses = 0
+
+    def crop(self, frame):
+        """Returns (view, (x_offset, y_offset)) for the region to decode next."""
+        if self.roi is None:
+            return frame, (0, 0)
+        x0, y0, x1, y1 = self.roi
+        return frame[y0:y1, x0:x1], (x0, y0)
+
+    def hit(self, points, frame_shape):
+        """Centres the region on `points` (full-frame Nx1x2 or Nx2 corners)."""
+        import numpy as np
+
+        pts = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        h, w = frame_shape[:2]
+        x_min, y_min = pts.min(axis=0)
+        x_max, y_max = pts.max(axis=0)
+
+        pad_x = max(
+            (x_max - x_min) * self.margin, (self.min_size - (x_max - x_min)) / 2
+        )
+        pad_y = max(
+            (y_max - y_min) * self.margin, (self.min_size - (y_max - y_min)) / 2
+        )
+
+        x0 = int(max(0, x_min - pad_x))
+        y0 = int(max(0, y_min - pad_y))
+        x1 = int(min(w, x_max + pad_x))
+        y1 = int(min(h, y_max + pad_y))
+        if x1 <= x0 or y1 <= y0:
+            self.reset()
+            return
+        self.roi = (x0, y0, x1, y1)
+        self.misses = 0
+
+    def miss(self):
+        """Counts a miss; returns to full-frame decoding once too many pile up."""
+        if self.roi is None:
+            return
+        self.misses += 1
+        if self.misses >= self.max_misses:
+            self.reset()
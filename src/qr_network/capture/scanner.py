@@ -1,56 +1,727 @@
 import cv2
 import time
-import sys
+import threading
+from functools import partial
 from typing import Optional
 
+from .camera import AdaptiveResolution, get_capture_mode, open_camera
+from .decode_pool import (
+    TILE_CODE_SIZE,
+    TILE_THRESHOLD,
+    DecodePool,
+    clear_of_cuts,
+    sliding_tiles,
+    split_tiles,
+)
+from .frame_buffer import CaptureThread
+from .images import DEFAULT_LOAD_SCALES, as_buffer, load_levels
+from .motion import ChangeDetector
+from .luma import (
+    fourcc_to_str,
+    is_packed_yuv,
+    packed_yuv_luma,
+    to_gray,
+)
+from .pdf import (
+    DEFAULT_DPI_LADDER,
+    decode_page,
+    embedded_images,
+    points_scale,
+    render_page,
+)
+from .profiles import get_profile
+from .pyramid import DEFAULT_SCALES, pyramid_levels
+from .results import DetectionResult
+from .roi import ROITracker
+from .screen import ScreenWatcher, grab_desktop, grab_monitor, list_monitors
+
+
+def _release_warm_camera(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result()[0].release()
+
 
 class QRCodeScanner:
-    def __init__(self, camera_id: int = 0):
+    def __init__(
+        self,
+        camera_id: int = 0,
+        threaded: bool = False,
+        buffer_size: int = 2,
+        decode_workers: int = 0,
+        decode_mode: str = "thread",
+        roi_tracking: bool = False,
+        roi_max_misses: int = 5,
+        multiscale: bool = False,
+        pyramid_scales: tuple = DEFAULT_SCALES,
+        grayscale: bool = False,
+        profile=None,
+        change_gating: bool = False,
+        pdf_dpi_ladder: tuple = DEFAULT_DPI_LADDER,
+        pdf_embedded_images: bool = True,
+        pdf_clip_render: bool = False,
+        screen_zero_copy: bool = False,
+        tile_threshold: int = TILE_THRESHOLD,
+        tile_code_size: int = TILE_CODE_SIZE,
+        image_load_scales: tuple = DEFAULT_LOAD_SCALES,
+        result_cache=None,
+        camera_cache=None,
+        capture_mode=None,
+        adaptive_resolution=False,
+    ):
+        """
+        :param camera_id: OpenCV camera index
+        :param threaded: Read camera frames on a background thread into a
+            latest-frame ring buffer so decoding always sees the newest frame
+        :param buffer_size: Number of frames kept by the ring buffer
+        :param decode_workers: Size of the decode worker pool (0 decodes inline)
+        :param decode_mode: "thread" or "process" decode workers
+        :param roi_tracking: Decode camera frames inside the last known code
+            region instead of the full frame
+        :param roi_max_misses: Misses inside the region before falling back to
+            full-frame decoding
+        :param multiscale: Try cheap downscaled grayscale levels before the
+            full-resolution frame
+        :param pyramid_scales: Downscale factors tried by multiscale detection
+        :param grayscale: Deliver camera frames as a single luminance plane,
+            taken straight from the raw YUV stream when the backend allows it
+        :param profile: DecoderProfile or preset name ("fast-camera",
+            "thorough-file", "low-contrast"); defaults to QR-only zxing defaults
+        :param change_gating: Skip camera decodes while the scene is unchanged
+            since the last failed decode
+        :param pdf_dpi_ladder: PDF render resolutions, lowest first; a page is
+            only re-rendered at the next DPI when nothing was found
+        :param pdf_embedded_images: Decode bitmaps embedded in PDF pages at
+            their native resolution before rasterizing the page
+        :param pdf_clip_render: Render full PDF pages only at the lowest DPI
+            and higher DPIs as small clips around located codes (or tiles),
+            bounding peak memory on large pages
+        :param screen_zero_copy: Hand full-resolution screen captures to zxing
+            as the BGRA capture buffer itself instead of a luminance copy.
+            Saves a quarter-frame allocation per capture, but zxing's own
+            conversion is slower than OpenCV's (see
+            scripts/bench_screen_capture.py)
+        :param tile_threshold: Frames with more pixels than this are decoded
+            as overlapping tiles in parallel (0 disables tiling)
+        :param tile_code_size: Expected code size in pixels for tiling; tiles
+            are 4x this and overlap by it
+        :param image_load_scales: Reduced scales JPEG files are decoded at
+            before full resolution, coarsest first; (1,) always loads full
+            resolution
+        :param result_cache: ResultCache consulted by scan_file; files whose
+            content was already scanned with the same settings skip decoding
+        :param camera_cache: CameraProbeCache remembering which backend
+            opened each camera index, tried first on the next start
+        :param capture_mode: CaptureMode or preset name ("qr", "low-res",
+            "high-res") requested from the camera when it opens; defaults to
+            the driver's native mode
+        :param adaptive_resolution: Search at low resolution and switch the
+            camera to a high-resolution mode while a located but undecoded
+            code is in view (True, or an AdaptiveResolution with its own
+            modes); replaces capture_mode. Camera frames decoded inline only
+        """
         self.camera_id = camera_id
         self.cap = None
+        self.threaded = threaded
+        self.buffer_size = buffer_size
+        self.capture_thread = None
+        self.last_stats = {}
+        self.last_result = DetectionResult()
+        self.profile = get_profile(profile)
+        self.decode_pool = (
+            DecodePool(decode_workers, decode_mode, self.profile.decode)
+            if decode_workers > 0
+            else None
+        )
+        self.roi_tracker = (
+            ROITracker(max_misses=roi_max_misses) if roi_tracking else None
+        )
+        self.multiscale = multiscale
+        self.pyramid_scales = pyramid_scales
+        self.last_pyramid = []
+        self.grayscale = grayscale
+        self._raw_format = None
+        self.change_detector = ChangeDetector() if change_gating else None
+        self.pdf_dpi_ladder = tuple(pdf_dpi_ladder)
+        self.pdf_embedded_images = pdf_embedded_images
+        self.pdf_clip_render = pdf_clip_render
+        self.screen_zero_copy = screen_zero_copy
+        self.tile_threshold = tile_threshold
+        self.tile_code_size = tile_code_size
+        self.image_load_scales = tuple(image_load_scales)
+        self.result_cache = result_cache
+        self.last_tiles = None
+        self.camera_cache = camera_cache
+        # Backend, open time and time to first frame of the last camera start
+        self.camera_timing = {}
+        self._warm_up = None
+        self._warm_up_timer = None
+        self._warm_up_lock = threading.Lock()
+        self._start_requested = None
+        self.capture_mode = get_capture_mode(capture_mode)
+        # Stream format the camera actually applied (read back after opening)
+        self.capture_format = {}
+        self._mode_pending = False
+        self._frame_shape = None
+        self.resolution_switch = None
+        self.set_adaptive_resolution(adaptive_resolution)
+
+    def _open_camera(self, prime: bool = False):
+        """
+        Opens the device; returns (cap, timing). With prime, also waits for
+        the first frame, which is when most drivers actually start streaming.
+        """
+        cap, timing = open_camera(self.camera_id, self.camera_cache)
+        if cap is None:
+            raise RuntimeError(
+                "Could not open camera. Please check if the application has permission to access the camera (System Settings -> Privacy & Security -> Camera)."
+            )
+        # Before the first read, while the driver can still renegotiate freely
+        timing["format"] = self.capture_mode.apply(cap)
+        timing["mode"] = self.capture_mode
+        if prime:
+            start = time.perf_counter()
+            cap.read()
+            timing["prime_seconds"] = time.perf_counter() - start
+        return cap, timing
+
+    def warm_up(self, idle_timeout: Optional[float] = None):
+        """
+        Opens the camera on a background thread so that a later start_camera()
+        finds it ready instead of opening it then. Errors are left for
+        start_camera to report.
+
+        :param idle_timeout: Seconds after which the camera is released again
+            if start_camera() hasn't claimed it (None keeps it open), so an
+            app left idle doesn't hold the camera and its indicator light on
+        """
+        from concurrent.futures import Future
+
+        if self.cap is not None or self._warm_up is not None:
+            return
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(self._open_camera(prime=True))
+            except Exception as e:
+                future.set_exception(e)
+
+        def expire():
+            with self._warm_up_lock:
+                if self._warm_up is not future:
+                    return
+                self._warm_up = None
+            future.add_done_callback(_release_warm_camera)
+
+        self._warm_up = future
+        threading.Thread(target=run, name="qr-camera-warmup", daemon=True).start()
+        if idle_timeout is not None:
+            self._warm_up_timer = threading.Timer(idle_timeout, expire)
+            self._warm_up_timer.daemon = True
+            self._warm_up_timer.start()
+
+    def _claim_warm_up(self):
+        """Takes the pending warm-up future, if any, and stops its idle timer."""
+        with self._warm_up_lock:
+            future, self._warm_up = self._warm_up, None
+        if self._warm_up_timer is not None:
+            self._warm_up_timer.cancel()
+            self._warm_up_timer = None
+        return future
 
     def start_camera(self):
         """Initializes the camera capture."""
-        if sys.platform == "darwin":
-            self.cap = cv2.VideoCapture(self.camera_id, cv2.CAP_AVFOUNDATION)
+        self._start_requested = time.perf_counter()
+        if self.resolution_switch:
+            # Every session starts searching
+            self.resolution_switch.reset()
+            self.capture_mode = self.resolution_switch.mode
+        opened = None
+        future = self._claim_warm_up()
+        if future is not None:
+            try:
+                opened = future.result()
+            except Exception:
+                # Try again in the foreground so the error reaches the caller
+                opened = None
+        warm = opened is not None
+        self.cap, timing = opened or self._open_camera()
+        self.capture_format = timing.pop("format")
+        if timing.pop("mode") != self.capture_mode:
+            # The mode changed while the camera was warming up
+            self.capture_format = self.capture_mode.apply(self.cap)
+        self.camera_timing = {**timing, "warm": warm}
+        self._mode_pending = False
+        self._frame_shape = None
+
+        self._reset_tracking()
+
+        if self.grayscale:
+            self._configure_luma()
+
+        if self.threaded:
+            self._start_capture_thread()
+
+    def _start_capture_thread(self):
+        self.capture_thread = CaptureThread(
+            self.cap,
+            self.buffer_size,
+            transform=self._to_luma if self.grayscale else None,
+        )
+        self.capture_thread.start()
+
+    def _reset_tracking(self):
+        """Forgets state tied to frame coordinates and content."""
+        if self.roi_tracker:
+            self.roi_tracker.reset()
+        if self.change_detector:
+            self.change_detector.reset()
+
+    def set_capture_mode(self, mode):
+        """
+        Switches the camera stream format (CaptureMode or preset name). An
+        open camera is reconfigured before the next frame is read; with
+        threaded capture, by the reader thread.
+        """
+        mode = get_capture_mode(mode)
+        if mode == self.capture_mode:
+            return
+        self.capture_mode = mode
+        self._mode_pending = self.cap is not None
+
+    def _apply_pending_mode(self):
+        """
+        Renegotiates the stream format. With threaded capture the reader
+        thread does it between two reads, so the caller (e.g. the Tk loop)
+        never waits for the driver; it just gets no frame meanwhile.
+        """
+        self._mode_pending = False
+        if self.capture_thread:
+            self.capture_thread.reconfigure(self._apply_capture_mode)
         else:
-            self.cap = cv2.VideoCapture(self.camera_id)
+            self._apply_capture_mode()
 
-        if not self.cap.isOpened():
-            self.cap = cv2.VideoCapture(self.camera_id)
+    def _apply_capture_mode(self):
+        self.capture_format = self.capture_mode.apply(self.cap)
+        if self.grayscale:
+            self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            self._configure_luma()
 
-        if not self.cap.isOpened():
-            raise RuntimeError(
-                "Could not open camera. Please check if the application has permission to access the camera (System Settings -> Privacy & Security -> Camera)."
+    def set_adaptive_resolution(self, adaptive):
+        """
+        Turns adaptive capture resolution on (True or an AdaptiveResolution)
+        or off. Takes effect when the camera next starts.
+        """
+        if adaptive is True:
+            adaptive = AdaptiveResolution()
+        self.resolution_switch = adaptive or None
+        if self.resolution_switch:
+            self.resolution_switch.reset()
+            self.capture_mode = self.resolution_switch.mode
+
+    def _configure_luma(self):
+        """
+        Asks the backend for unconverted frames so the Y plane can be used
+        directly. Only packed YUV 4:2:2 streams are handled this way; anything
+        else keeps OpenCV's BGR conversion and is reduced with cvtColor.
+        """
+        self._raw_format = None
+        fourcc = fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC))
+        if not is_packed_yuv(fourcc):
+            return
+        if self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+            self._raw_format = (
+                int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                fourcc,
             )
 
+    def _to_luma(self, frame):
+        """Reduces a camera frame to its luminance plane."""
+        if self._raw_format:
+            width, height, fourcc = self._raw_format
+            luma = packed_yuv_luma(frame, width, height, fourcc)
+            if luma is not None:
+                return luma
+            # Backend ignored CONVERT_RGB after all; fall back to BGR frames
+            self._raw_format = None
+            self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+            if frame.ndim != 3:
+                return None
+        return to_gray(frame)
+
+    def set_profile(self, profile):
+        """Switches the decoder profile (instance or preset name)."""
+        self.profile = get_profile(profile)
+        if self.decode_pool:
+            self.decode_pool.decode_fn = self.profile.decode
+
     def stop_camera(self):
         """Releases the camera."""
+        future = self._claim_warm_up()
+        if future is not None:
+            # Don't wait for a warm-up still opening; release it when done
+            future.add_done_callback(_release_warm_camera)
+        # Stop the reader thread before releasing the device it reads from
+        if self.capture_thread:
+            self.capture_thread.stop()
+            self.capture_thread = None
         if self.cap:
             self.cap.release()
             self.cap = None
+        self._mode_pending = False
 
-    def get_frame(self):
+    def close(self):
+        """Releases the camera and shuts down the decode pool."""
+        self.stop_camera()
+        if self.decode_pool:
+            self.decode_pool.shutdown()
+
+    def get_frame(self, timeout: float = 0.5):
         """Reads a frame from the camera."""
+        ret, frame, _ = self._read_frame(timeout)
+        return ret, frame
+
+    def _read_frame(self, timeout: float = 0.5):
+        """Returns (ret, frame, capture_timestamp) from the camera or ring buffer."""
         if not self.cap:
             self.start_camera()
-        ret, frame = self.cap.read()
-        return ret, frame
+        if self._mode_pending:
+            self._apply_pending_mode()
+        if self.capture_thread:
+            ret, frame, captured_at = self.capture_thread.read(timeout=timeout)
+        else:
+            ret, frame = self.cap.read()
+            if ret and self.grayscale:
+                frame = self._to_luma(frame)
+                ret = frame is not None
+            captured_at = time.monotonic()
+        if ret and self._start_requested is not None:
+            self.camera_timing["first_frame_seconds"] = (
+                time.perf_counter() - self._start_requested
+            )
+            self._start_requested = None
+        if ret and frame.shape != self._frame_shape:
+            # Points and diffs from another resolution no longer line up
+            if self._frame_shape is not None:
+                self._reset_tracking()
+            self._frame_shape = frame.shape
+        return ret, frame, captured_at
 
-    def detect_qr(self, frame) -> Optional[str]:
-        """Detects QR code in a frame using zxing-cpp."""
-        try:
-            import zxingcpp
+    def capture_stats(self) -> dict:
+        """
+        Returns captured/dropped frame counters for the threaded capture mode
+        and the number of decodes skipped by the change gate.
+        """
+        if self.capture_thread:
+            stats = self.capture_thread.buffer.stats()
+        else:
+            stats = {"frames_captured": 0, "frames_dropped": 0}
+        if self.change_detector:
+            stats["frames_skipped"] = self.change_detector.frames_skipped
+        return stats
 
-            results = zxingcpp.read_barcodes(frame)
-            for result in results:
-                if result.text:
-                    return result.text, None
-            return None, None
+    def detect(self, frame, return_candidates: bool = False) -> DetectionResult:
+        """
+        Decodes every code in a frame in one zxing pass with the scanner's
+        decoder profile. With return_candidates, codes that were located but
+        could not be decoded are kept in `candidates`.
+        """
+        try:
+            results = self.profile.read_barcodes(frame, return_candidates)
+            return DetectionResult.from_zxing(results)
         except Exception as e:
             print(f"ZXing error: {e}")
+            return DetectionResult()
+
+    def detect_multiscale(
+        self, frame, return_candidates: bool = False
+    ) -> DetectionResult:
+        """
+        Coarse-to-fine detection: tries downscaled grayscale levels first and
+        only moves up to full resolution when the smaller pass fails. The scale
+        and time spent at each level are kept in `last_pyramid`.
+        """
+        self.last_pyramid = []
+        candidates = []
+        for scale, image in pyramid_levels(frame, self.pyramid_scales):
+            level_start = time.perf_counter()
+            result = self.detect(image, return_candidates).transformed(scale)
+            self.last_pyramid.append(
+                {
+                    "scale": scale,
+                    "seconds": time.perf_counter() - level_start,
+                    "found": bool(result),
+                }
+            )
+            if result:
+                return result
+            candidates = candidates or result.candidates
+        return DetectionResult(candidates=candidates)
+
+    def detect_qr(self, frame, return_candidates: bool = False):
+        """
+        Detects QR code in a frame using zxing-cpp with the scanner's
+        decoder profile. Returns (text, points) where points are the code corners.
+
+        With return_candidates, a code that was located but could not be
+        decoded is returned as (None, points).
+        """
+        return self.detect(frame, return_candidates).first()
+
+    def detect_qr_multiscale(self, frame, return_candidates: bool = False):
+        """(text, points) form of detect_multiscale."""
+        return self.detect_multiscale(frame, return_candidates).first()
+
+    def _wants_tiles(self, frame) -> bool:
+        h, w = frame.shape[:2]
+        return bool(self.tile_threshold) and h * w > self.tile_threshold
+
+    def _tile_jobs(self, frame) -> list:
+        """
+        (image, scale, offset) jobs for a tiled decode: a downscaled pass over
+        the whole frame for codes too big to fit a tile, then the tiles.
+        """
+        gray = to_gray(frame)
+        h, w = gray.shape[:2]
+        # Codes larger than the tile overlap still span >= 128 px here
+        scale = max(2, self.tile_code_size // 128)
+        coarse = cv2.resize(
+            gray, (w // scale, h // scale), interpolation=cv2.INTER_AREA
+        )
+        tiles = sliding_tiles(gray, self.tile_code_size)
+        return [(coarse, scale, (0, 0))] + [(tile, 1, xy) for tile, xy in tiles]
+
+    def detect_tiled(self, frame, return_candidates: bool = False) -> DetectionResult:
+        """
+        Sliding-window detection for very large frames. The tiles are decoded
+        concurrently (on the decode pool when there is one), codes cut by a
+        tile edge are dropped, and the rest are mapped to frame coordinates
+        and deduplicated across overlaps. Tile count and time are kept in
+        `last_tiles`.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        import os
+
+        start = time.perf_counter()
+        jobs = self._tile_jobs(frame)
+        images = [image for image, _, _ in jobs]
+        if self.decode_pool:
+            results = self.decode_pool.decode_all(images)
+        else:
+            workers = min(len(jobs), os.cpu_count() or 1)
+            with ThreadPoolExecutor(workers, thread_name_prefix="qr-tile") as pool:
+                results = list(
+                    pool.map(
+                        partial(self.detect, return_candidates=return_candidates),
+                        images,
+                    )
+                )
+
+        found = DetectionResult()
+        # Full-resolution tiles first: their corners are the most precise
+        for (image, scale, offset), result in sorted(
+            zip(jobs, results), key=lambda job: job[0][1]
+        ):
+            if not result:
+                if result is not None:
+                    found.candidates.extend(
+                        result.transformed(scale, offset).candidates
+                    )
+                continue
+            if scale == 1:
+                result = DetectionResult(
+                    [
+                        code
+                        for code in result.codes
+                        if clear_of_cuts(code.points, offset, image.shape, frame.shape)
+                    ],
+                    result.candidates,
+                )
+            found.extend(result.transformed(scale, offset))
+        self.last_tiles = {
+            "tiles": len(jobs) - 1,
+            "seconds": time.perf_counter() - start,
+        }
+        return found
+
+    def _detect(self, frame, return_candidates: bool = False) -> DetectionResult:
+        """
+        Runs tiled, single- or multi-scale detection depending on
+        configuration and frame size.
+        """
+        if self._wants_tiles(frame):
+            return self.detect_tiled(frame, return_candidates)
+        if self.multiscale:
+            return self.detect_multiscale(frame, return_candidates)
+        return self.detect(frame, return_candidates)
+
+    def detect_tracked(self, frame):
+        """
+        Camera-frame detection. Like detect_qr, but skips frames the change
+        gate rejects and decodes only the region around the last code or
+        candidate when ROI tracking is enabled. Points are in frame coordinates.
+        A frame with codes leaves all of them in `last_result`.
+        """
+        if self.change_detector and not self.change_detector.should_decode(frame):
             return None, None
 
+        if not self.roi_tracker:
+            # Candidates are only needed to decide on a resolution switch
+            result = self._detect(frame, return_candidates=bool(self.resolution_switch))
+            decoded_text, points = result.first()
+        else:
+            view, offset = self.roi_tracker.crop(frame)
+            result = self._detect(view, return_candidates=True).transformed(
+                offset=offset
+            )
+            decoded_text, points = result.first()
+            if points is not None:
+                self.roi_tracker.hit(points, frame.shape)
+            else:
+                self.roi_tracker.miss()
+
+        if decoded_text:
+            self.last_result = result
+        if self.change_detector and not decoded_text:
+            self.change_detector.record_miss()
+        if self.resolution_switch:
+            mode = self.resolution_switch.update(
+                found=bool(decoded_text), candidate=points is not None
+            )
+            if mode is not None:
+                self.set_capture_mode(mode)
+        return decoded_text, points
+
+    def _decode_first(self, jobs, tiles=()) -> DetectionResult:
+        """
+        Decodes (image, scale, offset, page) jobs in order and returns the
+        first DetectionResult with codes, mapped back to source coordinates.
+        With a decode pool the jobs are decoded concurrently and the first hit
+        wins. The result is also kept in `last_result`.
+
+        :param tiles: (tile, offset) crops of the last job's image, decoded
+            alongside the jobs on the decode pool (see _decode_pooled)
+        """
+        self.last_stats = {}
+        self.last_result = DetectionResult()
+        self.last_tiles = None
+        if self.decode_pool:
+            jobs = list(jobs)
+        # Large frames are tiled by _detect, which fans out to the pool itself
+        if self.decode_pool and not (len(jobs) == 1 and self._wants_tiles(jobs[0][0])):
+            self.last_result = self._decode_pooled(jobs, tiles)
+            return self.last_result
+
+        pyramid = []
+        try:
+            for image, scale, offset, page in jobs:
+                result = self._detect(image)
+                pyramid.extend(self.last_pyramid if self.multiscale else [])
+                if result:
+                    self.last_result = result.transformed(scale, offset, page)
+                    return self.last_result
+            return self.last_result
+        finally:
+            if self.multiscale:
+                self.last_stats["pyramid"] = pyramid
+            if self.last_tiles:
+                self.last_stats["tiles"] = self.last_tiles
+
+    def _decode_pooled(self, jobs, tiles) -> DetectionResult:
+        """
+        Decodes jobs and tiles concurrently on the decode pool. The first job
+        with codes wins. A tile only holds the codes inside it, so tile hits
+        are kept until every job has failed and then merged.
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        pending = {}
+        for image, scale, offset, page in jobs:
+            pending[self.decode_pool.submit(image)] = (
+                image,
+                scale,
+                offset,
+                page,
+                False,
+            )
+        for tile, offset in tiles:
+            pending[self.decode_pool.submit(tile)] = (tile, 1, offset, None, True)
+        merged = DetectionResult()
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    image, scale, offset, page, is_tile = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Decode worker error: {e}")
+                        continue
+                    if not result:
+                        continue
+                    if not is_tile:
+                        return result.transformed(scale, offset, page)
+                    # Tiles are cut from the last (full-resolution) job
+                    frame_shape = jobs[-1][0].shape
+                    codes = [
+                        code
+                        for code in result.codes
+                        if clear_of_cuts(code.points, offset, image.shape, frame_shape)
+                    ]
+                    merged.extend(DetectionResult(codes).transformed(scale, offset))
+            return merged
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _frame_jobs(self, frame) -> tuple:
+        """
+        Decode jobs for one frame, as _decode_first arguments: the full frame,
+        plus overlapping tiles when a decode pool can share the work. In
+        multiscale mode with a pool the coarse levels are queued first.
+        """
+        if not self.decode_pool or self._wants_tiles(frame):
+            return [(frame, 1, (0, 0), None)], ()
+        if self.multiscale:
+            levels = list(pyramid_levels(frame, self.pyramid_scales))
+            frame = levels[-1][1]
+            jobs = [(image, scale, (0, 0), None) for scale, image in levels]
+        else:
+            jobs = [(frame, 1, (0, 0), None)]
+        return jobs, split_tiles(frame)
+
+    def _poll_pool(self, frame, captured_at, in_flight: dict):
+        """
+        Hands a camera frame to the decode pool if a worker is free, then
+        collects finished decodes. Returns (text, points, capture_timestamp).
+        """
+        if len(in_flight) < self.decode_pool.workers:
+            in_flight[self.decode_pool.submit(frame)] = captured_at
+        for future in [f for f in in_flight if f.done()]:
+            frame_time = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Decode worker error: {e}")
+                continue
+            if result:
+                self.last_result = result
+                text, points = result.first()
+                return text, points, frame_time
+        return None, None, captured_at
+
+    def _camera_stats(self, frames_seen: int) -> dict:
+        stats = self.capture_stats()
+        stats["frames_decoded"] = frames_seen - stats.get("frames_skipped", 0)
+        if self.camera_timing:
+            stats["camera"] = dict(self.camera_timing)
+        if self.capture_format:
+            stats["capture"] = {"mode": self.capture_mode.name, **self.capture_format}
+        if self.resolution_switch:
+            stats["resolution_switches"] = self.resolution_switch.switches
+        return stats
+
     def scan_one(
         self, timeout: float = 30.0, show_window: bool = True
     ) -> Optional[str]:
@@ -61,17 +732,38 @@ class QRCodeScanner:
             self.start_camera()
 
         start_time = time.time()
+        frames_seen = 0
+        self.last_stats = {}
+        self.last_result = DetectionResult()
+        in_flight = {}
 
         try:
             while (time.time() - start_time) < timeout:
-                ret, frame = self.cap.read()
+                ret, frame, captured_at = self._read_frame()
                 if not ret:
                     continue
 
-                decoded_text, points = self.detect_qr(frame)
+                if self.decode_pool:
+                    decoded_text, points, captured_at = self._poll_pool(
+                        frame, captured_at, in_flight
+                    )
+                else:
+                    decoded_text, points = self.detect_tracked(frame)
+                frames_seen += 1
 
                 if decoded_text:
+                    self.last_stats = self._camera_stats(frames_seen)
+                    # Time from the frame leaving the camera to a decoded result
+                    self.last_stats["detection_latency"] = (
+                        time.monotonic() - captured_at
+                    )
+                    if self.multiscale:
+                        self.last_stats["pyramid"] = self.last_pyramid
                     if show_window:
+                        # Luma frames can be strided views of the raw buffer,
+                        # which cv2 can't draw on; draw on a BGR copy
+                        if frame.ndim == 2:
+                            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
                         if points is not None:
                             points = points.astype(int)
                             for i in range(len(points)):
@@ -88,6 +780,10 @@ class QRCodeScanner:
                     if cv2.waitKey(1) & 0xFF == ord("q"):
                         return None
         finally:
+            for future in in_flight:
+                future.cancel()
+            if not self.last_stats:
+                self.last_stats = self._camera_stats(frames_seen)
             if show_window:
                 cv2.destroyAllWindows()
             self.stop_camera()
@@ -97,82 +793,487 @@ class QRCodeScanner:
     def scan_screen(self, screen_index: Optional[int] = None) -> Optional[str]:
         """
         Captures screen content and detects QR code.
+
+        Each monitor is captured and decoded separately and concurrently; the
+        first hit wins. When monitors can't be enumerated (no `mss`) the whole
+        desktop is grabbed as one image.
+
+        :param screen_index: Only scan this monitor (0-based); None scans all
         """
         try:
-            from PIL import ImageGrab
-            import numpy as np
-
-            try:
-                screenshot = ImageGrab.grab(all_screens=True)
-            except Exception:
-                screenshot = ImageGrab.grab()
+            monitors = list_monitors()
+            if screen_index is not None and monitors:
+                if not 0 <= screen_index < len(monitors):
+                    print(
+                        f"Screen {screen_index} not found "
+                        f"({len(monitors)} monitor(s) available)"
+                    )
+                    return None
+                monitors = [monitors[screen_index]]
+            if monitors:
+                return self._scan_monitors(monitors, screen_index or 0).text
 
-            img_np = np.array(screenshot)
-            frame = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
+            if screen_index:
+                print(f"Screen {screen_index} needs the mss package to capture")
+                return None
+            frame = grab_desktop(primary_only=screen_index == 0)
 
-            decoded_text, _ = self.detect_qr(frame)
-            return decoded_text
+            return self._decode_first(*self._frame_jobs(frame)).text
 
         except Exception as e:
             print(f"Screen scan error: {e}")
             return None
 
+    def _grab_monitor(self, monitor: dict, pooled: bool = False):
+        """
+        Captures a monitor for decoding. With screen_zero_copy, a
+        full-resolution decode in the calling thread reads the BGRA capture
+        buffer in place; pyramids, tiles and pool workers always get a (4x
+        smaller) luminance frame.
+        """
+        direct = (
+            self.screen_zero_copy
+            and not self.multiscale
+            and not (pooled and self.decode_pool)
+        )
+        return grab_monitor(monitor, gray=not direct)
+
+    def _scan_monitor(self, monitor: dict) -> DetectionResult:
+        frame = self._grab_monitor(monitor)
+        offset = (monitor["left"], monitor["top"])
+        return self._detect(frame).transformed(offset=offset)
+
+    def _scan_monitors(self, monitors: list, first_index: int = 0):
+        """
+        Captures and decodes monitors on one thread each and returns the first
+        DetectionResult with codes, in virtual-desktop coordinates. A single
+        monitor goes through the decode pool when there is one. Per-monitor
+        timings are kept in `last_stats["monitors"]`.
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        start = time.perf_counter()
+        if len(monitors) == 1:
+            monitor = monitors[0]
+            result = self._decode_first(
+                *self._frame_jobs(self._grab_monitor(monitor, pooled=True))
+            )
+            self.last_result = result.transformed(
+                offset=(monitor["left"], monitor["top"])
+            )
+            self.last_stats["monitors"] = [
+                {
+                    "index": first_index,
+                    "seconds": time.perf_counter() - start,
+                    "found": bool(result),
+                }
+            ]
+            return self.last_result
+
+        self.last_stats = {"monitors": []}
+        self.last_result = DetectionResult()
+        executor = ThreadPoolExecutor(
+            max_workers=len(monitors), thread_name_prefix="qr-screen"
+        )
+        pending = {
+            executor.submit(self._scan_monitor, monitor): first_index + i
+            for i, monitor in enumerate(monitors)
+        }
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Screen {index} scan error: {e}")
+                        result = DetectionResult()
+                    self.last_stats["monitors"].append(
+                        {
+                            "index": index,
+                            "seconds": time.perf_counter() - start,
+                            "found": bool(result),
+                        }
+                    )
+                    if result:
+                        self.last_result = result
+                        return result
+            return self.last_result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def watch_screen(
+        self,
+        interval: float = 1.0,
+        timeout: Optional[float] = None,
+        screen_index: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Keeps polling the screen until a Wi-Fi QR code shows up. Only the
+        regions that changed since the previous capture are decoded.
+
+        :param interval: Seconds between captures
+        :param timeout: Give up after this many seconds (None waits forever)
+        :param screen_index: Only watch this monitor (0-based)
+        """
+        watcher = ScreenWatcher(self, screen_index)
+        start = time.monotonic()
+        self.last_result = DetectionResult()
+        try:
+            while timeout is None or time.monotonic() - start < timeout:
+                poll_start = time.monotonic()
+                try:
+                    result = watcher.poll()
+                except ValueError as e:
+                    print(e)
+                    return None
+                except Exception as e:
+                    print(f"Screen watch error: {e}")
+                    result = DetectionResult()
+                wifi_codes = result.wifi_codes()
+                if wifi_codes:
+                    self.last_result = result
+                    return wifi_codes[0].text
+                time.sleep(max(0.0, interval - (time.monotonic() - poll_start)))
+            return None
+        finally:
+            self.last_stats = watcher.stats()
+
+    def _decode_pdf_page(self, page):
+        """decode_page with this scanner's PDF settings: (result, dpi)."""
+        return decode_page(
+            page,
+            partial(self._detect, return_candidates=self.pdf_clip_render),
+            self.pdf_dpi_ladder,
+            embedded=self.pdf_embedded_images,
+            clip=self.pdf_clip_render,
+        )
+
+    def _scan_pdf(self, doc, max_pages: int) -> DetectionResult:
+        """
+        Decodes the first pages of a PDF. Embedded bitmaps are tried first at
+        their native resolution; then every page is rendered at the lowest DPI
+        of the ladder, and pages are only re-rendered at the next DPI when
+        nothing was found. Points are in PDF points. `last_stats["pdf_dpi"]`
+        holds the DPI that succeeded ("embedded" for an embedded image).
+        """
+        page_count = min(max_pages, doc.page_count)
+        if self.pdf_clip_render:
+            # Clip rendering escalates per page and never holds a full page
+            self.last_stats = {}
+            self.last_result = DetectionResult()
+            for i in range(page_count):
+                result, dpi = self._decode_pdf_page(doc.load_page(i))
+                if result:
+                    self.last_stats["pdf_dpi"] = dpi
+                    self.last_result = result.transformed(page=i + 1)
+                    break
+            return self.last_result
+
+        if self.pdf_embedded_images:
+            jobs = (
+                (image, scale, offset, i + 1)
+                for i in range(page_count)
+                for image, scale, offset in embedded_images(doc.load_page(i))
+            )
+            result = self._decode_first(jobs)
+            if result:
+                self.last_stats["pdf_dpi"] = "embedded"
+                return result
+        for dpi in self.pdf_dpi_ladder:
+            jobs = (
+                (render_page(doc.load_page(i), dpi), points_scale(dpi), (0, 0), i + 1)
+                for i in range(page_count)
+            )
+            result = self._decode_first(jobs)
+            if result:
+                self.last_stats["pdf_dpi"] = dpi
+                return result
+        return self.last_result
+
+    def scan_file_codes(self, file_path: str, max_pages: int = 3) -> list:
+        """
+        Returns every QRCode in a file, each tagged with its 1-based page
+        (images count as page 1). Unlike scan_file, errors are raised rather
+        than printed.
+        """
+        import os
+
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(file_path)
+
+        if os.path.splitext(file_path)[1].lower() == ".pdf":
+            import fitz  # PyMuPDF
+
+            found = DetectionResult()
+            doc = fitz.open(file_path)
+            try:
+                for i in range(min(max_pages, doc.page_count)):
+                    result, _ = self._decode_pdf_page(doc.load_page(i))
+                    found.extend(result.transformed(page=i + 1))
+            finally:
+                doc.close()
+            return found.codes
+
+        result = self._scan_image(file_path, exhaustive=True)
+        if result is None:
+            raise ValueError(f"Unsupported or unreadable image: {file_path}")
+        return result.transformed(page=1).codes
+
+    def _scan_image(self, source, exhaustive: bool = False):
+        """
+        Loads an image file path or in-memory uint8 buffer progressively,
+        JPEGs at reduced scale first, and decodes each level until one finds
+        a code. Per-level load and decode
+        timings are kept in `last_stats["image_levels"]`.
+
+        :param exhaustive: Return every code of the level instead of the
+            first decode pool hit
+        :return: DetectionResult in full-resolution pixels, or None if the
+            file couldn't be read
+        """
+        self.last_stats = {}
+        levels = []
+        result = None
+        for scale, frame, load_seconds in load_levels(source, self.image_load_scales):
+            start = time.perf_counter()
+            if exhaustive:
+                result = self._detect(frame)
+            else:
+                result = self._decode_first(*self._frame_jobs(frame))
+            result = result.transformed(scale)
+            levels.append(
+                {
+                    "scale": scale,
+                    "load_seconds": load_seconds,
+                    "decode_seconds": time.perf_counter() - start,
+                    "found": bool(result),
+                }
+            )
+            if result:
+                break
+        if result is not None:
+            self.last_result = result
+            self.last_stats["image_levels"] = levels
+        return result
+
+    def _worker_options(self) -> dict:
+        """Settings handed to the scanners built inside batch workers."""
+        return {
+            "profile": self.profile,
+            "multiscale": self.multiscale,
+            "pyramid_scales": self.pyramid_scales,
+            "pdf_dpi_ladder": self.pdf_dpi_ladder,
+            "pdf_embedded_images": self.pdf_embedded_images,
+            "pdf_clip_render": self.pdf_clip_render,
+            "tile_threshold": self.tile_threshold,
+            "tile_code_size": self.tile_code_size,
+            "image_load_scales": self.image_load_scales,
+        }
+
+    def scan_files(
+        self,
+        paths,
+        workers: Optional[int] = None,
+        ordered: bool = False,
+        max_in_flight: Optional[int] = None,
+        mode: str = "process",
+        max_pages: int = 3,
+    ):
+        """
+        Streams FileScanResult objects for many files, scanned on a worker
+        pool. See qr_network.capture.batch.scan_files.
+        """
+        from .batch import scan_files
+
+        return scan_files(
+            paths,
+            workers=workers,
+            ordered=ordered,
+            max_in_flight=max_in_flight,
+            mode=mode,
+            max_pages=max_pages,
+            **self._worker_options(),
+        )
+
+    def scan_pdf(
+        self,
+        file_path: str,
+        pages=None,
+        workers: Optional[int] = None,
+        mode: str = "process",
+        stop_after: Optional[int] = 1,
+    ) -> list:
+        """
+        Scans every page of a PDF, or a page range, on a worker pool and
+        returns the QRCodes found, each tagged with its page.
+
+        :param pages: None/"all", a spec such as "2-5,8", or page numbers
+        :param workers: Pool size (defaults to the CPU count)
+        :param mode: "process" or "thread" workers
+        :param stop_after: Cancel outstanding pages once this many Wi-Fi codes
+            were found; None scans every selected page
+        """
+        import os
+
+        import fitz  # PyMuPDF
+
+        from .batch import scan_pdf_pages
+        from .pdf import parse_pages
+
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(file_path)
+        doc = fitz.open(file_path)
+        try:
+            page_numbers = parse_pages(pages, doc.page_count)
+        finally:
+            doc.close()
+
+        found = DetectionResult()
+        scanned = 0
+        results = scan_pdf_pages(
+            file_path,
+            page_numbers,
+            workers=workers,
+            mode=mode,
+            **self._worker_options(),
+        )
+        try:
+            for _, result in results:
+                scanned += 1
+                found.extend(result)
+                if stop_after and len(found.wifi_codes()) >= stop_after:
+                    break
+        finally:
+            results.close()
+
+        found.codes.sort(key=lambda code: code.page)
+        self.last_result = found
+        self.last_stats = {
+            "pdf_pages_scanned": scanned,
+            "pdf_pages_selected": len(page_numbers),
+        }
+        return found.codes
+
     def scan_file(self, file_path: str) -> Optional[str]:
         """
-        Scans a file (Image or PDF) for a QR code.
+        Scans a file (Image or PDF) for a QR code. With a result cache, a
+        file already scanned with the same settings is answered from the
+        cache without decoding (`last_stats["cache"]` is "hit" or "miss").
         """
         import os
-        import numpy as np
 
         if not os.path.exists(file_path):
             return None
 
-        ext = os.path.splitext(file_path)[1].lower()
-
         try:
-            # Handle PDF
-            if ext == ".pdf":
-                import fitz  # PyMuPDF
+            if self.result_cache is None:
+                result = self._scan_file_result(file_path)
+                return result.text if result is not None else None
+
+            key, result = self.result_cache.lookup(file_path, self._cache_settings())
+            if result is not None:
+                self.last_result = result
+                self.last_stats = {"cache": "hit"}
+                return result.text
+
+            result = self._scan_file_result(file_path)
+            if result is not None:
+                self.result_cache.store(key, result)
+            self.last_stats["cache"] = "miss"
+            return result.text if result is not None else None
+
+        except Exception as e:
+            print(f"File scan error: {e}")
+            return None
 
-                doc = fitz.open(file_path)
+    def _scan_file_result(self, file_path: str):
+        """scan_file's decode: a DetectionResult, or None if unreadable."""
+        import os
+
+        # Handle PDF
+        if os.path.splitext(file_path)[1].lower() == ".pdf":
+            import fitz  # PyMuPDF
+
+            doc = fitz.open(file_path)
+            try:
                 if doc.page_count < 1:
-                    return None
+                    return DetectionResult()
 
                 # Scan first 3 pages max to find a QR
-                for i in range(min(3, doc.page_count)):
-                    page = doc.load_page(i)
-                    pix = page.get_pixmap(dpi=300)  # High DPI for better detection
+                return self._scan_pdf(doc, 3)
+            finally:
+                doc.close()
 
-                    # Convert to numpy array (RGB)
-                    img_np = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
-                        pix.h, pix.w, pix.n
-                    )
+        # Handle Images: cv2.imread handles the standard formats; JPEGs are
+        # decoded at reduced scale first
+        return self._scan_image(file_path)
 
-                    # Convert RGB/RGBA to BGR for OpenCV
-                    if pix.n == 4:  # RGBA
-                        frame = cv2.cvtColor(img_np, cv2.COLOR_RGBA2BGR)
-                    elif pix.n == 3:  # RGB
-                        frame = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-                    else:
-                        continue  # Gray etc, might need specific handling or skip
-
-                    decoded_text, _ = self.detect_qr(frame)
-                    if decoded_text:
-                        return decoded_text
-                return None
+    def _cache_settings(self) -> str:
+        """Everything besides file content that affects scan_file's result."""
+        import json
+
+        from .cache import CACHE_VERSION
+
+        profile = self.profile
+        return json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "profile": [
+                    profile.formats,
+                    profile.binarizer,
+                    profile.try_rotate,
+                    profile.try_downscale,
+                    profile.try_invert,
+                ],
+                **{k: v for k, v in self._worker_options().items() if k != "profile"},
+            },
+            sort_keys=True,
+        )
+
+    def scan_bytes(self, data, mime: Optional[str] = None) -> Optional[str]:
+        """
+        Scans an image or PDF held in memory, such as an upload or stdin, for
+        a QR code. Images are decoded with cv2.imdecode and PDFs opened from
+        the stream, both reading the buffer in place.
 
-            # Handle Images
+        :param data: bytes, bytearray, memoryview or any other buffer
+        :param mime: Content type ("application/pdf", "image/jpeg", ...);
+            sniffed from the data when omitted
+        """
+        try:
+            view = memoryview(data)
+            if mime:
+                is_pdf = mime == "application/pdf"
             else:
-                # Use cv2.imread handling mostly standard formats
-                # For more robust format support (like HEIC on mac if supported by cv2 build, or others),
-                # we might fallback to PIL, but cv2 is usually fine for png/jpg.
-                frame = cv2.imread(file_path)
-                if frame is None:
-                    return None
+                is_pdf = bytes(view[:5]) == b"%PDF-"
+
+            if is_pdf:
+                import fitz  # PyMuPDF
+
+                doc = fitz.open(stream=view, filetype="pdf")
+                try:
+                    if doc.page_count < 1:
+                        return None
+                    return self._scan_pdf(doc, 3).text
+                finally:
+                    doc.close()
 
-                decoded_text, _ = self.detect_qr(frame)
-                return decoded_text
+            result = self._scan_image(as_buffer(view))
+            return result.text if result is not None else None
 
         except Exception as e:
-            print(f"File scan error: {e}")
+            print(f"Buffer scan error: {e}")
+            return None
+
+    def scan_array(self, image) -> Optional[str]:
+        """
+        Scans an image that is already decoded (gray, BGR or BGRA ndarray)
+        for a QR code.
+        """
+        try:
+            return self._decode_first(*self._frame_jobs(image)).text
+        except Exception as e:
+            print(f"Image scan error: {e}")
             return None
@@ -0,0 +1,128 @@
+from typing import Optional
+
+import numpy as np
+
+from .luma import pil_to_gray, to_gray
+from .motion import DirtyRegionDetector
+from .results import DetectionResult
+
+
+def list_monitors() -> list:
+    """
+    Physical monitors as {"left", "top", "width", "height"} dicts in
+    virtual-desktop coordinates, enumerated with `mss`. Returns an empty list
+    when mss can't be imported or no display is available.
+    """
+    try:
+        import mss
+    except ImportError:
+        return []
+
+    try:
+        with mss.mss() as sct:
+            # monitors[0] is the union of all screens
+            return [
+                {key: m[key] for key in ("left", "top", "width", "height")}
+                for m in sct.monitors[1:]
+            ]
+    except Exception:
+        return []
+
+
+def grab_monitor(monitor: dict, gray: bool = True):
+    """
+    Captures one monitor (an entry of list_monitors) as a luminance array.
+    With gray=False the BGRA capture buffer itself is returned, wrapped
+    without a copy; the decoder reads it in place.
+    """
+    import mss
+
+    # mss handles are per thread, so each capture opens its own
+    with mss.mss() as sct:
+        # The array interface exposes the raw bytearray, no copy
+        frame = np.asarray(sct.grab(monitor))
+    return to_gray(frame) if gray else frame
+
+
+def grab_desktop(primary_only: bool = False):
+    """
+    Captures the whole desktop (or only the primary screen) with PIL as one
+    luminance array. Used when monitors can't be enumerated.
+    """
+    from PIL import ImageGrab
+
+    if primary_only:
+        screenshot = ImageGrab.grab()
+    else:
+        try:
+            screenshot = ImageGrab.grab(all_screens=True)
+        except Exception:
+            screenshot = ImageGrab.grab()
+    # Single luminance plane; zxing ignores colour anyway
+    return pil_to_gray(screenshot)
+
+
+class ScreenWatcher:
+    """
+    Polls the screen and decodes only the regions that changed since the
+    previous capture, so it can be left running at a low CPU cost.
+    """
+
+    def __init__(self, scanner, screen_index: Optional[int] = None):
+        """
+        :param scanner: QRCodeScanner used for decoding
+        :param screen_index: Only watch this monitor (0-based); None watches all
+        """
+        self.scanner = scanner
+        self.screen_index = screen_index
+        self.detectors = {}
+        self.polls = 0
+        self.regions_decoded = 0
+        self.pixels_captured = 0
+        self.pixels_decoded = 0
+
+    def _captures(self):
+        """Yields (key, frame, (left, top)) for each watched screen."""
+        monitors = list_monitors()
+        if not monitors:
+            if self.screen_index:
+                raise ValueError(
+                    f"Screen {self.screen_index} needs the mss package to capture"
+                )
+            yield "desktop", grab_desktop(self.screen_index == 0), (0, 0)
+            return
+
+        indices = range(len(monitors))
+        if self.screen_index is not None:
+            if not 0 <= self.screen_index < len(monitors):
+                raise ValueError(
+                    f"Screen {self.screen_index} not found "
+                    f"({len(monitors)} monitor(s) available)"
+                )
+            indices = [self.screen_index]
+        for i in indices:
+            monitor = monitors[i]
+            yield i, grab_monitor(monitor), (monitor["left"], monitor["top"])
+
+    def poll(self) -> DetectionResult:
+        """Captures once and returns the codes found in changed regions."""
+        found = DetectionResult()
+        self.polls += 1
+        for key, frame, (left, top) in self._captures():
+            detector = self.detectors.setdefault(key, DirtyRegionDetector())
+            self.pixels_captured += frame.shape[0] * frame.shape[1]
+            for x, y, w, h in detector.update(frame):
+                result = self.scanner._detect(frame[y : y + h, x : x + w])
+                found.extend(result.transformed(offset=(left + x, top + y)))
+                self.regions_decoded += 1
+                self.pixels_decoded += w * h
+        return found
+
+    def stats(self) -> dict:
+        return {
+            "watch_polls": self.polls,
+            "watch_regions": self.regions_decoded,
+            # Share of captured pixels that had to be decoded
+            "watch_decoded_fraction": self.pixels_decoded
+            / max(self.pixels_captured, 1),
+        }
@@ -39,6 +39,86 @@ def version_callback(value: bool):
         raise typer.Exit()
 
 
+def print_scan_stats(stats: dict):
+    """
+    Prints the timing/counter details recorded by the last scan.
+    """
+    if not stats:
+        return
+    for level in stats.get("pyramid", []):
+        status = "hit" if level["found"] else "miss"
+        console.print(
+            f"[dim]Scale 1/{level['scale']}: {level['seconds'] * 1000:.1f} ms ({status})[/dim]"
+        )
+    for level in stats.get("image_levels", []):
+        status = "hit" if level["found"] else "miss"
+        console.print(
+            f"[dim]Image 1/{level['scale']}: load {level['load_seconds'] * 1000:.1f} ms, "
+            f"decode {level['decode_seconds'] * 1000:.1f} ms ({status})[/dim]"
+        )
+    if "tiles" in stats:
+        console.print(
+            f"[dim]Tiled decode: {stats['tiles']['tiles']} tiles in "
+            f"{stats['tiles']['seconds'] * 1000:.1f} ms[/dim]"
+        )
+    if "pdf_pages_scanned" in stats:
+        console.print(
+            f"[dim]PDF pages scanned: {stats['pdf_pages_scanned']} of "
+            f"{stats['pdf_pages_selected']}[/dim]"
+        )
+    if "watch_polls" in stats:
+        console.print(
+            f"[dim]Screen watch: {stats['watch_polls']} captures, "
+            f"{stats['watch_regions']} changed regions decoded "
+            f"({stats['watch_decoded_fraction']:.1%} of pixels)[/dim]"
+        )
+    for screen in stats.get("monitors", []):
+        status = "hit" if screen["found"] else "miss"
+        console.print(
+            f"[dim]Monitor {screen['index']}: {screen['seconds'] * 1000:.1f} ms ({status})[/dim]"
+        )
+    if stats.get("pdf_dpi") == "embedded":
+        console.print("[dim]PDF code read from an embedded image[/dim]")
+    elif stats.get("pdf_dpi"):
+        console.print(f"[dim]PDF rendered at {stats['pdf_dpi']} DPI[/dim]")
+    if "frames_decoded" in stats:
+        console.print(
+            f"[dim]Frames: {stats['frames_decoded']} decoded, "
+            f"{stats.get('frames_skipped', 0)} skipped unchanged, "
+            f"{stats.get('frames_dropped', 0)} dropped[/dim]"
+        )
+    capture = stats.get("capture")
+    if capture:
+        size = f"{capture['width']}x{capture['height']}" if capture["width"] else "?"
+        fps = f" @ {capture['fps']:g} fps" if capture["fps"] else ""
+        buffer = (
+            f", {capture['buffer_size']}-frame buffer" if capture["buffer_size"] else ""
+        )
+        console.print(
+            f"[dim]Capture mode {capture['mode']}: {size}{fps} "
+            f"{capture['fourcc'] or ''}{buffer}[/dim]"
+        )
+    if "resolution_switches" in stats:
+        console.print(
+            f"[dim]Adaptive resolution: {stats['resolution_switches']} switches[/dim]"
+        )
+    camera = stats.get("camera")
+    if camera:
+        source = "warm start" if camera.get("warm") else "opened"
+        tries = "" if camera["attempts"] == 1 else f" after {camera['attempts']} tries"
+        line = (
+            f"Camera: {camera['backend']} backend {source}{tries} in "
+            f"{camera['open_seconds'] * 1000:.1f} ms"
+        )
+        if "first_frame_seconds" in camera:
+            line += f", first frame after {camera['first_frame_seconds'] * 1000:.1f} ms"
+        console.print(f"[dim]{line}[/dim]")
+    if "detection_latency" in stats:
+        console.print(
+            f"[dim]Detection latency: {stats['detection_latency'] * 1000:.1f} ms[/dim]"
+        )
+
+
 @app.callback()
 def main(
     version: bool = typer.Option(
@@ -102,13 +182,88 @@ def scan(
     ),
     camera_id: int = typer.Option(0, "--camera", "-c", help="Camera ID to use"),
     timeout: float = typer.Option(
-        60.0, "--timeout", "-t", help="Scan timeout in seconds"
+        None,
+        "--timeout",
+        "-t",
+        help="Scan timeout in seconds (default: 60; --watch runs until stopped)",
     ),
     screen: bool = typer.Option(
         False, "--screen", "-s", help="Scan from screen instead of camera"
     ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        help="With --screen, keep polling the screen until a WiFi QR code "
+        "appears (only changed regions are decoded)",
+    ),
+    interval: float = typer.Option(
+        1.0, "--interval", min=0.05, help="Seconds between captures in --watch mode"
+    ),
+    monitor: int = typer.Option(
+        None,
+        "--monitor",
+        min=0,
+        help="With --screen, only scan this monitor (0-based; default: all)",
+    ),
     file: str = typer.Option(
-        None, "--file", "-f", help="Scan from image/PDF file instead of camera"
+        None,
+        "--file",
+        "-f",
+        help="Scan from image/PDF file instead of camera ('-' reads stdin)",
+    ),
+    workers: int = typer.Option(
+        0,
+        "--workers",
+        "-w",
+        min=0,
+        help="Number of parallel decode workers (0 decodes in the scan thread)",
+    ),
+    worker_mode: str = typer.Option(
+        None,
+        "--worker-mode",
+        help="Worker type: thread or process (defaults to thread for decoding "
+        "and process for --pages)",
+    ),
+    multiscale: bool = typer.Option(
+        False,
+        "--multiscale",
+        help="Try downscaled images first and only decode full resolution if needed",
+    ),
+    pages: str = typer.Option(
+        None,
+        "--pages",
+        help="Scan PDF pages in parallel: 'all' or a range such as '2-5,8' "
+        "(default: first 3 pages, one at a time)",
+    ),
+    cache: bool = typer.Option(
+        False,
+        "--cache",
+        help="Reuse results of files already scanned (content-addressed on-disk cache)",
+    ),
+    cache_file: str = typer.Option(
+        None,
+        "--cache-file",
+        help="Result cache location (implies --cache; default: per-user "
+        "cache directory)",
+    ),
+    profile: str = typer.Option(
+        None,
+        "--profile",
+        "-p",
+        help="Decoder preset: default, fast-camera, thorough-file or low-contrast "
+        "(defaults to fast-camera for the camera, thorough-file otherwise)",
+    ),
+    capture_mode: str = typer.Option(
+        "qr",
+        "--capture-mode",
+        help="Camera stream format: qr (720p MJPG, 1-frame buffer), low-res, "
+        "high-res or native (driver default)",
+    ),
+    adaptive_resolution: bool = typer.Option(
+        False,
+        "--adaptive-resolution",
+        help="Search at low resolution and switch the camera to high resolution "
+        "while a possible QR code is in view (replaces --capture-mode)",
     ),
 ):
     """
@@ -116,8 +271,43 @@ def scan(
     """
 
     # 1. Initialize
+    scanner = None
+    result_cache = None
     try:
-        scanner = QRCodeScanner(camera_id=camera_id)
+        if watch and not screen:
+            console.print("[bold red]--watch needs --screen.[/bold red]")
+            raise typer.Exit(code=ExitCode.GENERAL_ERROR)
+        if timeout is None and not watch:
+            timeout = 60.0
+        if adaptive_resolution and workers and not (screen or file):
+            # Pooled camera decodes skip the resolution switch (and ROI/gating)
+            console.print(
+                "[bold red]--adaptive-resolution can't be combined with "
+                "--workers for camera scans.[/bold red]"
+            )
+            raise typer.Exit(code=ExitCode.GENERAL_ERROR)
+        if (cache or cache_file) and file and file != "-":
+            from .capture.cache import ResultCache
+
+            result_cache = ResultCache(cache_file)
+        camera_cache = None
+        if not (screen or file):
+            from .capture.camera import CameraProbeCache
+
+            camera_cache = CameraProbeCache()
+        scanner = QRCodeScanner(
+            camera_id=camera_id,
+            decode_workers=workers,
+            decode_mode=worker_mode or "thread",
+            multiscale=multiscale,
+            grayscale=True,
+            change_gating=True,
+            profile=profile or ("thorough-file" if screen or file else "fast-camera"),
+            result_cache=result_cache,
+            camera_cache=camera_cache,
+            capture_mode=capture_mode,
+            adaptive_resolution=adaptive_resolution,
+        )
         network_mgr = NetworkManager()
 
         console.print(Panel.fit("QR Network Scanner", style="bold blue"))
@@ -125,27 +315,62 @@ def scan(
         # 2. Scan QR
         qr_data = None
 
-        if screen:
+        if screen and watch:
+            with console.status(
+                "[bold green]Watching screen(s) for a WiFi QR Code... "
+                "(Ctrl+C to stop)[/bold green]",
+                spinner="dots",
+            ):
+                qr_data = scanner.watch_screen(
+                    interval=interval, timeout=timeout, screen_index=monitor
+                )
+        elif screen:
             with console.status(
                 "[bold green]Scanning screen(s) for WiFi QR Code...[/bold green]",
                 spinner="dots",
             ):
-                qr_data = scanner.scan_screen()
+                qr_data = scanner.scan_screen(screen_index=monitor)
                 if not qr_data:
                     console.print(
                         "[bold red]No QR code found on any screen.[/bold red]"
                     )
                     raise typer.Exit(code=ExitCode.CAMERA_ERROR)
         elif file:
+            source = "stdin" if file == "-" else f"file '{file}'"
+            if file == "-" and pages:
+                console.print(
+                    "[bold red]--pages needs a file path, not stdin.[/bold red]"
+                )
+                raise typer.Exit(code=ExitCode.GENERAL_ERROR)
             with console.status(
-                f"[bold green]Scanning file '{file}' for WiFi QR Code...[/bold green]",
+                f"[bold green]Scanning {source} for WiFi QR Code...[/bold green]",
                 spinner="dots",
             ):
-                qr_data = scanner.scan_file(file)
-                if not qr_data:
-                    console.print(
-                        f"[bold red]No QR code found in file '{file}'.[/bold red]"
+                if file == "-":
+                    # Piped input is scanned from memory, no temp file
+                    qr_data = scanner.scan_bytes(
+                        typer.get_binary_stream("stdin").read()
                     )
+                elif pages:
+                    try:
+                        codes = scanner.scan_pdf(
+                            file,
+                            pages=pages,
+                            workers=workers or None,
+                            mode=worker_mode or "process",
+                        )
+                    except FileNotFoundError:
+                        codes = []
+                    except ValueError as e:
+                        console.print(f"[bold red]{e}[/bold red]")
+                        raise typer.Exit(code=ExitCode.GENERAL_ERROR)
+                    qr_data = codes[0].text if codes else None
+                else:
+                    qr_data = scanner.scan_file(file)
+                    if scanner.last_stats.get("cache") == "hit":
+                        console.print("[dim]Result cache hit, decoding skipped.[/dim]")
+                if not qr_data:
+                    console.print(f"[bold red]No QR code found in {source}.[/bold red]")
                     raise typer.Exit(code=ExitCode.GENERAL_ERROR)
         else:
             with console.status(
@@ -158,7 +383,21 @@ def scan(
             console.print("[bold red]Scan timed out or cancelled. Exiting.[/bold red]")
             raise typer.Exit(code=ExitCode.SCAN_TIMEOUT)
 
+        # Posters and documents can carry several codes; the decode pass
+        # already returned all of them, so prefer the first WiFi payload
+        wifi_codes = scanner.last_result.wifi_codes()
+        if len(wifi_codes) > 1:
+            console.print(
+                f"[bold]Found {len(wifi_codes)} WiFi QR codes, using the first:[/bold]"
+            )
+            for index, code in enumerate(wifi_codes, start=1):
+                page = f" (page {code.page})" if code.page else ""
+                console.print(f"  {index}. {code.text}{page}")
+        if len(wifi_codes) > 0:
+            qr_data = wifi_codes[0].text
+
         if verbose:
+            print_scan_stats(scanner.last_stats)
             console.print(f"[dim]Raw QR Data: {qr_data}[/dim]")
 
         # 3. Parse QR
@@ -235,6 +474,87 @@ def scan(
 
             traceback.print_exc()
         raise typer.Exit(code=ExitCode.GENERAL_ERROR)
+    finally:
+        if scanner:
+            scanner.close()
+        if result_cache is not None:
+            result_cache.close()
+
+
+@app.command()
+def watch_dir(
+    path: str = typer.Argument(..., help="Folder to watch for images and PDFs"),
+    interval: float = typer.Option(
+        2.0, "--interval", min=0.1, help="Seconds between folder passes"
+    ),
+    recursive: bool = typer.Option(
+        False, "--recursive", "-r", help="Also watch subdirectories"
+    ),
+    index_file: str = typer.Option(
+        None,
+        "--index",
+        help="Processed-file index (default: per-user cache directory)",
+    ),
+    json_output: bool = typer.Option(
+        False, "--json", help="Print one JSON object per scanned file"
+    ),
+    profile: str = typer.Option(
+        "thorough-file", "--profile", "-p", help="Decoder preset"
+    ),
+):
+    """
+    Watches a folder and scans images and PDFs as they are added or changed.
+    """
+    import json
+
+    from .capture.hotfolder import FolderIndex, FolderWatcher
+
+    scanner = None
+    index = None
+    try:
+        scanner = QRCodeScanner(profile=profile)
+        index = FolderIndex(index_file)
+        watcher = FolderWatcher(
+            path, scanner, index=index, interval=interval, recursive=recursive
+        )
+        if not json_output:
+            console.print(
+                f"[bold green]Watching '{path}' "
+                f"({len(watcher.known)} files already indexed). "
+                "Ctrl+C to stop.[/bold green]"
+            )
+        for result in watcher.watch():
+            if json_output:
+                print(
+                    json.dumps(
+                        {
+                            "path": result.path,
+                            "status": result.status,
+                            "texts": result.texts,
+                            "seconds": round(result.seconds, 4),
+                            "error": result.error,
+                        }
+                    ),
+                    flush=True,
+                )
+            elif result.codes:
+                console.print(f"[green]✓[/green] {result.path}")
+                for code in result.codes:
+                    page = f" (page {code.page})" if code.page else ""
+                    console.print(f"    {code.text}{page}")
+            else:
+                reason = result.error or "no QR code"
+                console.print(f"[yellow]-[/yellow] {result.path}: {reason}")
+    except ValueError as e:
+        console.print(f"[bold red]{e}[/bold red]")
+        raise typer.Exit(code=ExitCode.GENERAL_ERROR)
+    except KeyboardInterrupt:
+        console.print("\n[bold yellow]Stopped watching.[/bold yellow]")
+    finally:
+        if index:
+            index.close()
+        if scanner:
+            scanner.close()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,11 @@
 def entry_point():
+    import multiprocessing
     import sys
 
+    # Batch scans use process workers; in the PyInstaller bundle each worker
+    # re-runs this executable and must be handed over to multiprocessing here
+    multiprocessing.freeze_support()
+
     # If arguments are provided, use CLI. Otherwise launch GUI.
     if len(sys.argv) > 1:
         from qr_network.cli import app
@@ -9,7 +9,9 @@ import cv2
 from PIL import Image, ImageTk
 
 # Updated imports for refactor
+from ..capture.camera import CameraProbeCache
 from ..capture.scanner import QRCodeScanner
+from ..capture.screen import ScreenWatcher
 from ..net.manager import NetworkManager
 from ..qr.parser import WiFiQRParser
 from ..utils import RedactedLogger
@@ -20,6 +22,9 @@ from .components.status_panel import StatusPanel
 from .components.control_panel import ScannerInterface
 from .components.security_sheet import SecurityConfirmationSheet
 
+# A camera opened at startup is released if no scan claims it by then
+WARM_CAMERA_IDLE_SECONDS = 45
+
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -77,10 +82,18 @@ class QRNetworkApp(ctk.CTk):
         self.network_mgr = NetworkManager()  # Initialize early
 
         # State
-        self.scanner = QRCodeScanner()
+        self.camera_cache = CameraProbeCache()
+        self.scanner = self.create_scanner()
+        # Open the camera while the window is still being built so it is
+        # ready by the time "Scan Camera" is clicked; give it back if nobody
+        # does (e.g. a kiosk left on the Camera tab)
+        self.scanner.warm_up(idle_timeout=WARM_CAMERA_IDLE_SECONDS)
+        self._first_frame_logged = False
         self.is_scanning = False
         self.camera_active = False
         self.is_paused = False
+        self.screen_watcher = None
+        self._watch_job = None
 
         self.setup_layout()
         self.create_native_menu()
@@ -89,6 +102,18 @@ class QRNetworkApp(ctk.CTk):
         self.bind("<FocusIn>", self.on_focus_in)
         self.bind("<FocusOut>", self.on_focus_out)
 
+    def create_scanner(self, camera_id=0):
+        """Builds the scanner with the capture/decode options used by the GUI."""
+        return QRCodeScanner(
+            camera_id=camera_id,
+            threaded=True,
+            roi_tracking=True,
+            multiscale=True,
+            change_gating=True,
+            camera_cache=self.camera_cache,
+            capture_mode="qr",
+        )
+
     def setup_layout(self):
         # Using CTkTabview instead of Notebook
         self.tabview = ctk.CTkTabview(self)
@@ -314,9 +339,19 @@ A: The app adds the network to macOS Settings. Click the WiFi icon in your menu
             # If changed/first time
             if self.scanner.camera_id != idx:
                 self.scanner.stop_camera()
-                self.scanner = QRCodeScanner(camera_id=idx)
-
+                self.scanner = self.create_scanner(camera_id=idx)
+
+            if self.screen_watcher is not None:
+                self.stop_screen_watch()
+            self.scanner.set_profile(self.control_panel.profile_var.get())
+            if self.control_panel.adaptive_var.get():
+                if not self.scanner.resolution_switch:
+                    self.scanner.set_adaptive_resolution(True)
+            else:
+                self.scanner.set_adaptive_resolution(False)
+                self.scanner.set_capture_mode("qr")
             self.scanner.start_camera()
+            self._first_frame_logged = False
             self.camera_active = True
             self.is_scanning = True  # Enable QR detection when camera starts
             self.scan_start_time = time.time()  # Start timeout counter
@@ -340,6 +375,27 @@ A: The app adds the network to macOS Settings. Click the WiFi icon in your menu
                     "Camera Error", f"Could not start camera:\n{e}"
                 )
 
+    def log_camera_timing(self):
+        """Logs which backend opened the camera and its time to first frame."""
+        timing = self.scanner.camera_timing
+        if not timing.get("backend"):
+            return
+        warm = " (opened in background)" if timing.get("warm") else ""
+        first = timing.get("first_frame_seconds", 0) * 1000
+        self.log(
+            f"Camera ready via {timing['backend']}{warm}: "
+            f"open {timing['open_seconds'] * 1000:.0f} ms, first frame {first:.0f} ms"
+        )
+
+    def _resolution_locked(self):
+        switch = self.scanner.resolution_switch
+        return bool(switch and switch.locked)
+
+    def release_idle_camera(self):
+        """Closes a camera opened in the background but not being used."""
+        if not self.camera_active and self.scanner:
+            self.scanner.stop_camera()
+
     def stop_camera(self):
         self.camera_active = False
         self.is_scanning = False  # Disable QR detection
@@ -372,10 +428,34 @@ A: The app adds the network to macOS Settings. Click the WiFi icon in your menu
             self.after(500, self.update_camera_feed)
             return
 
-        ret, frame = self.scanner.get_frame()
+        # Short wait so a stalled camera never blocks the Tk event loop
+        ret, frame = self.scanner.get_frame(timeout=0.05)
         if not ret or frame is None:
             self.after(10, self.update_camera_feed)
             return
+        if not self._first_frame_logged:
+            self._first_frame_logged = True
+            self.log_camera_timing()
+
+        # Scan timeout check
+        remaining = None
+        if self.is_scanning:
+            try:
+                elapsed = time.time() - self.scan_start_time
+                current_timeout = self.control_panel.timeout_var.get()
+                if elapsed > current_timeout:
+                    self.stop_camera()
+                    self.log(f"Scan timed out after {current_timeout}s.")
+                    # Use standard messagebox or CTk one? Standard is fine for alerts.
+                    if messagebox.askretrycancel(
+                        "Scan Timed Out",
+                        f"No QR code detected within {current_timeout} seconds.\n\nRetry?",
+                    ):
+                        self.toggle_scan()  # Restart scan
+                    return
+                remaining = int(current_timeout - elapsed)
+            except Exception:
+                pass
 
         # Display Frame on Label
         try:
@@ -385,8 +465,21 @@ A: The app adds the network to macOS Settings. Click the WiFi icon in your menu
             if w < 10 or h < 10:
                 w, h = 640, 480  # Default if not yet rendered
 
-            # Convert CV2 to PIL
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Convert CV2 to PIL once; the overlay is drawn on the same buffer
+            if frame.ndim == 2:
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+            else:
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if remaining is not None:
+                cv2.putText(
+                    rgb_frame,
+                    f"Scanning: {remaining}s",
+                    (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.7,
+                    (0, 0, 255),
+                    2,
+                )
             img = Image.fromarray(rgb_frame)
 
             # Aspect Ratio Resize
@@ -406,51 +499,20 @@ A: The app adds the network to macOS Settings. Click the WiFi icon in your menu
 
         # Scan for QR if detection is enabled
         if self.is_scanning:
-            # Timeout Check
-            try:
-                elapsed = time.time() - self.scan_start_time
-                current_timeout = self.control_panel.timeout_var.get()
-                if elapsed > current_timeout:
-                    self.stop_camera()
-                    self.log(f"Scan timed out after {current_timeout}s.")
-                    # Use standard messagebox or CTk one? Standard is fine for alerts.
-                    if messagebox.askretrycancel(
-                        "Scan Timed Out",
-                        f"No QR code detected within {current_timeout} seconds.\n\nRetry?",
-                    ):
-                        self.toggle_scan()  # Restart scan
-                    return
-                remaining = int(current_timeout - elapsed)
-
-                # Overlay - we can't easily draw on CTkImage, assume CV2 drawing is sufficient on the frame source
-                # Re-do drawing on frame for overlay
-                display_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                cv2.putText(
-                    display_frame,
-                    f"Scanning: {remaining}s",
-                    (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    (0, 0, 255),
-                    2,
-                )
-                img_ov = Image.fromarray(display_frame)
-                ctk_img_ov = ctk.CTkImage(
-                    light_image=img_ov, dark_image=img_ov, size=(new_w, new_h)
+            locked = self._resolution_locked()
+            decoded_text, _ = self.scanner.detect_tracked(frame)
+            if self._resolution_locked() != locked and not decoded_text:
+                self.log(
+                    "Possible QR code, switching to high resolution"
+                    if not locked
+                    else "Back to low-resolution search"
                 )
-                # Update status label (which is camera_label) with overlay
-                self.status_label.configure(image=ctk_img_ov)
-                self.status_label._image = ctk_img_ov
-
-            except Exception:
-                pass
-
-            except Exception:
-                pass
-
-            decoded_text, _ = self.scanner.detect_qr(frame)
             if decoded_text:
-                self.log("QR Detected!")
+                stats = self.scanner.capture_stats()
+                self.log(
+                    f"QR Detected! ({stats['frames_dropped']} of "
+                    f"{stats['frames_captured']} frames dropped)"
+                )
                 self.is_scanning = False
                 self.stop_camera()
                 self.process_qr_data(decoded_text)
@@ -465,6 +527,7 @@ A: The app adds the network to macOS Settings. Click the WiFi icon in your menu
             # self.iconify() # Optional, might be annoying if it flickers
             # time.sleep(0.5)
 
+            self.scanner.set_profile("thorough-file")
             decoded_text = self.scanner.scan_screen()
             # self.deiconify()
 
@@ -485,6 +548,55 @@ A: The app adds the network to macOS Settings. Click the WiFi icon in your menu
             self.log(f"Screen scan error: {e}")
             messagebox.showerror("Error", f"Failed to scan screen:\n{e}", parent=self)
 
+    def toggle_screen_watch(self):
+        if self.control_panel.watch_var.get():
+            self.start_screen_watch()
+        else:
+            self.stop_screen_watch()
+            self.log("Screen watch stopped.")
+
+    def start_screen_watch(self):
+        self.stop_camera()
+        self.scanner.set_profile("thorough-file")
+        self.screen_watcher = ScreenWatcher(self.scanner)
+        self.control_panel.screen_scan_btn.configure(state="disabled")
+        self.log("Watching screen for WiFi QR codes...")
+        self.poll_screen_watch()
+
+    def stop_screen_watch(self):
+        if self._watch_job is not None:
+            self.after_cancel(self._watch_job)
+            self._watch_job = None
+        self.screen_watcher = None
+        self.control_panel.watch_var.set(False)
+        self.control_panel.screen_scan_btn.configure(state="normal")
+
+    def poll_screen_watch(self):
+        """One watch tick: capture, decode changed regions, reschedule."""
+        self._watch_job = None
+        if self.screen_watcher is None:
+            return
+        try:
+            result = self.screen_watcher.poll()
+        except Exception as e:
+            self.log(f"Screen watch error: {e}")
+            self.stop_screen_watch()
+            return
+
+        wifi_codes = result.wifi_codes()
+        if wifi_codes:
+            stats = self.screen_watcher.stats()
+            self.log(f"QR Code found on screen after {stats['watch_polls']} captures!")
+            self.stop_screen_watch()
+            self.process_qr_data(wifi_codes[0].text)
+            return
+
+        try:
+            interval = float(self.control_panel.watch_interval_var.get())
+        except ValueError:
+            interval = 1.0
+        self._watch_job = self.after(int(interval * 1000), self.poll_screen_watch)
+
     def scan_from_file_action(self):
         self.stop_camera()
         file_path = ctk.filedialog.askopenfilename(
@@ -505,6 +617,7 @@ A: The app adds the network to macOS Settings. Click the WiFi icon in your menu
             self.status_label.configure(text="Processing file...", text_color="orange")
             self.update()  # Force UI update
 
+            self.scanner.set_profile("thorough-file")
             decoded_text = self.scanner.scan_file(file_path)
 
             if decoded_text:
@@ -665,6 +778,7 @@ A: The app adds the network to macOS Settings. Click the WiFi icon in your menu
 
     def on_closing(self):
         self.camera_active = False
+        self.stop_screen_watch()
         if self.scanner:
             self.scanner.stop_camera()
         self.destroy()
@@ -1,5 +1,6 @@
 import tkinter as tk
 import customtkinter as ctk
+from ...capture.profiles import PRESETS
 from ...utils import get_camera_names
 
 
@@ -16,6 +17,10 @@ class ScannerInterface(ctk.CTkTabview):
         self.camera_idx_var = tk.StringVar()
         self.timeout_str_var = tk.StringVar(value="60")
         self.timeout_var = self.timeout_str_var  # For app compatibility
+        self.profile_var = tk.StringVar(value="fast-camera")
+        self.watch_var = tk.BooleanVar(value=False)
+        self.adaptive_var = tk.BooleanVar(value=False)
+        self.watch_interval_var = tk.StringVar(value="1")
         self.camera_map = {}
 
         # Create Tabs
@@ -37,6 +42,10 @@ class ScannerInterface(ctk.CTkTabview):
         if selected_tab != "Camera":
             if self.app.is_scanning:
                 self.app.stop_camera()
+            else:
+                self.app.release_idle_camera()
+        if selected_tab != "Screen" and self.watch_var.get():
+            self.app.stop_screen_watch()
 
     def setup_camera_tab(self):
         tab = self.tab("Camera")
@@ -80,7 +89,29 @@ class ScannerInterface(ctk.CTkTabview):
             width=70,
         )
         self.timeout_menu.pack(side="left")
-        ctk.CTkLabel(controls_frame, text="s").pack(side="left", padx=2)
+        ctk.CTkLabel(controls_frame, text="s").pack(side="left", padx=(2, 20))
+
+        # Decoder preset
+        ctk.CTkLabel(controls_frame, text="Decoder:", font=("Arial", 12, "bold")).pack(
+            side="left", padx=(0, 5)
+        )
+        self.profile_menu = ctk.CTkOptionMenu(
+            controls_frame,
+            variable=self.profile_var,
+            values=list(PRESETS),
+            width=120,
+        )
+        self.profile_menu.pack(side="left")
+
+        # Low-res search, high-res once a code is spotted. Off by default:
+        # small codes may never be located at the search resolution
+        self.adaptive_switch = ctk.CTkSwitch(
+            controls_frame,
+            text="Adaptive res",
+            variable=self.adaptive_var,
+            font=("Arial", 12, "bold"),
+        )
+        self.adaptive_switch.pack(side="left", padx=(20, 0))
 
         # Start/Stop Button (Right aligned)
         self.scan_btn = ctk.CTkButton(
@@ -130,6 +161,29 @@ class ScannerInterface(ctk.CTkTabview):
             text_color="gray",
         ).pack(pady=5)
 
+        # Continuous mode: poll the screen and decode only what changed
+        watch_frame = ctk.CTkFrame(center_frame, fg_color="transparent")
+        watch_frame.pack(pady=(15, 0))
+
+        self.watch_switch = ctk.CTkSwitch(
+            watch_frame,
+            text="Watch screen",
+            variable=self.watch_var,
+            command=self.app.toggle_screen_watch,
+            font=("Arial", 12, "bold"),
+        )
+        self.watch_switch.pack(side="left", padx=(0, 15))
+
+        ctk.CTkLabel(watch_frame, text="Every:").pack(side="left", padx=(0, 5))
+        self.watch_interval_menu = ctk.CTkOptionMenu(
+            watch_frame,
+            variable=self.watch_interval_var,
+            values=["0.5", "1", "2", "5"],
+            width=70,
+        )
+        self.watch_interval_menu.pack(side="left")
+        ctk.CTkLabel(watch_frame, text="s").pack(side="left", padx=(2, 0))
+
     def setup_file_tab(self):
         tab = self.tab("File")
 
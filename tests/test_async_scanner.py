@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from qr_network.capture.async_scanner import AsyncQRCodeScanner
+from qr_network.capture.results import DetectionResult, QRCode
+
+
+def make_camera_scanner(read_delay=0.0, hit_after=None):
+    """A scanner mock whose camera returns blank frames."""
+    scanner = MagicMock()
+    scanner.cap = None
+    scanner.capture_thread = None
+    frames = []
+
+    def start_camera():
+        scanner.cap = MagicMock()
+
+    def read_frame(timeout=0.5):
+        time.sleep(read_delay)
+        frames.append(threading.current_thread().name)
+        return True, np.zeros((4, 4), np.uint8), time.monotonic()
+
+    def stop_camera():
+        scanner.cap = None
+
+    def detect_tracked(frame):
+        if hit_after is not None and len(frames) > hit_after:
+            scanner.last_result = DetectionResult([QRCode("WIFI:S:Net;;")])
+            return "WIFI:S:Net;;", None
+        return None, None
+
+    scanner.start_camera.side_effect = start_camera
+    scanner._read_frame.side_effect = read_frame
+    scanner.stop_camera.side_effect = stop_camera
+    scanner.detect_tracked.side_effect = detect_tracked
+    scanner._camera_stats.side_effect = lambda seen: {"frames_decoded": seen}
+    return scanner, frames
+
+
+class TestAsyncCamera(unittest.IsolatedAsyncioTestCase):
+    async def test_scan_one_returns_text_and_releases_camera(self):
+        scanner, frames = make_camera_scanner(hit_after=2)
+        async_scanner = AsyncQRCodeScanner(scanner)
+        self.addAsyncCleanup(async_scanner.aclose)
+
+        text = await async_scanner.scan_one(timeout=5)
+
+        self.assertEqual(text, "WIFI:S:Net;;")
+        self.assertEqual(async_scanner.last_result.texts, ["WIFI:S:Net;;"])
+        self.assertIsNone(scanner.cap)
+        self.assertIn("detection_latency", async_scanner.last_stats)
+        # Every camera call stays on the one camera thread
+        self.assertEqual(len(set(frames)), 1)
+        self.assertTrue(frames[0].startswith("qr-async-camera"))
+
+    async def test_scan_one_times_out(self):
+        scanner, _ = make_camera_scanner(read_delay=0.01)
+        async_scanner = AsyncQRCodeScanner(scanner)
+        self.addAsyncCleanup(async_scanner.aclose)
+
+        self.assertIsNone(await async_scanner.scan_one(timeout=0.05))
+        scanner.stop_camera.assert_called_once()
+
+    async def test_cancel_releases_camera(self):
+        scanner, _ = make_camera_scanner(read_delay=0.01)
+        async_scanner = AsyncQRCodeScanner(scanner)
+        self.addAsyncCleanup(async_scanner.aclose)
+
+        task = asyncio.create_task(async_scanner.scan_one(timeout=30))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertIsNone(scanner.cap)
+        scanner.stop_camera.assert_called_once()
+
+    async def test_event_loop_stays_responsive(self):
+        scanner, _ = make_camera_scanner(read_delay=0.02)
+        async_scanner = AsyncQRCodeScanner(scanner)
+        self.addAsyncCleanup(async_scanner.aclose)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await async_scanner.scan_one(timeout=0.1)
+        task.cancel()
+
+        self.assertGreater(ticks, 5)
+
+    async def test_detections_iterator(self):
+        scanner, _ = make_camera_scanner()
+        scanner._detect.side_effect = [
+            DetectionResult(),
+            DetectionResult([QRCode("A")]),
+            DetectionResult([QRCode("B")]),
+        ]
+        async_scanner = AsyncQRCodeScanner(scanner)
+        self.addAsyncCleanup(async_scanner.aclose)
+
+        texts = []
+        detections = async_scanner.detections()
+        async for result in detections:
+            texts.append(result.text)
+            if len(texts) == 2:
+                break
+        await detections.aclose()
+
+        self.assertEqual(texts, ["A", "B"])
+        self.assertIsNone(scanner.cap)
+
+
+class TestAsyncFiles(unittest.IsolatedAsyncioTestCase):
+    @patch("qr_network.capture.async_scanner.QRCodeScanner")
+    async def test_concurrent_file_scans_use_pool_scanners(self, MockScanner):
+        main = MagicMock()
+        main._worker_options.return_value = {"multiscale": True}
+        threads = set()
+
+        def scan_file(path):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.02)
+            return f"text:{path}"
+
+        MockScanner.return_value.scan_file.side_effect = scan_file
+        async_scanner = AsyncQRCodeScanner(main, workers=3)
+        self.addAsyncCleanup(async_scanner.aclose)
+
+        texts = await asyncio.gather(
+            *(async_scanner.scan_file(f"{i}.png") for i in range(6))
+        )
+
+        self.assertEqual(texts, [f"text:{i}.png" for i in range(6)])
+        self.assertTrue(all(name.startswith("qr-async") for name in threads))
+        main.scan_file.assert_not_called()
+        self.assertTrue(MockScanner.call_args.kwargs["multiscale"])
+
+    @patch("qr_network.capture.async_scanner.QRCodeScanner")
+    async def test_scan_screen_keeps_result(self, MockScanner):
+        pool_scanner = MockScanner.return_value
+        result = DetectionResult([QRCode("WIFI:S:Net;;")])
+
+        def scan_screen(index):
+            pool_scanner.last_result = result
+            return "WIFI:S:Net;;"
+
+        pool_scanner.scan_screen.side_effect = scan_screen
+        async_scanner = AsyncQRCodeScanner(MagicMock())
+        self.addAsyncCleanup(async_scanner.aclose)
+
+        self.assertEqual(await async_scanner.scan_screen(1), "WIFI:S:Net;;")
+        pool_scanner.scan_screen.assert_called_once_with(1)
+        self.assertIs(async_scanner.last_result, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
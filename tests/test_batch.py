@@ -0,0 +1,152 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import fitz
+import numpy as np
+
+from qr_network.capture.batch import (
+    STATUS_MISSING,
+    STATUS_NO_QR,
+    STATUS_OK,
+    _make_executor,
+    _worker_scanner,
+    scan_files,
+    scan_pdf_pages,
+)
+from qr_network.capture.scanner import QRCodeScanner
+
+
+def fake_read_barcodes(image, **kwargs):
+    """Pretends bright images contain a QR code whose text is the brightness."""
+    value = int(image.mean())
+    if value < 128:
+        return []
+    result = MagicMock()
+    result.text = f"WIFI:S:Net{value};;"
+    return [result]
+
+
+class TestScanFiles(unittest.TestCase):
+    def setUp(self):
+        self.zxing = MagicMock()
+        self.zxing.read_barcodes.side_effect = fake_read_barcodes
+        patcher = patch.dict(sys.modules, {"zxingcpp": self.zxing})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_image(self, name, value):
+        path = os.path.join(self.tmp.name, name)
+        cv2.imwrite(path, np.full((32, 32), value, dtype=np.uint8))
+        return path
+
+    def test_results_carry_status_codes_and_timing(self):
+        paths = [
+            self.make_image("a.png", 200),
+            self.make_image("b.png", 10),
+            os.path.join(self.tmp.name, "missing.png"),
+        ]
+
+        results = {r.path: r for r in scan_files(paths, workers=2, mode="thread")}
+
+        ok = results[paths[0]]
+        self.assertEqual(ok.status, STATUS_OK)
+        self.assertEqual(ok.texts, ["WIFI:S:Net200;;"])
+        self.assertEqual(ok.codes[0].page, 1)
+        self.assertGreaterEqual(ok.seconds, 0)
+        self.assertGreater(ok.load_seconds, 0)
+        self.assertGreaterEqual(ok.seconds, ok.load_seconds + ok.decode_seconds)
+        self.assertEqual(results[paths[1]].status, STATUS_NO_QR)
+        self.assertEqual(results[paths[2]].status, STATUS_MISSING)
+
+    def test_ordered_mode_preserves_input_order(self):
+        paths = [self.make_image(f"{i}.png", 130 + i) for i in range(6)]
+
+        results = list(
+            scan_files(paths, workers=3, ordered=True, max_in_flight=2, mode="thread")
+        )
+
+        self.assertEqual([r.path for r in results], paths)
+        self.assertEqual([r.index for r in results], list(range(6)))
+
+    def test_input_consumed_lazily(self):
+        """No more than max_in_flight paths are pulled ahead of the consumer."""
+        pulled = []
+
+        def paths():
+            for i in range(100):
+                pulled.append(i)
+                yield os.path.join(self.tmp.name, f"none{i}.png")
+
+        stream = scan_files(paths(), workers=1, max_in_flight=3, mode="thread")
+        next(stream)
+        stream.close()
+
+        self.assertLessEqual(len(pulled), 4)
+
+    def test_process_mode(self):
+        results = list(scan_files([os.path.join(self.tmp.name, "gone.pdf")], workers=1))
+        self.assertEqual(results[0].status, STATUS_MISSING)
+
+    def test_concurrent_thread_pools_keep_their_config(self):
+        """A second thread-mode batch doesn't change the first one's scanners."""
+        first = _make_executor(1, "thread", {"profile": "fast-camera"}, "qr-a")
+        second = _make_executor(1, "thread", {"profile": "low-contrast"}, "qr-b")
+        try:
+            profiles = [
+                pool.submit(lambda: _worker_scanner().profile.name).result()
+                for pool in (first, second)
+            ]
+        finally:
+            first.shutdown()
+            second.shutdown()
+
+        self.assertEqual(profiles, ["fast-camera", "low-contrast"])
+
+    def make_pdf(self, bright_pages, page_count=6):
+        """Pages in bright_pages get a distinct light gray, the rest are black."""
+        path = os.path.join(self.tmp.name, "doc.pdf")
+        doc = fitz.open()
+        for page_no in range(1, page_count + 1):
+            page = doc.new_page(width=72, height=72)
+            level = 0.6 + page_no / 20 if page_no in bright_pages else 0
+            page.draw_rect(page.rect, color=None, fill=(level, level, level))
+        doc.save(path)
+        doc.close()
+        return path
+
+    def test_pdf_pages_report_their_page(self):
+        path = self.make_pdf({2, 5})
+
+        results = dict(scan_pdf_pages(path, range(1, 7), workers=3, mode="thread"))
+
+        self.assertEqual(sorted(results), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(sorted(p for p, r in results.items() if r), [2, 5])
+        self.assertEqual(results[5].codes[0].page, 5)
+
+    def test_scan_pdf_exhaustive_and_early_stop(self):
+        path = self.make_pdf({4, 6})
+        scanner = QRCodeScanner()
+
+        codes = scanner.scan_pdf(path, workers=2, mode="thread", stop_after=None)
+        self.assertEqual([c.page for c in codes], [4, 6])
+        self.assertEqual(scanner.last_stats["pdf_pages_scanned"], 6)
+
+        codes = scanner.scan_pdf(path, pages="4-6", workers=1, mode="thread")
+        self.assertEqual([c.page for c in codes], [4])
+        # Pages already decoded when the code was found may be counted too
+        self.assertLess(scanner.last_stats["pdf_pages_scanned"], 3)
+        self.assertEqual(scanner.last_stats["pdf_pages_selected"], 3)
+
+        with self.assertRaises(ValueError):
+            scanner.scan_pdf(path, pages="9")
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            next(scan_files(["x.png"], mode="gpu"))
@@ -0,0 +1,134 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+from qr_network.capture.cache import ResultCache
+from qr_network.capture.results import DetectionResult, QRCode
+from qr_network.capture.scanner import QRCodeScanner
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ResultCache(os.path.join(self.tmp.name, "cache.sqlite3"))
+        self.addCleanup(self.cache.close)
+
+    def write(self, name, content=b"image bytes"):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_roundtrip_keeps_codes(self):
+        path = self.write("a.png")
+        points = np.arange(8, dtype=np.float32).reshape(4, 1, 2)
+        result = DetectionResult([QRCode("WIFI:S:Net;;", points, "QRCode", 90, "M", 2)])
+
+        key, cached = self.cache.lookup(path, "settings")
+        self.assertIsNone(cached)
+        self.cache.store(key, result)
+        _, cached = self.cache.lookup(path, "settings")
+
+        code = cached.codes[0]
+        self.assertEqual(
+            (code.text, code.page, code.orientation), ("WIFI:S:Net;;", 2, 90)
+        )
+        self.assertEqual(code.points.tolist(), points.tolist())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_empty_results_are_cached(self):
+        path = self.write("blank.png")
+        key, _ = self.cache.lookup(path, "s")
+        self.cache.store(key, DetectionResult())
+
+        _, cached = self.cache.lookup(path, "s")
+        self.assertIsNotNone(cached)
+        self.assertFalse(cached)
+
+    def test_keyed_by_content_and_settings(self):
+        first = self.write("a.png")
+        copy = self.write("copy.png")
+        key, _ = self.cache.lookup(first, "s")
+        self.cache.store(key, DetectionResult([QRCode("A")]))
+
+        self.assertEqual(self.cache.lookup(copy, "s")[1].texts, ["A"])
+        self.assertIsNone(self.cache.lookup(first, "other settings")[1])
+
+        self.write("a.png", b"edited")
+        self.assertIsNone(self.cache.lookup(first, "s")[1])
+
+    def test_unchanged_stat_skips_hashing(self):
+        path = self.write("a.png")
+        with patch("qr_network.capture.cache.file_digest", return_value="d") as digest:
+            self.cache.digest(path)
+            self.cache.digest(path)
+            self.assertEqual(digest.call_count, 1)
+
+            os.utime(path, ns=(1, 1))
+            self.cache.digest(path)
+            self.assertEqual(digest.call_count, 2)
+
+    def test_least_recently_used_are_evicted(self):
+        self.cache.max_entries = 2
+        paths = [self.write(f"{i}.png", bytes([i])) for i in range(3)]
+        with patch("qr_network.capture.cache.time.time", side_effect=range(100)):
+            for path in paths[:2]:
+                key, _ = self.cache.lookup(path, "s")
+                self.cache.store(key, DetectionResult())
+            # Touch the first so the second becomes the oldest
+            self.cache.lookup(paths[0], "s")
+            key, _ = self.cache.lookup(paths[2], "s")
+            self.cache.store(key, DetectionResult())
+
+            self.assertEqual(len(self.cache), 2)
+            self.assertIsNotNone(self.cache.lookup(paths[0], "s")[1])
+            self.assertIsNone(self.cache.lookup(paths[1], "s")[1])
+
+
+class TestScanFileCache(unittest.TestCase):
+    def setUp(self):
+        self.zxing = MagicMock()
+        result = MagicMock()
+        result.text = "WIFI:S:Cached;T:WPA;P:pass;;"
+        self.zxing.read_barcodes.return_value = [result]
+        patcher = patch.dict(sys.modules, {"zxingcpp": self.zxing})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "qr.png")
+        cv2.imwrite(self.path, np.full((64, 64), 200, dtype=np.uint8))
+
+    def test_hit_skips_decoding(self):
+        with ResultCache(os.path.join(self.tmp.name, "c.sqlite3")) as cache:
+            scanner = QRCodeScanner(result_cache=cache)
+            self.assertEqual(
+                scanner.scan_file(self.path), "WIFI:S:Cached;T:WPA;P:pass;;"
+            )
+            self.assertEqual(scanner.last_stats["cache"], "miss")
+            calls = self.zxing.read_barcodes.call_count
+
+            self.assertEqual(
+                scanner.scan_file(self.path), "WIFI:S:Cached;T:WPA;P:pass;;"
+            )
+            self.assertEqual(scanner.last_stats, {"cache": "hit"})
+            self.assertEqual(self.zxing.read_barcodes.call_count, calls)
+            self.assertEqual(
+                scanner.last_result.texts, ["WIFI:S:Cached;T:WPA;P:pass;;"]
+            )
+
+            # A different decoder profile is a different entry
+            other = QRCodeScanner(profile="low-contrast", result_cache=cache)
+            other.scan_file(self.path)
+            self.assertEqual(other.last_stats["cache"], "miss")
+
+
+if __name__ == "__main__":
+    unittest.main()
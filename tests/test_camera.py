@@ -0,0 +1,401 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+import cv2
+
+from qr_network.capture.camera import (
+    AdaptiveResolution,
+    CameraProbeCache,
+    CaptureMode,
+    get_capture_mode,
+    open_camera,
+)
+from qr_network.capture.results import DetectionResult, QRCode
+from qr_network.capture.scanner import QRCodeScanner
+
+BACKENDS = [("avfoundation", 1200), ("any", 0)]
+
+
+def fake_capture(working_apis):
+    """cv2.VideoCapture stand-in that only opens with the given APIs."""
+
+    def make(camera_id, api):
+        cap = MagicMock()
+        cap.isOpened.return_value = api in working_apis
+        cap.read.return_value = (True, np.zeros((4, 4, 3), np.uint8))
+        return cap
+
+    return MagicMock(side_effect=make)
+
+
+@patch("qr_network.capture.camera.camera_backends", return_value=list(BACKENDS))
+class TestOpenCamera(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "camera.json")
+
+    def test_falls_back_and_remembers_backend(self, _):
+        cache = CameraProbeCache(self.path)
+        with patch("cv2.VideoCapture", fake_capture({0})) as capture:
+            cap, timing = open_camera(2, cache)
+
+        self.assertIsNotNone(cap)
+        self.assertEqual((timing["backend"], timing["attempts"]), ("any", 2))
+        self.assertEqual(capture.call_count, 2)
+        self.assertEqual(CameraProbeCache(self.path).get(2), "any")
+
+    def test_remembered_backend_tried_first(self, _):
+        CameraProbeCache(self.path).remember(0, "any")
+        with patch("cv2.VideoCapture", fake_capture({0})) as capture:
+            _, timing = open_camera(0, CameraProbeCache(self.path))
+
+        capture.assert_called_once_with(0, 0)
+        self.assertEqual(timing["attempts"], 1)
+        self.assertTrue(timing["remembered"])
+
+    def test_failure_forgets_backend(self, _):
+        CameraProbeCache(self.path).remember(0, "any")
+        with patch("cv2.VideoCapture", fake_capture(set())):
+            cap, timing = open_camera(0, CameraProbeCache(self.path))
+
+        self.assertIsNone(cap)
+        self.assertEqual(timing["attempts"], 2)
+        self.assertIsNone(CameraProbeCache(self.path).get(0))
+
+    def test_corrupt_cache_ignored(self, _):
+        with open(self.path, "w") as f:
+            f.write("not json")
+
+        self.assertIsNone(CameraProbeCache(self.path).get(0))
+
+    def test_cache_file_format(self, _):
+        CameraProbeCache(self.path).remember(1, "avfoundation")
+
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"1": "avfoundation"})
+
+
+@patch("qr_network.capture.camera.camera_backends", return_value=list(BACKENDS))
+class TestCameraWarmUp(unittest.TestCase):
+    def test_start_camera_reuses_warm_camera(self, _):
+        capture = fake_capture({1200})
+        with patch("cv2.VideoCapture", capture):
+            scanner = QRCodeScanner()
+            scanner.warm_up()
+            scanner.start_camera()
+            ret, _ = scanner.get_frame()
+
+        self.assertTrue(ret)
+        capture.assert_called_once()
+        timing = scanner.camera_timing
+        self.assertTrue(timing["warm"])
+        self.assertEqual(timing["backend"], "avfoundation")
+        self.assertIn("first_frame_seconds", timing)
+        # The warm-up already read a frame to get the stream going
+        self.assertEqual(scanner.cap.read.call_count, 2)
+        scanner.stop_camera()
+
+    def test_cold_start_records_timing(self, _):
+        with patch("cv2.VideoCapture", fake_capture({1200})):
+            scanner = QRCodeScanner()
+            scanner.start_camera()
+            scanner.get_frame()
+
+        self.assertFalse(scanner.camera_timing["warm"])
+        self.assertIn("first_frame_seconds", scanner._camera_stats(1)["camera"])
+        scanner.stop_camera()
+
+    def test_stop_during_warm_up_releases_camera(self, _):
+        opened = threading.Event()
+        proceed = threading.Event()
+        cap = MagicMock()
+        cap.isOpened.return_value = True
+
+        def slow_open(camera_id, api):
+            opened.set()
+            proceed.wait(2)
+            return cap
+
+        with patch("cv2.VideoCapture", MagicMock(side_effect=slow_open)):
+            scanner = QRCodeScanner()
+            scanner.warm_up()
+            opened.wait(2)
+            scanner.stop_camera()
+            cap.release.assert_not_called()
+            proceed.set()
+            for _ in range(200):
+                if cap.release.called:
+                    break
+                threading.Event().wait(0.01)
+
+        cap.release.assert_called_once()
+        self.assertIsNone(scanner.cap)
+
+    def test_unclaimed_warm_camera_released_after_idle_timeout(self, _):
+        with patch("cv2.VideoCapture", fake_capture({1200})):
+            scanner = QRCodeScanner()
+            scanner.warm_up(idle_timeout=0.2)
+            cap, _ = scanner._warm_up.result(timeout=2)
+            for _ in range(200):
+                if cap.release.called:
+                    break
+                threading.Event().wait(0.01)
+
+            cap.release.assert_called_once()
+            self.assertIsNone(scanner._warm_up)
+            # Starting afterwards opens the camera again
+            scanner.start_camera()
+        self.assertFalse(scanner.camera_timing["warm"])
+        scanner.stop_camera()
+
+    def test_claimed_warm_camera_outlives_idle_timeout(self, _):
+        with patch("cv2.VideoCapture", fake_capture({1200})):
+            scanner = QRCodeScanner()
+            scanner.warm_up(idle_timeout=0.05)
+            scanner.start_camera()
+            threading.Event().wait(0.1)
+
+        scanner.cap.release.assert_not_called()
+        self.assertTrue(scanner.camera_timing["warm"])
+        scanner.stop_camera()
+
+    def test_failed_warm_up_reported_by_start(self, _):
+        with patch("cv2.VideoCapture", fake_capture(set())):
+            scanner = QRCodeScanner()
+            scanner.warm_up()
+            with self.assertRaises(RuntimeError):
+                scanner.start_camera()
+
+
+class FakeProps:
+    """Capture properties that record set() calls and honour some of them."""
+
+    def __init__(self, supported):
+        self.values = {
+            cv2.CAP_PROP_FRAME_WIDTH: 1920.0,
+            cv2.CAP_PROP_FRAME_HEIGHT: 1080.0,
+        }
+        self.supported = supported
+        self.calls = []
+
+    def set(self, prop, value):
+        self.calls.append(prop)
+        if prop in self.supported:
+            self.values[prop] = float(value)
+            return True
+        return False
+
+    def get(self, prop):
+        return self.values.get(prop, 0.0)
+
+
+class TestCaptureMode(unittest.TestCase):
+    def test_reads_back_applied_format(self):
+        props = FakeProps(
+            {
+                cv2.CAP_PROP_FOURCC,
+                cv2.CAP_PROP_FRAME_WIDTH,
+                cv2.CAP_PROP_FRAME_HEIGHT,
+                cv2.CAP_PROP_FPS,
+            }
+        )
+        cap = MagicMock(set=props.set, get=props.get)
+
+        applied = get_capture_mode("qr").apply(cap)
+
+        self.assertEqual(
+            applied,
+            {
+                "width": 1280,
+                "height": 720,
+                "fps": 30.0,
+                "fourcc": "MJPG",
+                # Backend ignored CAP_PROP_BUFFERSIZE
+                "buffer_size": None,
+            },
+        )
+        # Pixel format is requested before the frame size
+        self.assertEqual(props.calls[0], cv2.CAP_PROP_FOURCC)
+
+    def test_unset_fields_left_alone(self):
+        props = FakeProps(set())
+        cap = MagicMock(set=props.set, get=props.get)
+
+        applied = CaptureMode(buffer_size=1).apply(cap)
+
+        self.assertEqual(props.calls, [cv2.CAP_PROP_BUFFERSIZE])
+        self.assertEqual((applied["width"], applied["height"]), (1920, 1080))
+
+    def test_presets(self):
+        self.assertEqual(get_capture_mode().name, "native")
+        mode = CaptureMode("mine", width=800)
+        self.assertIs(get_capture_mode(mode), mode)
+        # Modes compare by what they request from the driver
+        self.assertEqual(get_capture_mode("qr"), get_capture_mode("qr"))
+        self.assertEqual(mode, CaptureMode(width=800))
+        self.assertNotEqual(get_capture_mode("qr"), get_capture_mode("high-res"))
+        with self.assertRaises(ValueError):
+            get_capture_mode("8k")
+
+    @patch("qr_network.capture.camera.camera_backends", return_value=list(BACKENDS))
+    def test_scanner_applies_mode_before_first_read(self, _):
+        props = FakeProps({cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT})
+        cap = MagicMock(set=MagicMock(side_effect=props.set), get=props.get)
+        cap.isOpened.return_value = True
+        set_before_read = []
+
+        def read():
+            set_before_read.append(cap.set.called)
+            return True, np.zeros((4, 4, 3), np.uint8)
+
+        cap.read.side_effect = read
+
+        with patch("cv2.VideoCapture", return_value=cap):
+            scanner = QRCodeScanner(capture_mode="low-res")
+            scanner.warm_up()
+            scanner.start_camera()
+
+        self.assertEqual(
+            (scanner.capture_format["width"], scanner.capture_format["height"]),
+            (640, 480),
+        )
+        self.assertEqual(scanner._camera_stats(0)["capture"]["mode"], "low-res")
+        self.assertEqual(set_before_read, [True])
+        scanner.stop_camera()
+
+    @patch("qr_network.capture.camera.camera_backends", return_value=list(BACKENDS))
+    def test_reselecting_mode_keeps_warm_camera_format(self, _):
+        """Asking again for the current preset doesn't renegotiate the stream."""
+        props = FakeProps({cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT})
+        cap = MagicMock(set=props.set, get=props.get)
+        cap.isOpened.return_value = True
+        cap.read.return_value = (True, np.zeros((4, 4, 3), np.uint8))
+
+        with patch("cv2.VideoCapture", return_value=cap):
+            scanner = QRCodeScanner(capture_mode="qr")
+            scanner.warm_up()
+            scanner._warm_up.result(timeout=2)
+            opened_with = len(props.calls)
+            scanner.set_capture_mode("qr")
+            scanner.start_camera()
+            scanner.get_frame()
+
+        self.assertEqual(len(props.calls), opened_with)
+        scanner.stop_camera()
+
+
+class TestAdaptiveResolution(unittest.TestCase):
+    def test_locks_on_candidate_and_drops_back(self):
+        switch = AdaptiveResolution(lock_frames=2)
+        self.assertEqual(switch.mode.name, "low-res")
+
+        self.assertIsNone(switch.update(found=False, candidate=False))
+        self.assertEqual(switch.update(found=False, candidate=True).name, "high-res")
+        # Candidates keep the lock alive
+        self.assertIsNone(switch.update(found=False, candidate=True))
+        self.assertIsNone(switch.update(found=False, candidate=False))
+        self.assertEqual(switch.update(found=False, candidate=False).name, "low-res")
+        self.assertEqual(switch.switches, 2)
+
+    def test_decode_drops_back(self):
+        switch = AdaptiveResolution()
+        switch.update(found=False, candidate=True)
+
+        self.assertEqual(switch.update(found=True, candidate=True).name, "low-res")
+        self.assertFalse(switch.locked)
+
+    def test_decode_while_searching_keeps_mode(self):
+        switch = AdaptiveResolution()
+
+        self.assertIsNone(switch.update(found=True, candidate=True))
+        self.assertEqual(switch.switches, 0)
+
+
+@patch("qr_network.capture.camera.camera_backends", return_value=list(BACKENDS))
+class TestAdaptiveScan(unittest.TestCase):
+    def run_scan(self, threaded):
+        props = FakeProps({cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT})
+        cap = MagicMock(set=props.set, get=props.get)
+        cap.isOpened.return_value = True
+        sizes = []
+
+        def read():
+            width = int(props.values[cv2.CAP_PROP_FRAME_WIDTH])
+            height = int(props.values[cv2.CAP_PROP_FRAME_HEIGHT])
+            return True, np.zeros((height, width), np.uint8)
+
+        def detect(frame, return_candidates=False):
+            sizes.append(frame.shape[1])
+            if frame.shape[1] < 1000:
+                # Too small to decode at the search resolution
+                candidate = np.zeros((4, 1, 2), np.float32)
+                return DetectionResult(candidates=[candidate])
+            return DetectionResult([QRCode("WIFI:S:Net;;")])
+
+        cap.read.side_effect = read
+        with patch("cv2.VideoCapture", return_value=cap):
+            scanner = QRCodeScanner(threaded=threaded, adaptive_resolution=True)
+            scanner._detect = detect
+            text = scanner.scan_one(timeout=2, show_window=False)
+        return scanner, text, sizes
+
+    def test_scan_one_switches_to_high_res(self, _):
+        scanner, text, sizes = self.run_scan(threaded=False)
+
+        self.assertEqual(text, "WIFI:S:Net;;")
+        self.assertEqual(sizes, [640, 1920])
+        self.assertEqual(scanner.last_stats["resolution_switches"], 2)
+        # The next session searches at low resolution again
+        self.assertEqual(scanner.capture_mode.name, "low-res")
+
+    def test_threaded_capture_switches_on_reader_thread(self, _):
+        """The decoding thread never renegotiates the stream itself."""
+        caller = threading.current_thread()
+        set_on = []
+        set_frame_size = FakeProps.set
+
+        def record_set(props, prop, value):
+            if prop == cv2.CAP_PROP_FRAME_WIDTH:
+                set_on.append(threading.current_thread())
+            return set_frame_size(props, prop, value)
+
+        with patch.object(FakeProps, "set", record_set):
+            scanner, text, sizes = self.run_scan(threaded=True)
+
+        self.assertEqual(text, "WIFI:S:Net;;")
+        self.assertEqual(sizes[0], 640)
+        self.assertEqual(sizes[-1], 1920)
+        self.assertIsNone(scanner.capture_thread)
+        # The first set() is the initial open; the switch ran elsewhere
+        self.assertIs(set_on[0], caller)
+        self.assertNotIn(caller, set_on[1:])
+        self.assertTrue(set_on[1:])
+
+    def test_tracking_resets_when_frame_size_changes(self, _):
+        props = FakeProps({cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT})
+        cap = MagicMock(set=props.set, get=props.get)
+        cap.isOpened.return_value = True
+        frames = [np.zeros((480, 640), np.uint8)] * 2 + [
+            np.zeros((720, 1280), np.uint8)
+        ]
+        cap.read.side_effect = [(True, frame) for frame in frames]
+        with patch("cv2.VideoCapture", return_value=cap):
+            scanner = QRCodeScanner(roi_tracking=True)
+            scanner.start_camera()
+            with patch.object(scanner, "_reset_tracking") as reset:
+                scanner.get_frame()
+                scanner.get_frame()
+                reset.assert_not_called()
+                scanner.get_frame()
+                reset.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch
 from typer.testing import CliRunner
 from qr_network.cli import app, ExitCode
+from qr_network.capture.results import DetectionResult, QRCode
 
 runner = CliRunner()
 
@@ -50,6 +51,7 @@ class TestCLI(unittest.TestCase):
 
         # Verify calls
         mock_scanner.scan_one.assert_called_once()
+        self.assertEqual(MockScanner.call_args.kwargs["profile"], "fast-camera")
         mock_net.add_network.assert_called_with("MyNet", "secret", "WPA", hidden=False)
         mock_net.activate_network.assert_called_with("MyNet", "secret")
 
@@ -68,6 +70,336 @@ class TestCLI(unittest.TestCase):
         self.assertEqual(result.exit_code, ExitCode.SCAN_TIMEOUT)
         self.assertIn("Scan timed out", result.stdout)
 
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_file_with_workers(self, MockNetManager, MockScanner):
+        """Test --workers configures the scanner decode pool."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.scan_file.return_value = None
+
+        result = runner.invoke(
+            app,
+            ["scan", "--file", "qr.pdf", "--workers", "4", "--worker-mode", "process"],
+        )
+
+        self.assertEqual(result.exit_code, ExitCode.GENERAL_ERROR)
+        kwargs = MockScanner.call_args.kwargs
+        self.assertEqual(kwargs["decode_workers"], 4)
+        self.assertEqual(kwargs["decode_mode"], "process")
+        self.assertEqual(kwargs["profile"], "thorough-file")
+        mock_scanner.scan_file.assert_called_once_with("qr.pdf")
+        mock_scanner.close.assert_called_once()
+
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_multiscale_verbose_reports_levels(self, MockNetManager, MockScanner):
+        """Test --multiscale is passed on and pyramid timings are printed."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.scan_screen.return_value = "WIFI:S:MyNet;T:WPA;P:secret;;"
+        mock_scanner.last_stats = {
+            "pyramid": [
+                {"scale": 4, "seconds": 0.002, "found": False},
+                {"scale": 2, "seconds": 0.005, "found": True},
+            ],
+            "tiles": {"tiles": 20, "seconds": 0.25},
+        }
+        mock_net = MockNetManager.return_value
+        mock_net.add_network.return_value = (True, "Added")
+        mock_net.get_current_network.return_value = "MyNet"
+
+        result = runner.invoke(app, ["scan", "--screen", "--multiscale", "-v"])
+
+        self.assertEqual(result.exit_code, ExitCode.SUCCESS)
+        mock_scanner.scan_screen.assert_called_once_with(screen_index=None)
+        self.assertTrue(MockScanner.call_args.kwargs["multiscale"])
+        self.assertIn("Scale 1/4: 2.0 ms (miss)", result.stdout)
+        self.assertIn("Scale 1/2: 5.0 ms (hit)", result.stdout)
+        self.assertIn("Tiled decode: 20 tiles in 250.0 ms", result.stdout)
+
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_screen_monitor_option(self, MockNetManager, MockScanner):
+        """Test --monitor picks one screen and per-monitor timings are printed."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.scan_screen.return_value = "WIFI:S:MyNet;T:WPA;P:secret;;"
+        mock_scanner.last_stats = {
+            "monitors": [{"index": 1, "seconds": 0.012, "found": True}]
+        }
+        mock_net = MockNetManager.return_value
+        mock_net.add_network.return_value = (True, "Added")
+        mock_net.get_current_network.return_value = "MyNet"
+
+        result = runner.invoke(app, ["scan", "--screen", "--monitor", "1", "-v"])
+
+        self.assertEqual(result.exit_code, ExitCode.SUCCESS)
+        mock_scanner.scan_screen.assert_called_once_with(screen_index=1)
+        self.assertIn("Monitor 1: 12.0 ms (hit)", result.stdout)
+
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_screen_watch(self, MockNetManager, MockScanner):
+        """Test --watch polls the screen instead of taking one screenshot."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.watch_screen.return_value = None
+
+        result = runner.invoke(
+            app, ["scan", "--screen", "--watch", "--interval", "0.5", "-t", "30"]
+        )
+
+        self.assertEqual(result.exit_code, ExitCode.SCAN_TIMEOUT)
+        mock_scanner.watch_screen.assert_called_once_with(
+            interval=0.5, timeout=30.0, screen_index=None
+        )
+        mock_scanner.scan_screen.assert_not_called()
+
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_screen_watch_runs_until_stopped(self, MockNetManager, MockScanner):
+        """Test --watch has no timeout unless --timeout is given."""
+        MockScanner.return_value.watch_screen.return_value = None
+
+        runner.invoke(app, ["scan", "--screen", "--watch"])
+
+        self.assertIsNone(
+            MockScanner.return_value.watch_screen.call_args.kwargs["timeout"]
+        )
+
+    @patch("qr_network.cli.QRCodeScanner")
+    def test_scan_watch_needs_screen(self, MockScanner):
+        """Test --watch without --screen is an error, not a camera scan."""
+        result = runner.invoke(app, ["scan", "--watch"])
+
+        self.assertEqual(result.exit_code, ExitCode.GENERAL_ERROR)
+        self.assertIn("--watch needs --screen", result.stdout)
+        MockScanner.assert_not_called()
+
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_file_verbose_reports_image_levels(self, MockNetManager, MockScanner):
+        """Test -v prints load and decode time for each image resolution."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.scan_file.return_value = "WIFI:S:MyNet;T:WPA;P:secret;;"
+        mock_scanner.last_stats = {
+            "image_levels": [
+                {
+                    "scale": 4,
+                    "load_seconds": 0.01,
+                    "decode_seconds": 0.002,
+                    "found": False,
+                },
+                {
+                    "scale": 2,
+                    "load_seconds": 0.02,
+                    "decode_seconds": 0.005,
+                    "found": True,
+                },
+            ]
+        }
+        mock_net = MockNetManager.return_value
+        mock_net.add_network.return_value = (True, "Added")
+        mock_net.get_current_network.return_value = "MyNet"
+
+        result = runner.invoke(app, ["scan", "--file", "photo.jpg", "-v"])
+
+        self.assertEqual(result.exit_code, ExitCode.SUCCESS)
+        self.assertIn("Image 1/4: load 10.0 ms, decode 2.0 ms (miss)", result.stdout)
+        self.assertIn("Image 1/2: load 20.0 ms, decode 5.0 ms (hit)", result.stdout)
+
+    @patch("qr_network.capture.camera.CameraProbeCache")
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_camera_verbose_reports_capture(
+        self, MockNetManager, MockScanner, MockProbeCache
+    ):
+        """Test camera scans request a capture mode and -v prints what applied."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.scan_one.return_value = "WIFI:S:MyNet;T:WPA;P:secret;;"
+        mock_scanner.last_stats = {
+            "capture": {
+                "mode": "qr",
+                "width": 1280,
+                "height": 720,
+                "fps": 30.0,
+                "fourcc": "MJPG",
+                "buffer_size": 1,
+            },
+            "camera": {
+                "backend": "avfoundation",
+                "attempts": 1,
+                "open_seconds": 0.2,
+                "first_frame_seconds": 0.05,
+                "warm": False,
+            },
+            "resolution_switches": 2,
+        }
+        mock_net = MockNetManager.return_value
+        mock_net.add_network.return_value = (True, "Added")
+        mock_net.get_current_network.return_value = "MyNet"
+
+        result = runner.invoke(app, ["scan", "-v", "--adaptive-resolution"])
+
+        self.assertEqual(result.exit_code, ExitCode.SUCCESS)
+        kwargs = MockScanner.call_args.kwargs
+        self.assertEqual(kwargs["capture_mode"], "qr")
+        self.assertTrue(kwargs["adaptive_resolution"])
+        self.assertIn("Adaptive resolution: 2 switches", result.stdout)
+        self.assertIs(kwargs["camera_cache"], MockProbeCache.return_value)
+        self.assertIn(
+            "Capture mode qr: 1280x720 @ 30 fps MJPG, 1-frame buffer", result.stdout
+        )
+        self.assertIn(
+            "Camera: avfoundation backend opened in 200.0 ms, first frame after "
+            "50.0 ms",
+            result.stdout,
+        )
+
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_file_from_stdin(self, MockNetManager, MockScanner):
+        """Test --file - scans piped bytes from memory."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.scan_bytes.return_value = None
+
+        result = runner.invoke(app, ["scan", "--file", "-"], input=b"\x89PNG data")
+
+        self.assertEqual(result.exit_code, ExitCode.GENERAL_ERROR)
+        mock_scanner.scan_bytes.assert_called_once_with(b"\x89PNG data")
+        mock_scanner.scan_file.assert_not_called()
+        self.assertIn("No QR code found in stdin", result.stdout)
+
+    @patch("qr_network.capture.cache.ResultCache")
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_file_cache_hit_reported(self, MockNetManager, MockScanner, MockCache):
+        """Test --cache-file wires a result cache and reports hits."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.scan_file.return_value = "WIFI:S:MyNet;T:WPA;P:secret;;"
+        mock_scanner.last_stats = {"cache": "hit"}
+        mock_net = MockNetManager.return_value
+        mock_net.add_network.return_value = (True, "Added")
+        mock_net.get_current_network.return_value = "MyNet"
+
+        result = runner.invoke(
+            app, ["scan", "--file", "qr.png", "--cache-file", "/tmp/c.sqlite3"]
+        )
+
+        self.assertEqual(result.exit_code, ExitCode.SUCCESS)
+        MockCache.assert_called_once_with("/tmp/c.sqlite3")
+        self.assertIs(
+            MockScanner.call_args.kwargs["result_cache"], MockCache.return_value
+        )
+        self.assertIn("Result cache hit, decoding skipped", result.stdout)
+        MockCache.return_value.close.assert_called_once()
+
+    @patch("qr_network.capture.hotfolder.FolderIndex")
+    @patch("qr_network.capture.hotfolder.FolderWatcher")
+    @patch("qr_network.cli.QRCodeScanner")
+    def test_watch_dir_prints_results(self, MockScanner, MockWatcher, MockIndex):
+        """Test watch-dir prints each result as the watcher yields it."""
+        from qr_network.capture.batch import FileScanResult
+
+        MockWatcher.return_value.known = {}
+        MockWatcher.return_value.watch.return_value = iter(
+            [
+                FileScanResult("in/a.png", "ok", codes=[QRCode("WIFI:S:Net;;")]),
+                FileScanResult("in/b.png", "no_qr"),
+            ]
+        )
+
+        result = runner.invoke(app, ["watch-dir", "in", "--index", "/tmp/i.db"])
+
+        self.assertEqual(result.exit_code, ExitCode.SUCCESS)
+        MockIndex.assert_called_once_with("/tmp/i.db")
+        self.assertIn("WIFI:S:Net;;", result.stdout)
+        self.assertIn("in/b.png: no QR code", result.stdout)
+        MockIndex.return_value.close.assert_called_once()
+        MockScanner.return_value.close.assert_called_once()
+
+    @patch("qr_network.capture.hotfolder.FolderIndex")
+    @patch("qr_network.cli.QRCodeScanner")
+    def test_watch_dir_missing_folder(self, MockScanner, MockIndex):
+        """Test watch-dir fails cleanly when the folder doesn't exist."""
+        result = runner.invoke(app, ["watch-dir", "/no/such/folder"])
+
+        self.assertEqual(result.exit_code, ExitCode.GENERAL_ERROR)
+        self.assertIn("Not a directory", result.stdout)
+
+    @patch("qr_network.cli.QRCodeScanner")
+    def test_scan_adaptive_resolution_rejects_workers(self, MockScanner):
+        """Test --adaptive-resolution with --workers is refused for the camera."""
+        result = runner.invoke(app, ["scan", "--adaptive-resolution", "-w", "2"])
+
+        self.assertEqual(result.exit_code, ExitCode.GENERAL_ERROR)
+        self.assertIn("can't be combined with --workers", result.stdout)
+        MockScanner.assert_not_called()
+
+    def test_watch_dir_unknown_profile(self):
+        """Test watch-dir reports an unknown --profile without a traceback."""
+        result = runner.invoke(app, ["watch-dir", ".", "--profile", "ultra"])
+
+        self.assertEqual(result.exit_code, ExitCode.GENERAL_ERROR)
+        self.assertIn("Unknown decoder profile", result.stdout)
+
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_file_lists_multiple_wifi_codes(self, MockNetManager, MockScanner):
+        """Test every WiFi code from one decode is listed and the first is used."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.scan_file.return_value = "https://example.com"
+        mock_scanner.last_result = DetectionResult(
+            [
+                QRCode("https://example.com"),
+                QRCode("WIFI:S:Guest;T:WPA;P:one;;", page=1),
+                QRCode("WIFI:S:Staff;T:WPA;P:two;;", page=1),
+            ]
+        )
+        mock_net = MockNetManager.return_value
+        mock_net.add_network.return_value = (True, "Added")
+        mock_net.get_current_network.return_value = "Guest"
+
+        result = runner.invoke(app, ["scan", "--file", "poster.pdf"])
+
+        self.assertEqual(result.exit_code, ExitCode.SUCCESS)
+        self.assertIn("Found 2 WiFi QR codes", result.stdout)
+        self.assertIn("WIFI:S:Staff;T:WPA;P:two;; (page 1)", result.stdout)
+        mock_scanner.scan_file.assert_called_once_with("poster.pdf")
+        self.assertEqual(mock_net.add_network.call_args.args[0], "Guest")
+
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_file_pages_scans_pdf_in_parallel(self, MockNetManager, MockScanner):
+        """Test --pages switches to the parallel exhaustive PDF scan."""
+        mock_scanner = MockScanner.return_value
+        mock_scanner.scan_pdf.return_value = [
+            QRCode("WIFI:S:Late;T:WPA;P:pw;;", page=7)
+        ]
+        mock_scanner.last_stats = {"pdf_pages_scanned": 5, "pdf_pages_selected": 9}
+        mock_net = MockNetManager.return_value
+        mock_net.add_network.return_value = (True, "Added")
+        mock_net.get_current_network.return_value = "Late"
+
+        result = runner.invoke(
+            app, ["scan", "--file", "doc.pdf", "--pages", "2-10", "-w", "3", "-v"]
+        )
+
+        self.assertEqual(result.exit_code, ExitCode.SUCCESS)
+        mock_scanner.scan_pdf.assert_called_once_with(
+            "doc.pdf", pages="2-10", workers=3, mode="process"
+        )
+        mock_scanner.scan_file.assert_not_called()
+        self.assertIn("PDF pages scanned: 5 of 9", result.stdout)
+        self.assertEqual(MockScanner.call_args.kwargs["decode_mode"], "thread")
+
+    @patch("qr_network.cli.QRCodeScanner")
+    @patch("qr_network.cli.NetworkManager")
+    def test_scan_profile_option(self, MockNetManager, MockScanner):
+        """Test --profile overrides the default decoder preset."""
+        MockScanner.return_value.scan_one.return_value = None
+
+        runner.invoke(app, ["scan", "--profile", "low-contrast", "--timeout", "1"])
+
+        self.assertEqual(MockScanner.call_args.kwargs["profile"], "low-contrast")
+
     @patch("qr_network.ui.app.main")
     def test_gui_launch(self, mock_gui_main):
         """Test GUI command launches app."""
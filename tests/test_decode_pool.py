@@ -0,0 +1,125 @@
+import threading
+import unittest
+
+import numpy as np
+
+from qr_network.capture.decode_pool import (
+    DecodePool,
+    clear_of_cuts,
+    sliding_tiles,
+    split_tiles,
+)
+
+
+class TestDecodePool(unittest.TestCase):
+    def test_thread_pool_returns_first_hit(self):
+        """The first successful decode wins; empty results are skipped."""
+        frames = ["miss", "hit", "miss"]
+
+        with DecodePool(
+            workers=2, decode_fn=lambda f: "TEXT" if f == "hit" else None
+        ) as pool:
+            self.assertEqual(pool.decode_first(frames), "TEXT")
+
+    def test_thread_pool_cancels_pending_work(self):
+        """Queued frames are cancelled once a result arrives."""
+        release = threading.Event()
+        seen = []
+
+        def decode(frame):
+            seen.append(frame)
+            if frame == 0:
+                return "TEXT"
+            release.wait(1.0)
+            return None
+
+        with DecodePool(workers=1, decode_fn=decode) as pool:
+            self.assertEqual(pool.decode_first(range(5)), "TEXT")
+            release.set()
+
+        # Frame 0 hits; at most the frame already running is seen, the rest are cancelled
+        self.assertLessEqual(len(seen), 2)
+
+    def test_no_hit_returns_none(self):
+        with DecodePool(workers=2, decode_fn=lambda f: None) as pool:
+            self.assertIsNone(pool.decode_first([1, 2, 3]))
+
+    def test_process_pool_uses_shared_memory(self):
+        """Process workers read frames from shared memory."""
+        frames = [
+            np.zeros((8, 8), dtype=np.uint8),
+            np.full((8, 8, 3), 7, dtype=np.uint8),
+        ]
+
+        # np.max is picklable by reference and returns 0 (falsy) for the blank frame
+        with DecodePool(workers=2, mode="process", decode_fn=np.max) as pool:
+            self.assertEqual(pool.decode_first(frames), 7)
+
+    def test_decode_all_keeps_order(self):
+        def decode(frame):
+            if frame == 2:
+                raise RuntimeError("boom")
+            return frame * 10
+
+        with DecodePool(workers=2, decode_fn=decode) as pool:
+            self.assertEqual(pool.decode_all([1, 2, 3]), [10, None, 30])
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            DecodePool(workers=1, mode="gpu")
+
+
+class TestSplitTiles(unittest.TestCase):
+    def test_tiles_overlap_and_cover_frame(self):
+        frame = np.zeros((100, 200), dtype=np.uint8)
+        tiles = split_tiles(frame, rows=2, cols=2, overlap=0.25)
+
+        self.assertEqual(len(tiles), 4)
+        self.assertEqual(tiles[0][0].shape, (62, 125))
+        self.assertEqual(
+            [offset for _, offset in tiles], [(0, 0), (75, 0), (0, 38), (75, 38)]
+        )
+        self.assertTrue(all(np.shares_memory(t, frame) for t, _ in tiles))
+
+
+class TestSlidingTiles(unittest.TestCase):
+    def test_windows_overlap_by_code_size_and_reach_edges(self):
+        frame = np.zeros((1000, 1200), dtype=np.uint8)
+        tiles = sliding_tiles(frame, code_size=128)
+
+        offsets = [offset for _, offset in tiles]
+        self.assertEqual(len(tiles), 9)
+        self.assertEqual(offsets[:3], [(0, 0), (384, 0), (688, 0)])
+        self.assertEqual(offsets[-1], (688, 488))
+        self.assertTrue(all(t.shape == (512, 512) for t, _ in tiles))
+        self.assertTrue(all(np.shares_memory(t, frame) for t, _ in tiles))
+
+    def test_small_frame_is_one_tile(self):
+        frame = np.zeros((300, 400), dtype=np.uint8)
+        tiles = sliding_tiles(frame, code_size=128)
+        self.assertEqual([offset for _, offset in tiles], [(0, 0)])
+        self.assertEqual(tiles[0][0].shape, (300, 400))
+
+    def test_clear_of_cuts(self):
+        def square(x, y, size):
+            return np.array(
+                [[[x, y]], [[x + size, y]], [[x + size, y + size]], [[x, y + size]]],
+                np.float32,
+            )
+
+        frame_shape = (1000, 1200)
+        # Touching the right edge of an interior tile: cut
+        self.assertFalse(
+            clear_of_cuts(square(480, 10, 31), (0, 0), (512, 512), frame_shape)
+        )
+        # Same corner on the frame's own edge is fine
+        self.assertTrue(
+            clear_of_cuts(square(0, 0, 40), (0, 0), (512, 512), frame_shape)
+        )
+        self.assertFalse(
+            clear_of_cuts(square(0, 0, 40), (384, 0), (512, 512), frame_shape)
+        )
+        self.assertTrue(
+            clear_of_cuts(square(100, 100, 40), (384, 0), (512, 512), frame_shape)
+        )
+        self.assertTrue(clear_of_cuts(None, (384, 0), (512, 512), frame_shape))
@@ -0,0 +1,74 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from qr_network.capture.frame_buffer import CaptureThread, LatestFrameBuffer
+
+
+class TestLatestFrameBuffer(unittest.TestCase):
+    def test_get_latest_returns_newest_and_counts_drops(self):
+        """Older frames are discarded and counted when the newest is taken."""
+        buf = LatestFrameBuffer(size=3)
+        for i in range(5):
+            buf.put(i)
+
+        frame, _, seq = buf.get_latest(timeout=0)
+
+        self.assertEqual(frame, 4)
+        self.assertEqual(seq, 5)
+        # 2 evicted by the ring plus 2 skipped by get_latest
+        self.assertEqual(buf.stats(), {"frames_captured": 5, "frames_dropped": 4})
+
+    def test_get_latest_timeout(self):
+        """An empty buffer returns None after the timeout."""
+        buf = LatestFrameBuffer()
+        self.assertIsNone(buf.get_latest(timeout=0.01))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LatestFrameBuffer(size=0)
+
+
+class TestCaptureThread(unittest.TestCase):
+    def test_reads_frames_in_background(self):
+        """The reader thread fills the buffer and stops cleanly."""
+        cap = MagicMock()
+        cap.read.side_effect = lambda: (time.sleep(0.001) or True, "frame")
+
+        thread = CaptureThread(cap, buffer_size=2)
+        thread.start()
+        try:
+            ret, frame, timestamp = thread.read(timeout=1.0)
+        finally:
+            thread.stop()
+
+        self.assertTrue(ret)
+        self.assertEqual(frame, "frame")
+        self.assertIsNotNone(timestamp)
+        self.assertFalse(thread.is_running())
+
+    def test_reconfigure_runs_on_reader_thread(self):
+        """Reconfiguration happens between reads and drops older frames."""
+        cap = MagicMock()
+        cap.read.side_effect = lambda: (time.sleep(0.001) or True, "old")
+        ran_on = []
+
+        def switch():
+            ran_on.append(threading.current_thread().name)
+            cap.read.side_effect = lambda: (time.sleep(0.001) or True, "new")
+
+        thread = CaptureThread(cap, buffer_size=2)
+        thread.start()
+        try:
+            thread.read(timeout=1.0)
+            thread.reconfigure(switch)
+            deadline = time.monotonic() + 1.0
+            frame = None
+            while frame != "new" and time.monotonic() < deadline:
+                _, frame, _ = thread.read(timeout=1.0)
+        finally:
+            thread.stop()
+
+        self.assertEqual(frame, "new")
+        self.assertEqual(ran_on, ["qr-capture"])
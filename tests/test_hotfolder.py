@@ -0,0 +1,161 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from qr_network.capture.batch import STATUS_ERROR, STATUS_NO_QR, STATUS_OK
+from qr_network.capture.hotfolder import FolderIndex, FolderWatcher
+from qr_network.capture.results import DetectionResult, QRCode
+
+
+class TestFolderWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.folder = os.path.join(self.tmp.name, "inbox")
+        os.mkdir(self.folder)
+        self.index = FolderIndex(os.path.join(self.tmp.name, "index.sqlite3"))
+        self.addCleanup(self.index.close)
+        self.scanner = MagicMock()
+        self.scan = self.scanner._scan_file_result
+        self.scan.return_value = DetectionResult([QRCode("WIFI:S:Net;;")])
+
+    def write(self, name, content=b"image bytes", mtime=None):
+        path = os.path.join(self.folder, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+        return path
+
+    def watcher(self, **kwargs):
+        return FolderWatcher(self.folder, self.scanner, index=self.index, **kwargs)
+
+    def test_new_file_scanned_once_settled(self):
+        path = self.write("a.png")
+        self.write("notes.txt")
+        self.write(".hidden.png")
+        watcher = self.watcher()
+
+        self.assertEqual(watcher.poll(), [])
+        results = watcher.poll()
+
+        self.assertEqual([r.path for r in results], [path])
+        self.assertEqual(results[0].status, STATUS_OK)
+        self.assertEqual(results[0].texts, ["WIFI:S:Net;;"])
+        self.scan.assert_called_once_with(path)
+        self.assertEqual(watcher.poll(), [])
+
+    def test_growing_file_waits(self):
+        self.write("a.png", b"part")
+        watcher = self.watcher()
+        watcher.poll()
+        self.write("a.png", b"partial, still copying")
+
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(len(watcher.poll()), 1)
+
+    def test_file_without_code(self):
+        self.scan.return_value = DetectionResult()
+        self.write("blank.jpg")
+        watcher = self.watcher()
+        watcher.poll()
+
+        result = watcher.poll()[0]
+
+        self.assertEqual(result.status, STATUS_NO_QR)
+        self.assertEqual(result.codes, [])
+
+    def test_restart_resumes_from_index(self):
+        self.write("a.png")
+        first = self.watcher()
+        first.poll()
+        first.poll()
+
+        second = self.watcher()
+        self.assertEqual(len(second.known), 1)
+        second.poll()
+        second.poll()
+
+        self.scan.assert_called_once()
+
+    def test_touched_file_not_rescanned(self):
+        path = self.write("a.png")
+        watcher = self.watcher()
+        watcher.poll()
+        watcher.poll()
+
+        os.utime(path, ns=(1, 1))
+        watcher.poll()
+        self.assertEqual(watcher.poll(), [])
+
+        self.scan.assert_called_once()
+        self.assertEqual(self.watcher().known[path][1], 1)
+
+    def test_changed_file_rescanned(self):
+        path = self.write("a.png")
+        watcher = self.watcher()
+        watcher.poll()
+        watcher.poll()
+
+        self.write("a.png", b"new image bytes", mtime=1)
+        watcher.poll()
+
+        self.assertEqual([r.path for r in watcher.poll()], [path])
+        self.assertEqual(self.scan.call_count, 2)
+
+    def test_recursive(self):
+        os.mkdir(os.path.join(self.folder, "sub"))
+        nested = self.write(os.path.join("sub", "a.png"))
+
+        flat = FolderWatcher(self.folder, self.scanner)
+        flat.poll()
+        self.assertEqual(flat.poll(), [])
+
+        deep = FolderWatcher(self.folder, self.scanner, recursive=True)
+        deep.poll()
+        self.assertEqual([r.path for r in deep.poll()], [nested])
+
+    def test_scan_error_reported(self):
+        self.scan.side_effect = RuntimeError("bad file")
+        self.write("a.png")
+        watcher = self.watcher()
+        watcher.poll()
+
+        result = watcher.poll()[0]
+
+        self.assertEqual(result.status, STATUS_ERROR)
+        self.assertEqual(result.error, "bad file")
+
+    def test_unreadable_and_corrupt_files_are_errors(self):
+        """Real scanner: failures are reported as errors, not printed."""
+        from qr_network.capture.scanner import QRCodeScanner
+
+        self.scanner = QRCodeScanner()
+        self.write("fake.png", b"not an image")
+        self.write("broken.pdf", b"%PDF-1.7 truncated")
+        watcher = self.watcher()
+        watcher.poll()
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            results = watcher.poll()
+
+        self.assertEqual([r.status for r in results], [STATUS_ERROR] * 2)
+        self.assertTrue(all(r.error for r in results))
+        self.assertNotIn("scan error", stdout.getvalue())
+
+    def test_watch_yields_until_stopped(self):
+        self.write("a.png")
+        stop = threading.Event()
+        watcher = self.watcher(interval=0.01)
+
+        for result in watcher.watch(stop):
+            stop.set()
+
+        self.assertEqual(result.texts, ["WIFI:S:Net;;"])
+
+    def test_rejects_missing_directory(self):
+        with self.assertRaises(ValueError):
+            FolderWatcher(os.path.join(self.tmp.name, "nope"), self.scanner)
@@ -0,0 +1,171 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import fitz
+import numpy as np
+
+from qr_network.capture.images import as_buffer, is_jpeg, load_gray, load_levels
+from qr_network.capture.scanner import QRCodeScanner
+
+
+class TestLoadLevels(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, shape=(1200, 1600)):
+        path = os.path.join(self.tmp.name, name)
+        cv2.imwrite(path, np.full(shape, 200, dtype=np.uint8))
+        return path
+
+    def test_jpeg_levels_coarse_to_full(self):
+        path = self.write("photo.jpg")
+
+        levels = list(load_levels(path, scales=(4, 2, 1)))
+
+        self.assertEqual([scale for scale, _, _ in levels], [4, 2, 1])
+        self.assertEqual(levels[0][1].shape, (300, 400))
+        self.assertEqual(levels[-1][1].shape, (1200, 1600))
+        self.assertTrue(all(seconds >= 0 for _, _, seconds in levels))
+
+    def test_levels_below_min_side_are_skipped(self):
+        path = self.write("photo.jpg", shape=(600, 800))
+        scales = [scale for scale, _, _ in load_levels(path, scales=(8, 4, 2))]
+        # 600 / 4 is below the 256 px minimum
+        self.assertEqual(scales, [2, 1])
+
+    def test_non_jpeg_loads_full_resolution_once(self):
+        path = self.write("screenshot.png")
+        self.assertFalse(is_jpeg(path))
+        self.assertEqual([s for s, _, _ in load_levels(path)], [1])
+
+    def test_jpeg_detected_by_signature(self):
+        path = self.write("photo.jpg")
+        renamed = os.path.join(self.tmp.name, "photo.bin")
+        os.rename(path, renamed)
+        self.assertTrue(is_jpeg(renamed))
+        self.assertEqual(load_gray(renamed, 2).shape, (600, 800))
+
+    def test_in_memory_levels(self):
+        _, encoded = cv2.imencode(".jpg", np.full((1200, 1600), 200, np.uint8))
+        data = bytearray(encoded.tobytes())
+        buffer = as_buffer(memoryview(data))
+
+        self.assertTrue(np.shares_memory(buffer, np.frombuffer(data, np.uint8)))
+        self.assertTrue(is_jpeg(buffer))
+        levels = list(load_levels(buffer, scales=(4, 1)))
+        self.assertEqual(
+            [level.shape for _, level, _ in levels], [(300, 400), (1200, 1600)]
+        )
+
+    def test_unreadable_file_yields_nothing(self):
+        path = os.path.join(self.tmp.name, "broken.jpg")
+        with open(path, "wb") as f:
+            f.write(b"\xff\xd8\xff not really a jpeg")
+        self.assertEqual(list(load_levels(path)), [])
+
+
+class TestProgressiveFileScan(unittest.TestCase):
+    def setUp(self):
+        self.zxing = MagicMock()
+        patcher = patch.dict(sys.modules, {"zxingcpp": self.zxing})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "poster.jpg")
+        cv2.imwrite(self.path, np.full((1200, 1600), 200, dtype=np.uint8))
+
+    def found_at(self, width):
+        """zxing mock that only reads the code at or above a given width."""
+
+        def read_barcodes(image, **kwargs):
+            if image.shape[1] < width:
+                return []
+            result = MagicMock()
+            result.text = "WIFI:S:Poster;T:WPA;P:pass;;"
+            result.position.top_left.x = 10
+            result.position.top_left.y = 20
+            return [result]
+
+        return read_barcodes
+
+    def test_stops_at_first_reduced_level_with_a_code(self):
+        self.zxing.read_barcodes.side_effect = self.found_at(800)
+        scanner = QRCodeScanner()
+
+        self.assertEqual(scanner.scan_file(self.path), "WIFI:S:Poster;T:WPA;P:pass;;")
+
+        levels = scanner.last_stats["image_levels"]
+        self.assertEqual([level["scale"] for level in levels], [4, 2])
+        self.assertEqual([level["found"] for level in levels], [False, True])
+        # Points are mapped back to full-resolution pixels
+        self.assertEqual(scanner.last_result.codes[0].points[0, 0].tolist(), [20, 40])
+
+    def test_full_resolution_only_when_nothing_found(self):
+        self.zxing.read_barcodes.side_effect = self.found_at(1600)
+        scanner = QRCodeScanner()
+
+        codes = scanner.scan_file_codes(self.path)
+
+        self.assertEqual(codes[0].page, 1)
+        scales = [level["scale"] for level in scanner.last_stats["image_levels"]]
+        self.assertEqual(scales, [4, 2, 1])
+
+    def test_reduced_loading_can_be_disabled(self):
+        self.zxing.read_barcodes.side_effect = self.found_at(0)
+        scanner = QRCodeScanner(image_load_scales=(1,))
+
+        scanner.scan_file(self.path)
+
+        self.assertEqual(self.zxing.read_barcodes.call_args.args[0].shape, (1200, 1600))
+
+
+class TestInMemoryScan(unittest.TestCase):
+    def setUp(self):
+        self.zxing = MagicMock()
+        result = MagicMock()
+        result.text = "WIFI:S:Upload;T:WPA;P:pass;;"
+        self.zxing.read_barcodes.side_effect = lambda image, **kw: (
+            [result] if image.mean() > 128 else []
+        )
+        patcher = patch.dict(sys.modules, {"zxingcpp": self.zxing})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.image = np.full((400, 400), 200, dtype=np.uint8)
+
+    def test_scan_bytes_image(self):
+        _, png = cv2.imencode(".png", self.image)
+        scanner = QRCodeScanner()
+
+        self.assertEqual(
+            scanner.scan_bytes(memoryview(png.tobytes())),
+            "WIFI:S:Upload;T:WPA;P:pass;;",
+        )
+        self.assertIsNone(scanner.scan_bytes(b"not an image"))
+
+    def test_scan_bytes_pdf(self):
+        doc = fitz.open()
+        page = doc.new_page()
+        page.draw_rect(page.rect, fill=(1, 1, 1))
+        data = doc.tobytes()
+
+        scanner = QRCodeScanner(pdf_embedded_images=False)
+        self.assertEqual(scanner.scan_bytes(data), "WIFI:S:Upload;T:WPA;P:pass;;")
+        # An explicit content type overrides sniffing
+        self.assertIsNone(scanner.scan_bytes(data, mime="image/png"))
+
+    def test_scan_array(self):
+        scanner = QRCodeScanner()
+        bgr = cv2.cvtColor(self.image, cv2.COLOR_GRAY2BGR)
+        self.assertEqual(scanner.scan_array(bgr), "WIFI:S:Upload;T:WPA;P:pass;;")
+        self.assertIsNone(scanner.scan_array(np.zeros((400, 400), np.uint8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+from PIL import Image
+
+from qr_network.capture.luma import (
+    fourcc_to_str,
+    packed_yuv_luma,
+    pil_to_gray,
+    pixmap_to_gray,
+    to_gray,
+)
+
+
+class TestLuma(unittest.TestCase):
+    def test_to_gray_passes_gray_through(self):
+        frame = np.zeros((4, 4), dtype=np.uint8)
+        self.assertIs(to_gray(frame), frame)
+
+    def test_to_gray_reduces_bgr(self):
+        frame = np.full((4, 4, 3), 200, dtype=np.uint8)
+        gray = to_gray(frame)
+        self.assertEqual(gray.shape, (4, 4))
+        self.assertEqual(int(gray[0, 0]), 200)
+
+    def test_yuyv_luma_is_a_view(self):
+        """The Y plane of a YUYV buffer is every other byte, taken without copying."""
+        raw = np.arange(2 * 3 * 2, dtype=np.uint8).reshape(1, -1)
+        luma = packed_yuv_luma(raw, width=3, height=2, fourcc="YUYV")
+
+        self.assertEqual(luma.tolist(), [[0, 2, 4], [6, 8, 10]])
+        self.assertTrue(np.shares_memory(luma, raw))
+
+    def test_uyvy_luma_offset(self):
+        raw = np.arange(8, dtype=np.uint8)
+        luma = packed_yuv_luma(raw, width=2, height=2, fourcc="UYVY")
+        self.assertEqual(luma.tolist(), [[1, 3], [5, 7]])
+
+    def test_unsupported_or_mismatched_raw(self):
+        raw = np.zeros(8, dtype=np.uint8)
+        self.assertIsNone(packed_yuv_luma(raw, 2, 2, "MJPG"))
+        self.assertIsNone(packed_yuv_luma(raw, 4, 4, "YUYV"))
+
+    def test_fourcc_to_str(self):
+        value = ord("Y") | ord("U") << 8 | ord("Y") << 16 | ord("V") << 24
+        self.assertEqual(fourcc_to_str(float(value)), "YUYV")
+
+    def test_pil_to_gray(self):
+        image = Image.new("RGB", (5, 3), (255, 255, 255))
+        gray = pil_to_gray(image)
+        self.assertEqual(gray.shape, (3, 5))
+        self.assertEqual(gray.dtype, np.uint8)
+
+    def test_pixmap_to_gray_single_channel(self):
+        pix = MagicMock(w=4, h=2, n=1, samples=bytes(range(8)))
+        gray = pixmap_to_gray(pix)
+        self.assertEqual(gray.shape, (2, 4))
+        self.assertEqual(int(gray[1, 3]), 7)
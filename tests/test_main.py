@@ -18,3 +18,13 @@ class TestMain(unittest.TestCase):
         with patch.object(sys, "argv", ["qr-network"]):
             entry_point()
             mock_gui_main.assert_called_once()
+
+    @patch("qr_network.cli.app")
+    @patch("multiprocessing.freeze_support")
+    def test_entry_point_supports_frozen_workers(self, mock_freeze, mock_cli_app):
+        """Process-pool workers of a frozen build are dispatched before the CLI."""
+        mock_freeze.side_effect = lambda: mock_cli_app.assert_not_called()
+        with patch.object(sys, "argv", ["qr-network", "scan-files", "a.png"]):
+            entry_point()
+        mock_freeze.assert_called_once()
+        mock_cli_app.assert_called_once()
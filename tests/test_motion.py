@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from qr_network.capture.motion import ChangeDetector, DirtyRegionDetector
+
+
+def scene(value, shape=(480, 640, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+class TestChangeDetector(unittest.TestCase):
+    def test_first_frame_is_decoded(self):
+        self.assertTrue(ChangeDetector().should_decode(scene(10)))
+
+    def test_skips_unchanged_scene_after_miss(self):
+        """A static scene that already failed to decode is not decoded again."""
+        gate = ChangeDetector()
+        self.assertTrue(gate.should_decode(scene(10)))
+        gate.record_miss()
+
+        self.assertFalse(gate.should_decode(scene(11)))
+        self.assertFalse(gate.should_decode(scene(10)))
+        self.assertEqual(gate.frames_skipped, 2)
+
+    def test_decodes_when_scene_settles_on_new_content(self):
+        gate = ChangeDetector()
+        gate.should_decode(scene(10))
+        gate.record_miss()
+
+        # Large jump counts as motion, then the new scene holds still
+        gate.should_decode(scene(200))
+        self.assertTrue(gate.should_decode(scene(200)))
+        self.assertTrue(gate.should_decode(scene(200)))
+
+    def test_throttles_while_moving(self):
+        gate = ChangeDetector(moving_stride=3)
+        gate.should_decode(scene(0))
+        gate.record_miss()
+
+        decisions = [gate.should_decode(scene(v)) for v in (60, 120, 180, 240)]
+
+        self.assertEqual(decisions, [False, False, True, False])
+
+    def test_refresh_interval_forces_decode(self):
+        gate = ChangeDetector(refresh_interval=2.0)
+        with patch("qr_network.capture.motion.time.monotonic", return_value=100.0):
+            gate.should_decode(scene(10))
+            gate.record_miss()
+        with patch("qr_network.capture.motion.time.monotonic", return_value=103.0):
+            self.assertTrue(gate.should_decode(scene(10)))
+
+    def test_gray_frames_supported(self):
+        gate = ChangeDetector()
+        self.assertTrue(gate.should_decode(scene(10, shape=(480, 640))))
+
+
+class TestDirtyRegionDetector(unittest.TestCase):
+    def test_first_frame_is_dirty_as_a_whole(self):
+        detector = DirtyRegionDetector()
+        self.assertEqual(detector.update(scene(10)), [(0, 0, 640, 480)])
+
+    def test_static_frames_have_no_regions(self):
+        detector = DirtyRegionDetector()
+        detector.update(scene(10))
+        self.assertEqual(detector.update(scene(11)), [])
+
+    def test_reports_only_the_changed_area(self):
+        detector = DirtyRegionDetector(block=16, margin=1)
+        frame = scene(10, shape=(480, 640))
+        detector.update(frame)
+
+        frame = frame.copy()
+        frame[160:224, 320:384] = 255
+        regions = detector.update(frame)
+
+        self.assertEqual(len(regions), 1)
+        x, y, w, h = regions[0]
+        # The change plus one block of margin on every side
+        self.assertEqual((x, y, w, h), (304, 144, 96, 96))
+
+    def test_separate_changes_give_separate_regions(self):
+        detector = DirtyRegionDetector(margin=0)
+        frame = scene(10, shape=(480, 640))
+        detector.update(frame)
+
+        frame = frame.copy()
+        frame[0:32, 0:32] = 200
+        frame[400:448, 560:608] = 200
+
+        self.assertEqual(len(detector.update(frame)), 2)
+
+    def test_size_change_resets(self):
+        detector = DirtyRegionDetector()
+        detector.update(scene(10))
+        self.assertEqual(
+            detector.update(scene(10, shape=(240, 320))), [(0, 0, 320, 240)]
+        )
@@ -0,0 +1,173 @@
+import unittest
+
+import cv2
+import fitz
+import numpy as np
+
+from qr_network.capture.pdf import (
+    candidate_clips,
+    decode_page,
+    embedded_images,
+    page_tiles,
+    parse_pages,
+    points_scale,
+    render_page,
+)
+from qr_network.capture.results import DetectionResult, QRCode
+
+
+def make_page(doc, width=144, height=72):
+    return doc.new_page(width=width, height=height)
+
+
+class TestPdfRendering(unittest.TestCase):
+    def setUp(self):
+        self.doc = fitz.open()
+        self.addCleanup(self.doc.close)
+
+    def test_render_page_is_gray_without_alpha(self):
+        frame = render_page(make_page(self.doc), 72)
+
+        self.assertEqual(frame.dtype, np.uint8)
+        self.assertEqual(frame.shape, (72, 144))
+        self.assertEqual(render_page(make_page(self.doc), 144).shape, (144, 288))
+
+    def test_decode_page_escalates_until_found(self):
+        seen = []
+
+        def decode(frame):
+            seen.append(frame.shape)
+            if frame.shape[0] < 150:
+                return DetectionResult()
+            points = np.full((4, 1, 2), 150, dtype=np.float32)
+            return DetectionResult([QRCode("WIFI:S:Net;;", points)])
+
+        result, dpi = decode_page(make_page(self.doc), decode, (72, 150, 300))
+
+        self.assertEqual(dpi, 150)
+        self.assertEqual(seen, [(72, 144), (150, 300)])
+        # Points come back in PDF points
+        self.assertEqual(result.codes[0].points[0, 0].tolist(), [72, 72])
+
+    def test_decode_page_not_found(self):
+        result, dpi = decode_page(
+            make_page(self.doc), lambda frame: DetectionResult(), (72, 150)
+        )
+
+        self.assertFalse(result)
+        self.assertIsNone(dpi)
+        self.assertEqual(points_scale(300), 0.24)
+
+    def add_image(self, page, rect, shape=(40, 60)):
+        ok, png = cv2.imencode(".png", np.full(shape, 200, dtype=np.uint8))
+        page.insert_image(rect, stream=png.tobytes())
+
+    def test_embedded_images_native_resolution_and_placement(self):
+        page = make_page(self.doc, 300, 300)
+        self.add_image(page, fitz.Rect(30, 60, 150, 140))
+        self.add_image(page, fitz.Rect(0, 0, 10, 10), shape=(8, 8))  # too small
+
+        images = list(embedded_images(page))
+
+        self.assertEqual(len(images), 1)
+        image, scale, offset = images[0]
+        self.assertEqual(image.shape, (40, 60))
+        self.assertEqual(scale, (2.0, 2.0))
+        self.assertEqual(offset, (30, 60))
+
+    def test_decode_page_prefers_embedded_images(self):
+        page = make_page(self.doc, 300, 300)
+        self.add_image(page, fitz.Rect(30, 60, 150, 140))
+        seen = []
+
+        def decode(frame):
+            seen.append(frame.shape)
+            points = np.array([[[10, 20]]] * 4, dtype=np.float32)
+            return DetectionResult([QRCode("WIFI:S:Net;;", points)])
+
+        result, dpi = decode_page(page, decode, (72,))
+
+        self.assertEqual(dpi, "embedded")
+        self.assertEqual(seen, [(40, 60)])
+        self.assertEqual(result.codes[0].points[0, 0].tolist(), [50, 100])
+
+        seen.clear()
+        decode_page(page, decode, (72,), embedded=False)
+        self.assertEqual(seen, [(300, 300)])
+
+
+class TestClipRendering(unittest.TestCase):
+    def setUp(self):
+        self.doc = fitz.open()
+        self.addCleanup(self.doc.close)
+
+    def test_page_tiles_cover_page_within_budget(self):
+        rect = fitz.Rect(0, 0, 612, 792)
+
+        tiles = page_tiles(rect, 300, tile_pixels=512)
+
+        side = 512 * 72 / 300
+        self.assertTrue(all(t.width <= side + 1e-6 for t in tiles))
+        self.assertTrue(all(t.height <= side + 1e-6 for t in tiles))
+        self.assertEqual(tiles[0].top_left, rect.top_left)
+        self.assertEqual(tiles[-1].bottom_right, rect.bottom_right)
+
+    def test_candidate_clips_grow_and_stay_on_page(self):
+        rect = fitz.Rect(0, 0, 200, 200)
+        points = np.array([[[10, 10]], [[30, 10]], [[30, 30]], [[10, 30]]], np.float32)
+
+        clips = candidate_clips([points], 2.0, rect, margin=0.5)
+
+        self.assertEqual(clips, [fitz.Rect(0, 0, 80, 80)])
+
+    def test_clip_mode_renders_candidate_region_only(self):
+        page = make_page(self.doc, 600, 600)
+        located = np.array([[[100, 100]], [[120, 100]], [[120, 120]], [[100, 120]]])
+        seen = []
+
+        def decode(frame):
+            seen.append(frame.shape)
+            if frame.shape == (600, 600):
+                return DetectionResult(candidates=[located.astype(np.float32)])
+            points = np.full((4, 1, 2), 20, dtype=np.float32)
+            return DetectionResult([QRCode("WIFI:S:Net;;", points)])
+
+        result, dpi = decode_page(page, decode, (72, 144), embedded=False, clip=True)
+
+        self.assertEqual(dpi, 144)
+        # Full page at 72 DPI, then only the 40x40 pt clip at 144 DPI
+        self.assertEqual(seen, [(600, 600), (80, 80)])
+        self.assertEqual(result.codes[0].points[0, 0].tolist(), [100, 100])
+
+    def test_clip_mode_falls_back_to_tiles(self):
+        page = make_page(self.doc, 600, 600)
+        seen = []
+
+        def decode(frame):
+            seen.append(frame.shape)
+            return DetectionResult()
+
+        result, dpi = decode_page(page, decode, (72, 300), embedded=False, clip=True)
+
+        self.assertFalse(result)
+        self.assertIsNone(dpi)
+        self.assertGreater(len(seen), 2)
+        self.assertTrue(all(max(shape) <= 1024 for shape in seen[1:]))
+
+
+class TestParsePages(unittest.TestCase):
+    def test_selections(self):
+        self.assertEqual(parse_pages(None, 3), [1, 2, 3])
+        self.assertEqual(parse_pages("all", 2), [1, 2])
+        self.assertEqual(parse_pages("2-3, 6", 6), [2, 3, 6])
+        self.assertEqual(parse_pages("5-", 7), [5, 6, 7])
+        self.assertEqual(parse_pages(range(2, 4), 5), [2, 3])
+
+    def test_invalid_selections(self):
+        for pages in ("0", "4", "a-b", ""):
+            with self.assertRaises(ValueError):
+                parse_pages(pages, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import importlib
+import pickle
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from qr_network.capture.profiles import PRESETS, DecoderProfile, get_profile
+
+
+def import_real_zxing():
+    """The installed zxingcpp, even when another test module mocked it."""
+    saved = sys.modules.pop("zxingcpp", None)
+    try:
+        return importlib.import_module("zxingcpp")
+    except ImportError:
+        return None
+    finally:
+        if saved is not None:
+            sys.modules["zxingcpp"] = saved
+
+
+class TestDecoderProfile(unittest.TestCase):
+    def setUp(self):
+        self.zxing = MagicMock()
+        patcher = patch.dict(sys.modules, {"zxingcpp": self.zxing})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_presets_resolve(self):
+        for name in ("default", "fast-camera", "thorough-file", "low-contrast"):
+            self.assertIn(name, PRESETS)
+            self.assertEqual(get_profile(name).name, name)
+
+    def test_unknown_preset(self):
+        with self.assertRaises(ValueError) as cm:
+            get_profile("ultra")
+        self.assertIn("fast-camera", str(cm.exception))
+
+    def test_instance_passes_through(self):
+        profile = DecoderProfile(name="custom")
+        self.assertIs(get_profile(profile), profile)
+
+    def test_options_built_once(self):
+        """Reader options are resolved on first use and reused afterwards."""
+        profile = get_profile("fast-camera")
+
+        options = profile.options
+
+        self.assertIs(profile.options, options)
+        self.assertIs(options["formats"], self.zxing.BarcodeFormat.QRCode)
+        self.assertIs(options["binarizer"], self.zxing.Binarizer.LocalAverage)
+        self.assertFalse(options["try_rotate"])
+        self.assertFalse(options["try_invert"])
+
+    def test_read_barcodes_passes_options(self):
+        profile = get_profile("low-contrast")
+        profile.read_barcodes("frame", return_errors=True)
+
+        kwargs = self.zxing.read_barcodes.call_args.kwargs
+        self.assertTrue(kwargs["return_errors"])
+        self.assertIs(kwargs["binarizer"], self.zxing.Binarizer.GlobalHistogram)
+
+    def test_bgra_frames_are_read_in_place(self):
+        """Screen captures reach zxing as an ImageView over the same buffer."""
+        profile = get_profile("thorough-file")
+        frame = np.zeros((4, 6, 4), dtype=np.uint8)
+
+        profile.read_barcodes(frame)
+
+        self.zxing.ImageView.assert_called_once_with(
+            frame, 6, 4, self.zxing.ImageFormat.BGRA
+        )
+        self.assertIs(
+            self.zxing.read_barcodes.call_args.args[0],
+            self.zxing.ImageView.return_value,
+        )
+
+    def test_strided_bgra_and_gray_frames(self):
+        profile = get_profile("thorough-file")
+        gray = np.zeros((4, 6), dtype=np.uint8)
+        profile.read_barcodes(gray)
+        self.assertIs(self.zxing.read_barcodes.call_args.args[0], gray)
+
+        # A crop of a capture can't be wrapped; it is reduced to luminance
+        profile.read_barcodes(np.zeros((8, 8, 4), dtype=np.uint8)[2:6, 1:7])
+        self.assertEqual(self.zxing.read_barcodes.call_args.args[0].shape, (4, 6))
+        self.zxing.ImageView.assert_not_called()
+
+    def test_bgra_without_image_view(self):
+        """A zxing-cpp without ImageView still gets BGRA frames, as luminance."""
+        del self.zxing.ImageView
+        profile = get_profile("thorough-file")
+
+        profile.read_barcodes(np.zeros((4, 6, 4), dtype=np.uint8))
+
+        self.assertEqual(self.zxing.read_barcodes.call_args.args[0].shape, (4, 6))
+
+    def test_pickle_drops_resolved_options(self):
+        """Profiles travel to process workers without zxing objects."""
+        profile = get_profile("thorough-file")
+        profile.options
+
+        clone = pickle.loads(pickle.dumps(profile))
+
+        self.assertIsNone(clone._options)
+        self.assertEqual(clone.formats, ("QRCode", "MicroQRCode"))
+
+
+class TestRealZxing(unittest.TestCase):
+    """Runs the presets against the installed zxing-cpp, not a mock."""
+
+    def setUp(self):
+        zxing = import_real_zxing()
+        if zxing is None:
+            self.skipTest("zxing-cpp is not installed")
+        patcher = patch.dict(sys.modules, {"zxingcpp": zxing})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        code = zxing.create_barcode(
+            "WIFI:S:Net;T:WPA;P:secret;;", zxing.BarcodeFormat.QRCode
+        )
+        image = np.asarray(code.to_image(scale=6))
+        self.gray = np.full((image.shape[0] + 80, image.shape[1] + 80), 255, np.uint8)
+        self.gray[40:-40, 40:-40] = image
+
+    def test_every_preset_decodes(self):
+        for name in PRESETS:
+            with self.subTest(profile=name):
+                profile = get_profile(name)
+                self.assertEqual(
+                    profile.decode_text(self.gray), "WIFI:S:Net;T:WPA;P:secret;;"
+                )
+
+    def test_bgra_frame_decodes(self):
+        import cv2
+
+        bgra = cv2.cvtColor(self.gray, cv2.COLOR_GRAY2BGRA)
+        result = get_profile("thorough-file").decode(bgra)
+
+        self.assertEqual(result.text, "WIFI:S:Net;T:WPA;P:secret;;")
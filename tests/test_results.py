@@ -0,0 +1,83 @@
+import pickle
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from qr_network.capture.results import DetectionResult, QRCode, position_to_points
+
+
+def make_position(x, y, size):
+    point = lambda px, py: SimpleNamespace(x=px, y=py)  # noqa: E731
+    return SimpleNamespace(
+        top_left=point(x, y),
+        top_right=point(x + size, y),
+        bottom_right=point(x + size, y + size),
+        bottom_left=point(x, y + size),
+    )
+
+
+def make_zxing_result(text, x=0, y=0, size=10):
+    return SimpleNamespace(
+        text=text,
+        position=make_position(x, y, size),
+        format="QR Code",
+        orientation=90,
+        ec_level="Q",
+    )
+
+
+class TestDetectionResult(unittest.TestCase):
+    def test_position_to_points(self):
+        points = position_to_points(make_position(10, 20, 5))
+
+        self.assertEqual(points.shape, (4, 1, 2))
+        self.assertEqual(points[2, 0].tolist(), [15, 25])
+        self.assertIsNone(position_to_points(None))
+
+    def test_from_zxing_keeps_all_codes_and_metadata(self):
+        result = DetectionResult.from_zxing(
+            [
+                make_zxing_result("WIFI:S:One;;"),
+                make_zxing_result("https://example.com", x=50),
+                make_zxing_result("WIFI:S:One;;", x=100),
+                make_zxing_result("", x=200),
+            ]
+        )
+
+        self.assertEqual(result.texts, ["WIFI:S:One;;", "https://example.com"])
+        self.assertEqual(len(result.candidates), 1)
+        code = result.codes[1]
+        self.assertEqual(code.format, "QR Code")
+        self.assertEqual(code.orientation, 90)
+        self.assertEqual(code.ec_level, "Q")
+        self.assertEqual(code.points[0, 0].tolist(), [50, 0])
+        self.assertEqual([c.text for c in result.wifi_codes()], ["WIFI:S:One;;"])
+
+    def test_first(self):
+        self.assertEqual(DetectionResult().first(), (None, None))
+        result = DetectionResult.from_zxing([make_zxing_result("A")])
+        text, points = result.first()
+        self.assertEqual(text, "A")
+        self.assertEqual(points.shape, (4, 1, 2))
+        self.assertTrue(result)
+        self.assertFalse(DetectionResult())
+
+    def test_transformed_maps_back_to_source(self):
+        result = DetectionResult.from_zxing([make_zxing_result("A", 10, 10, 10)])
+
+        mapped = result.transformed(scale=2, offset=(100, 50), page=3)
+
+        self.assertEqual(mapped.codes[0].points[0, 0].tolist(), [120, 70])
+        self.assertEqual(mapped.codes[0].page, 3)
+        # The original is left untouched
+        self.assertEqual(result.codes[0].points[0, 0].tolist(), [10, 10])
+        self.assertIsNone(result.codes[0].page)
+
+    def test_pickles(self):
+        result = DetectionResult([QRCode("A", np.zeros((4, 1, 2), np.float32))])
+        self.assertEqual(pickle.loads(pickle.dumps(result)).texts, ["A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+from qr_network.capture.roi import ROITracker
+
+
+class TestROITracker(unittest.TestCase):
+    def test_full_frame_without_roi(self):
+        tracker = ROITracker()
+        frame = np.zeros((480, 640), dtype=np.uint8)
+
+        view, offset = tracker.crop(frame)
+
+        self.assertIs(view, frame)
+        self.assertEqual(offset, (0, 0))
+
+    def test_hit_crops_around_points_with_margin(self):
+        """The region covers the code plus the margin and is clamped to the frame."""
+        tracker = ROITracker(margin=0.5)
+        frame = np.zeros((480, 640), dtype=np.uint8)
+        points = np.array(
+            [[[100, 100]], [[200, 100]], [[200, 200]], [[100, 200]]], dtype=np.float32
+        )
+
+        tracker.hit(points, frame.shape)
+        view, offset = tracker.crop(frame)
+
+        self.assertEqual(tracker.roi, (50, 50, 250, 250))
+        self.assertEqual(offset, (50, 50))
+        self.assertEqual(view.shape, (200, 200))
+
+    def test_falls_back_after_max_misses(self):
+        tracker = ROITracker(max_misses=2)
+        tracker.hit([[10, 10], [20, 20]], (100, 100))
+
+        tracker.miss()
+        self.assertIsNotNone(tracker.roi)
+        tracker.miss()
+        self.assertIsNone(tracker.roi)
@@ -1,8 +1,11 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
+import time
+import cv2
 import numpy as np
 from qr_network.capture.scanner import QRCodeScanner
+from qr_network.capture.results import DetectionResult, QRCode
 
 # Mock zxingcpp before tests run
 sys.modules["zxingcpp"] = MagicMock()
@@ -60,7 +63,12 @@ class TestQRCodeScanner(unittest.TestCase):
         text, points = scanner.detect_qr(dummy_frame)
 
         self.assertEqual(text, "WIFI:S:TestNet;T:WPA;P:pass;;")
-        sys.modules["zxingcpp"].read_barcodes.assert_called_once_with(dummy_frame)
+        zxing = sys.modules["zxingcpp"]
+        zxing.read_barcodes.assert_called_once()
+        args, kwargs = zxing.read_barcodes.call_args
+        self.assertIs(args[0], dummy_frame)
+        # Default profile restricts zxing to QR codes
+        self.assertIs(kwargs["formats"], zxing.BarcodeFormat.QRCode)
 
     @patch("cv2.VideoCapture")
     def test_process_frame_no_qr(self, mock_cap_cls):
@@ -90,8 +98,9 @@ class TestQRCodeScanner(unittest.TestCase):
         mock_cap.release.assert_called_once()
         self.assertIsNone(scanner.cap)
 
+    @patch("qr_network.capture.scanner.list_monitors", return_value=[])
     @patch("PIL.ImageGrab.grab")
-    def test_scan_screen_success(self, mock_grab):
+    def test_scan_screen_success(self, mock_grab, mock_monitors):
         """Test scanning from screen successfully."""
         setup_mock_zxing()  # Ensure zxing mock is ready
 
@@ -99,10 +108,12 @@ class TestQRCodeScanner(unittest.TestCase):
 
         # Mock ImageGrab returning an image
         mock_image = MagicMock()
-        # Create a tiny numpy array to represent the image
-        mock_image_np = np.zeros((100, 100, 3), dtype=np.uint8)
-        # When __array__ is called, return the numpy array
-        mock_image.__array__ = MagicMock(return_value=mock_image_np)
+        # Create a tiny numpy array to represent the luminance image
+        mock_image_np = np.zeros((100, 100), dtype=np.uint8)
+        # When __array__ is called on the converted image, return the numpy array
+        mock_image.convert.return_value.__array__ = MagicMock(
+            return_value=mock_image_np
+        )
 
         mock_grab.return_value = mock_image
 
@@ -115,6 +126,112 @@ class TestQRCodeScanner(unittest.TestCase):
 
         self.assertEqual(result, "WIFI:S:ScreenNet;T:WPA;P:pass;;")
         mock_grab.assert_called()
+        mock_image.convert.assert_called_once_with("L")
+
+    @patch("qr_network.capture.scanner.grab_monitor")
+    @patch("qr_network.capture.scanner.list_monitors")
+    def test_scan_screen_per_monitor(self, mock_monitors, mock_grab):
+        """Each monitor is captured separately and hits map to desktop coords."""
+        setup_mock_zxing()
+        mock_monitors.return_value = [
+            {"left": 0, "top": 0, "width": 100, "height": 100},
+            {"left": 100, "top": 0, "width": 100, "height": 100},
+        ]
+        mock_grab.side_effect = lambda monitor, gray: np.full(
+            (100, 100), monitor["left"], dtype=np.uint8
+        )
+
+        def read_barcodes(image, **kwargs):
+            if image.mean() < 50:
+                return []
+            result = MagicMock()
+            result.text = "WIFI:S:Second;T:WPA;P:pass;;"
+            set_mock_position(result, 10, 20, 30)
+            return [result]
+
+        sys.modules["zxingcpp"].read_barcodes.side_effect = read_barcodes
+        try:
+            scanner = QRCodeScanner()
+            result = scanner.scan_screen()
+        finally:
+            sys.modules["zxingcpp"].read_barcodes.side_effect = None
+
+        self.assertEqual(result, "WIFI:S:Second;T:WPA;P:pass;;")
+        self.assertEqual(mock_grab.call_count, 2)
+        self.assertEqual(scanner.last_result.codes[0].points[0, 0].tolist(), [110, 20])
+        hits = [m for m in scanner.last_stats["monitors"] if m["found"]]
+        self.assertEqual([m["index"] for m in hits], [1])
+
+    @patch("qr_network.capture.scanner.grab_monitor")
+    @patch("qr_network.capture.scanner.list_monitors")
+    def test_scan_screen_index(self, mock_monitors, mock_grab):
+        """screen_index limits the scan to one monitor."""
+        setup_mock_zxing()
+        monitors = [
+            {"left": 0, "top": 0, "width": 100, "height": 100},
+            {"left": 100, "top": 0, "width": 100, "height": 100},
+        ]
+        mock_monitors.return_value = monitors
+        mock_grab.return_value = np.zeros((100, 100), dtype=np.uint8)
+        sys.modules["zxingcpp"].read_barcodes.return_value = []
+
+        scanner = QRCodeScanner()
+
+        self.assertIsNone(scanner.scan_screen(screen_index=1))
+        mock_grab.assert_called_once_with(monitors[1], gray=True)
+        self.assertEqual(scanner.last_stats["monitors"][0]["index"], 1)
+
+        mock_grab.reset_mock()
+        self.assertIsNone(scanner.scan_screen(screen_index=5))
+        mock_grab.assert_not_called()
+
+    @patch("qr_network.capture.scanner.grab_monitor")
+    @patch("qr_network.capture.scanner.list_monitors")
+    def test_scan_screen_zero_copy(self, mock_monitors, mock_grab):
+        """screen_zero_copy decodes the BGRA capture unless a pool needs tiles."""
+        setup_mock_zxing()
+        monitors = [{"left": 0, "top": 0, "width": 100, "height": 100}]
+        mock_monitors.return_value = monitors
+        mock_grab.return_value = np.zeros((100, 100), dtype=np.uint8)
+        sys.modules["zxingcpp"].read_barcodes.return_value = []
+
+        QRCodeScanner(screen_zero_copy=True).scan_screen()
+        mock_grab.assert_called_once_with(monitors[0], gray=False)
+
+        mock_grab.reset_mock()
+        scanner = QRCodeScanner(screen_zero_copy=True, decode_workers=2)
+        try:
+            scanner.scan_screen()
+        finally:
+            scanner.close()
+        mock_grab.assert_called_once_with(monitors[0], gray=True)
+
+    @patch("qr_network.capture.scanner.time.sleep")
+    @patch("qr_network.capture.scanner.ScreenWatcher")
+    def test_watch_screen_polls_until_wifi_code(self, MockWatcher, mock_sleep):
+        """watch_screen keeps polling and returns the first WiFi code."""
+        watcher = MockWatcher.return_value
+        watcher.poll.side_effect = [
+            DetectionResult(),
+            DetectionResult([QRCode("https://example.com")]),
+            DetectionResult([QRCode("WIFI:S:Watched;T:WPA;P:pass;;")]),
+        ]
+        watcher.stats.return_value = {"watch_polls": 3}
+
+        scanner = QRCodeScanner()
+        result = scanner.watch_screen(interval=0.5, screen_index=1)
+
+        self.assertEqual(result, "WIFI:S:Watched;T:WPA;P:pass;;")
+        MockWatcher.assert_called_once_with(scanner, 1)
+        self.assertEqual(watcher.poll.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(scanner.last_stats, {"watch_polls": 3})
+
+    @patch("qr_network.capture.scanner.ScreenWatcher")
+    def test_watch_screen_bad_monitor(self, MockWatcher):
+        MockWatcher.return_value.poll.side_effect = ValueError("Screen 5 not found")
+
+        self.assertIsNone(QRCodeScanner().watch_screen(timeout=1))
 
     @patch("os.path.exists")
     @patch("cv2.imread")
@@ -137,7 +254,7 @@ class TestQRCodeScanner(unittest.TestCase):
         result = scanner.scan_file("test.png")
 
         self.assertEqual(result, "WIFI:S:FileNet;T:WPA;P:pass;;")
-        mock_imread.assert_called_with("test.png")
+        mock_imread.assert_called_with("test.png", cv2.IMREAD_GRAYSCALE)
 
     @patch("os.path.exists")
     @patch("fitz.open")
@@ -174,6 +291,37 @@ class TestQRCodeScanner(unittest.TestCase):
         self.assertEqual(result, "WIFI:S:PDFNet;T:WPA;P:pass;;")
         mock_fitz_open.assert_called_with("test.pdf")
 
+    @patch("os.path.exists")
+    @patch("fitz.open")
+    def test_scan_file_pdf_escalates_dpi(self, mock_fitz_open, mock_exists):
+        """PDF pages are re-rendered at the next DPI only after a miss."""
+        setup_mock_zxing()
+        mock_exists.return_value = True
+        mock_doc = MagicMock()
+        mock_doc.page_count = 1
+        mock_page = mock_doc.load_page.return_value
+        mock_fitz_open.return_value = mock_doc
+        mock_pix = mock_page.get_pixmap.return_value
+        mock_pix.h, mock_pix.w, mock_pix.n = 10, 10, 1
+        mock_pix.samples = bytes(100)
+
+        mock_result = MagicMock()
+        mock_result.text = "WIFI:S:PDFNet;T:WPA;P:pass;;"
+        sys.modules["zxingcpp"].read_barcodes.side_effect = [[], [mock_result]]
+
+        scanner = QRCodeScanner(pdf_dpi_ladder=(72, 200))
+        try:
+            result = scanner.scan_file("test.pdf")
+        finally:
+            sys.modules["zxingcpp"].read_barcodes.side_effect = None
+
+        self.assertEqual(result, "WIFI:S:PDFNet;T:WPA;P:pass;;")
+        dpis = [c.kwargs["dpi"] for c in mock_page.get_pixmap.call_args_list]
+        self.assertEqual(dpis, [72, 200])
+        self.assertFalse(mock_page.get_pixmap.call_args.kwargs["alpha"])
+        self.assertEqual(scanner.last_stats["pdf_dpi"], 200)
+        mock_doc.close.assert_called_once()
+
     @patch("os.path.exists")
     def test_scan_file_not_found(self, mock_exists):
         """Test scanning a non-existent file."""
@@ -182,6 +330,312 @@ class TestQRCodeScanner(unittest.TestCase):
         result = scanner.scan_file("nonexistent.png")
         self.assertIsNone(result)
 
+    @patch("cv2.VideoCapture")
+    def test_scan_one_threaded_reports_stats(self, mock_cap_cls):
+        """Threaded capture decodes the newest frame and records frame stats."""
+        setup_mock_zxing()
+        mock_cap = MagicMock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.read.return_value = (True, np.zeros((10, 10, 3), dtype=np.uint8))
+        mock_cap_cls.return_value = mock_cap
+
+        mock_result = MagicMock()
+        mock_result.text = "WIFI:S:ThreadNet;T:WPA;P:pass;;"
+        sys.modules["zxingcpp"].read_barcodes.return_value = [mock_result]
+
+        scanner = QRCodeScanner(threaded=True)
+        result = scanner.scan_one(timeout=2.0, show_window=False)
+
+        self.assertEqual(result, "WIFI:S:ThreadNet;T:WPA;P:pass;;")
+        self.assertIsNone(scanner.capture_thread)
+        self.assertGreaterEqual(scanner.last_stats["frames_captured"], 1)
+        self.assertIn("frames_dropped", scanner.last_stats)
+        self.assertIn("detection_latency", scanner.last_stats)
+        mock_cap.release.assert_called_once()
+
+    @patch("cv2.destroyAllWindows")
+    @patch("cv2.waitKey", return_value=-1)
+    @patch("cv2.imshow")
+    @patch("cv2.VideoCapture")
+    def test_scan_one_preview_with_raw_yuyv_frames(self, mock_cap_cls, mock_imshow, *_):
+        """The preview can outline a code found in a strided YUYV luma view."""
+        width, height = 8, 6
+        props = {
+            cv2.CAP_PROP_FOURCC: cv2.VideoWriter_fourcc(*"YUYV"),
+            cv2.CAP_PROP_FRAME_WIDTH: width,
+            cv2.CAP_PROP_FRAME_HEIGHT: height,
+        }
+        mock_cap = MagicMock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.get.side_effect = lambda prop: props.get(prop, 0)
+        mock_cap.set.return_value = True
+        raw = np.zeros((1, width * height * 2), dtype=np.uint8)
+        mock_cap.read.return_value = (True, raw)
+        mock_cap_cls.return_value = mock_cap
+
+        scanner = QRCodeScanner(grayscale=True)
+        points = np.array([[[1, 1]], [[6, 1]], [[6, 4]], [[1, 4]]])
+        with patch.object(
+            scanner, "detect_tracked", return_value=("WIFI:S:Y;;", points)
+        ) as detect:
+            result = scanner.scan_one(timeout=2.0, show_window=True)
+
+        self.assertEqual(result, "WIFI:S:Y;;")
+        self.assertEqual(detect.call_args.args[0].shape, (height, width))
+        shown = mock_imshow.call_args.args[1]
+        self.assertEqual(shown.shape, (height, width, 3))
+        self.assertEqual(tuple(shown[1, 3]), (0, 255, 0))
+
+    @patch("cv2.VideoCapture")
+    def test_scan_one_keeps_every_code(self, mock_cap_cls):
+        """Camera scans leave all codes of the hit frame in last_result."""
+        setup_mock_zxing()
+        mock_cap = MagicMock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.read.return_value = (True, np.zeros((10, 10, 3), dtype=np.uint8))
+        mock_cap_cls.return_value = mock_cap
+        results = []
+        for name in ("One", "Two"):
+            result = MagicMock()
+            result.text = f"WIFI:S:{name};;"
+            set_mock_position(result, 1, 1, 5)
+            results.append(result)
+        sys.modules["zxingcpp"].read_barcodes.return_value = results
+
+        for options in ({}, {"roi_tracking": True}, {"decode_workers": 1}):
+            scanner = QRCodeScanner(**options)
+            try:
+                text = scanner.scan_one(timeout=2.0, show_window=False)
+            finally:
+                scanner.close()
+
+            self.assertEqual(text, "WIFI:S:One;;")
+            self.assertEqual(
+                scanner.last_result.texts, ["WIFI:S:One;;", "WIFI:S:Two;;"]
+            )
+
+    @patch("os.path.exists")
+    @patch("cv2.imread")
+    def test_scan_file_with_decode_pool(self, mock_imread, mock_exists):
+        """A decode pool splits the image into tiles and returns the first hit."""
+        setup_mock_zxing()
+        mock_exists.return_value = True
+        mock_imread.return_value = np.zeros((100, 100, 3), dtype=np.uint8)
+
+        mock_result = MagicMock()
+        mock_result.text = "WIFI:S:PoolNet;T:WPA;P:pass;;"
+        sys.modules["zxingcpp"].read_barcodes.return_value = [mock_result]
+
+        scanner = QRCodeScanner(decode_workers=2)
+        try:
+            result = scanner.scan_file("test.png")
+        finally:
+            scanner.close()
+
+        self.assertEqual(result, "WIFI:S:PoolNet;T:WPA;P:pass;;")
+        sys.modules["zxingcpp"].read_barcodes.assert_called()
+
+    def test_detect_qr_returns_points(self):
+        """detect_qr returns the code corners as OpenCV style points."""
+        setup_mock_zxing()
+        mock_result = MagicMock()
+        mock_result.text = "WIFI:S:PosNet;T:WPA;P:pass;;"
+        set_mock_position(mock_result, 10, 20, 50)
+        sys.modules["zxingcpp"].read_barcodes.return_value = [mock_result]
+
+        scanner = QRCodeScanner()
+        text, points = scanner.detect_qr(np.zeros((100, 100, 3), dtype=np.uint8))
+
+        self.assertEqual(text, "WIFI:S:PosNet;T:WPA;P:pass;;")
+        self.assertEqual(points.shape, (4, 1, 2))
+        self.assertEqual(points[2][0].tolist(), [60.0, 70.0])
+
+    def test_detect_tracked_crops_to_candidate(self):
+        """After a candidate is located, the next decode only sees its region."""
+        setup_mock_zxing()
+        candidate = MagicMock()
+        candidate.text = ""
+        set_mock_position(candidate, 400, 300, 100)
+        sys.modules["zxingcpp"].read_barcodes.return_value = [candidate]
+
+        scanner = QRCodeScanner(roi_tracking=True)
+        frame = np.zeros((1080, 1920), dtype=np.uint8)
+
+        text, points = scanner.detect_tracked(frame)
+        self.assertIsNone(text)
+        self.assertIsNotNone(points)
+
+        sys.modules["zxingcpp"].read_barcodes.return_value = []
+        scanner.detect_tracked(frame)
+
+        cropped = sys.modules["zxingcpp"].read_barcodes.call_args[0][0]
+        self.assertEqual(cropped.shape, (200, 200))
+
+    def test_multiscale_stops_at_coarse_level(self):
+        """A hit on the downscaled level skips the full-resolution decode."""
+        setup_mock_zxing()
+        mock_result = MagicMock()
+        mock_result.text = "WIFI:S:SmallNet;T:WPA;P:pass;;"
+        set_mock_position(mock_result, 10, 10, 100)
+        sys.modules["zxingcpp"].read_barcodes.return_value = [mock_result]
+
+        scanner = QRCodeScanner(multiscale=True)
+        frame = np.zeros((2048, 2048, 3), dtype=np.uint8)
+        text, points = scanner.detect_qr_multiscale(frame)
+
+        self.assertEqual(text, "WIFI:S:SmallNet;T:WPA;P:pass;;")
+        decoded = sys.modules["zxingcpp"].read_barcodes.call_args[0][0]
+        self.assertEqual(decoded.shape, (512, 512))
+        # Points are mapped back to full-resolution coordinates
+        self.assertEqual(points[2][0].tolist(), [440.0, 440.0])
+        self.assertEqual(len(scanner.last_pyramid), 1)
+        self.assertEqual(scanner.last_pyramid[0]["scale"], 4)
+
+    def test_multiscale_falls_back_to_full_resolution(self):
+        """Every level is tried and timed when the coarse passes fail."""
+        setup_mock_zxing()
+        sys.modules["zxingcpp"].read_barcodes.return_value = []
+
+        scanner = QRCodeScanner(multiscale=True)
+        text, _ = scanner.detect_qr_multiscale(np.zeros((1024, 1024), dtype=np.uint8))
+
+        self.assertIsNone(text)
+        self.assertEqual([lvl["scale"] for lvl in scanner.last_pyramid], [4, 2, 1])
+        self.assertTrue(all(lvl["seconds"] >= 0 for lvl in scanner.last_pyramid))
+
+    def test_large_frames_are_tiled(self):
+        """Above the pixel threshold, tiles are decoded and merged in frame coords."""
+        setup_mock_zxing()
+        frame = np.zeros((1000, 1200), dtype=np.uint8)
+        # Straddles the x=512 edge of the first tile
+        frame[100:140, 500:540] = 255
+
+        def read_barcodes(image, **kwargs):
+            ys, xs = np.nonzero(image)
+            if image.shape != (512, 512) or not len(xs):
+                return []
+            result = MagicMock()
+            # A sliced code misreads
+            whole = xs.max() - xs.min() + 1 == 40
+            result.text = "WIFI:S:Whole;;" if whole else "WIFI:S:Cut;;"
+            set_mock_position(result, xs.min(), ys.min(), xs.max() - xs.min())
+            return [result]
+
+        sys.modules["zxingcpp"].read_barcodes.side_effect = read_barcodes
+        try:
+            scanner = QRCodeScanner(tile_threshold=1_000_000, tile_code_size=128)
+            result = scanner._detect(frame)
+            self.assertFalse(QRCodeScanner(tile_code_size=128)._wants_tiles(frame))
+        finally:
+            sys.modules["zxingcpp"].read_barcodes.side_effect = None
+
+        self.assertEqual(result.texts, ["WIFI:S:Whole;;"])
+        self.assertEqual(result.codes[0].points[0, 0].tolist(), [500, 100])
+        self.assertEqual(scanner.last_tiles["tiles"], 9)
+
+    @patch("os.path.exists", return_value=True)
+    @patch("cv2.imread")
+    def test_scan_file_tiles_through_decode_pool(self, mock_imread, mock_exists):
+        """With a pool, a large image is tiled rather than decoded whole."""
+        setup_mock_zxing()
+        mock_imread.return_value = np.zeros((1000, 1200), dtype=np.uint8)
+        mock_result = MagicMock()
+        mock_result.text = "WIFI:S:Tiled;T:WPA;P:pass;;"
+        set_mock_position(mock_result, 10, 10, 30)
+        sys.modules["zxingcpp"].read_barcodes.return_value = [mock_result]
+
+        scanner = QRCodeScanner(
+            decode_workers=2, tile_threshold=1_000_000, tile_code_size=128
+        )
+        try:
+            result = scanner.scan_file("poster.jpg")
+        finally:
+            scanner.close()
+
+        self.assertEqual(result, "WIFI:S:Tiled;T:WPA;P:pass;;")
+        shapes = {
+            call.args[0].shape
+            for call in sys.modules["zxingcpp"].read_barcodes.call_args_list
+        }
+        # 9 full-resolution tiles plus one 2x downscaled pass
+        self.assertEqual(sys.modules["zxingcpp"].read_barcodes.call_count, 10)
+        self.assertEqual(shapes, {(512, 512), (500, 600)})
+        self.assertEqual(scanner.last_stats["tiles"]["tiles"], 9)
+
+    def pooled_two_code_scan(self, full_frame_finds):
+        """scan_array with a pool on a frame with one code in each corner."""
+        setup_mock_zxing()
+        frame = np.zeros((200, 200), dtype=np.uint8)
+        frame[20:40, 20:40] = 200
+        frame[160:180, 160:180] = 100
+
+        def read_barcodes(image, **kwargs):
+            full = image.shape == frame.shape
+            if full:
+                # The whole frame is slower than any tile
+                time.sleep(0.2)
+                if not full_frame_finds:
+                    return []
+            results = []
+            for value in (200, 100):
+                ys, xs = np.nonzero(image == value)
+                if len(xs) == 400:
+                    result = MagicMock()
+                    result.text = f"WIFI:S:Net{value};;"
+                    set_mock_position(result, xs.min(), ys.min(), 19)
+                    results.append(result)
+            return results
+
+        sys.modules["zxingcpp"].read_barcodes.side_effect = read_barcodes
+        scanner = QRCodeScanner(decode_workers=4)
+        try:
+            scanner.scan_array(frame)
+        finally:
+            sys.modules["zxingcpp"].read_barcodes.side_effect = None
+            scanner.close()
+        return scanner.last_result
+
+    def test_pool_tile_hit_waits_for_full_frame(self):
+        """A tile holding one of two codes doesn't hide the other one."""
+        result = self.pooled_two_code_scan(full_frame_finds=True)
+
+        self.assertEqual(sorted(result.texts), ["WIFI:S:Net100;;", "WIFI:S:Net200;;"])
+
+    def test_pool_merges_tile_hits(self):
+        """Codes only the tiles could read are merged, in frame coordinates."""
+        result = self.pooled_two_code_scan(full_frame_finds=False)
+
+        self.assertEqual(sorted(result.texts), ["WIFI:S:Net100;;", "WIFI:S:Net200;;"])
+        points = {code.text: code.points[0, 0].tolist() for code in result.codes}
+        self.assertEqual(points["WIFI:S:Net100;;"], [160, 160])
+
+    def test_change_gating_skips_static_scene(self):
+        """A static scene that failed to decode is not decoded again."""
+        setup_mock_zxing()
+        sys.modules["zxingcpp"].read_barcodes.return_value = []
+
+        scanner = QRCodeScanner(change_gating=True)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        scanner.detect_tracked(frame)
+        scanner.detect_tracked(frame.copy())
+
+        sys.modules["zxingcpp"].read_barcodes.assert_called_once()
+        self.assertEqual(scanner.capture_stats()["frames_skipped"], 1)
+
+
+def set_mock_position(result, x, y, size):
+    """Gives a mock zxing result a square position starting at (x, y)."""
+    corners = {
+        "top_left": (x, y),
+        "top_right": (x + size, y),
+        "bottom_right": (x + size, y + size),
+        "bottom_left": (x, y + size),
+    }
+    for name, (px, py) in corners.items():
+        point = getattr(result.position, name)
+        point.x = px
+        point.y = py
+
 
 def setup_mock_zxing():
     """Helper to ensure zxingcpp mock is set up if not already."""
@@ -0,0 +1,134 @@
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from qr_network.capture.results import DetectionResult, QRCode
+from qr_network.capture.screen import ScreenWatcher, grab_monitor, list_monitors
+
+
+def mock_mss(monitors, shot=None):
+    """A fake mss module whose context manager exposes monitors and grab()."""
+    module = MagicMock()
+    sct = module.mss.return_value.__enter__.return_value
+    sct.monitors = monitors
+    sct.grab.return_value = shot
+    return module, sct
+
+
+class TestMonitors(unittest.TestCase):
+    def test_without_mss(self):
+        with patch.dict(sys.modules, {"mss": None}):
+            self.assertEqual(list_monitors(), [])
+
+    def test_lists_physical_monitors_only(self):
+        everything = {"left": 0, "top": 0, "width": 300, "height": 100}
+        first = {"left": 0, "top": 0, "width": 100, "height": 100}
+        second = {"left": 100, "top": 0, "width": 200, "height": 100}
+        module, _ = mock_mss([everything, dict(first, extra=1), second])
+
+        with patch.dict(sys.modules, {"mss": module}):
+            self.assertEqual(list_monitors(), [first, second])
+
+    def test_grab_monitor_returns_luminance(self):
+        bgra = np.zeros((4, 6, 4), dtype=np.uint8)
+        bgra[..., :3] = 255
+        monitor = {"left": 100, "top": 0, "width": 6, "height": 4}
+        module, sct = mock_mss([], shot=bgra)
+
+        with patch.dict(sys.modules, {"mss": module}):
+            frame = grab_monitor(monitor)
+
+        sct.grab.assert_called_once_with(monitor)
+        self.assertEqual(frame.shape, (4, 6))
+        self.assertTrue((frame == 255).all())
+
+    def test_grab_monitor_raw_is_the_capture_buffer(self):
+        """gray=False hands back mss's BGRA buffer without copying it."""
+        raw = bytearray(4 * 6 * 4)
+        shot = MagicMock()
+        shot.__array_interface__ = {
+            "version": 3,
+            "shape": (4, 6, 4),
+            "typestr": "|u1",
+            "data": raw,
+        }
+        module, _ = mock_mss([], shot=shot)
+
+        with patch.dict(sys.modules, {"mss": module}):
+            frame = grab_monitor({"left": 0, "top": 0}, gray=False)
+
+        self.assertEqual(frame.shape, (4, 6, 4))
+        raw[0] = 7
+        self.assertEqual(frame[0, 0, 0], 7)
+
+
+class TestScreenWatcher(unittest.TestCase):
+    def setUp(self):
+        self.monitors = [
+            {"left": 0, "top": 0, "width": 640, "height": 480},
+            {"left": 640, "top": 0, "width": 640, "height": 480},
+        ]
+        self.frame = np.full((480, 640), 10, dtype=np.uint8)
+
+    def _watch(self, scanner, frames, screen_index=None):
+        watcher = ScreenWatcher(scanner, screen_index)
+        with (
+            patch(
+                "qr_network.capture.screen.list_monitors", return_value=self.monitors
+            ),
+            patch("qr_network.capture.screen.grab_monitor", side_effect=frames),
+        ):
+            return watcher, watcher.poll()
+
+    def test_only_changed_regions_are_decoded(self):
+        scanner = MagicMock()
+        scanner._detect.return_value = DetectionResult()
+        watcher = ScreenWatcher(scanner, screen_index=1)
+        changed = self.frame.copy()
+        changed[160:224, 320:384] = 255
+
+        with (
+            patch(
+                "qr_network.capture.screen.list_monitors", return_value=self.monitors
+            ),
+            patch(
+                "qr_network.capture.screen.grab_monitor",
+                side_effect=[self.frame, self.frame, changed],
+            ) as grab,
+        ):
+            watcher.poll()
+            self.assertEqual(scanner._detect.call_args.args[0].shape, (480, 640))
+            scanner._detect.reset_mock()
+
+            watcher.poll()
+            scanner._detect.assert_not_called()
+
+            watcher.poll()
+
+        grab.assert_called_with(self.monitors[1])
+        region = scanner._detect.call_args.args[0]
+        self.assertLess(region.size, self.frame.size // 4)
+        stats = watcher.stats()
+        self.assertEqual(stats["watch_polls"], 3)
+        self.assertEqual(stats["watch_regions"], 2)
+        self.assertLess(stats["watch_decoded_fraction"], 0.5)
+
+    def test_codes_are_mapped_to_desktop_coordinates(self):
+        points = np.array([[[5, 5]], [[15, 5]], [[15, 15]], [[5, 15]]], np.float32)
+        scanner = MagicMock()
+        scanner._detect.return_value = DetectionResult([QRCode("WIFI:S:Net;;", points)])
+
+        _, found = self._watch(scanner, [self.frame], screen_index=1)
+
+        # The second monitor sits at x=640 on the desktop
+        self.assertEqual(found.codes[0].points[0, 0].tolist(), [645, 5])
+
+    def test_unknown_screen_index(self):
+        with self.assertRaises(ValueError):
+            self._watch(MagicMock(), [], screen_index=5)
+
+
+if __name__ == "__main__":
+    unittest.main()